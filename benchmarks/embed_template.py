@@ -0,0 +1,70 @@
+"""
+Compares rendering an alert with :class:`dhooks.EmbedTemplate` against
+building the :class:`dhooks.Embed` by hand and encoding the payload, as
+:meth:`dhooks.Webhook.send` does.
+
+Usage: ::
+
+    python benchmarks/embed_template.py [iterations]
+
+"""
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from dhooks import Embed, EmbedTemplate, Webhook  # noqa: E402
+from dhooks.client import build_payload  # noqa: E402
+
+VALUES = {
+    'service': 'payments-api',
+    'region': 'eu-west-1',
+    'since': '2019-03-01 12:00:00',
+    'error_rate': '12.5%',
+    'latency': '850ms',
+    'runbook': 'https://example.com/runbooks/payments-api',
+}
+
+
+def build(values):
+    embed = Embed(title='{} is degraded'.format(values['service']),
+                  description='Runbook: {}'.format(values['runbook']),
+                  color=0xe74c3c)
+    embed.add_field(name='Region', value=values['region'])
+    embed.add_field(name='Since', value=values['since'])
+    embed.add_field(name='Error rate', value=values['error_rate'])
+    embed.add_field(name='p99 latency', value=values['latency'])
+    embed.set_footer(text='alertmanager')
+    return Webhook._encode(build_payload(embed=embed))
+
+
+def compile_template():
+    embed = Embed(title='{service} is degraded',
+                  description='Runbook: {runbook}', color=0xe74c3c)
+    embed.add_field(name='Region', value='{region}')
+    embed.add_field(name='Since', value='{since}')
+    embed.add_field(name='Error rate', value='{error_rate}')
+    embed.add_field(name='p99 latency', value='{latency}')
+    embed.set_footer(text='alertmanager')
+    return EmbedTemplate(embed)
+
+
+def main():
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    template = compile_template()
+    assert json.loads(template.render(VALUES).decode()) == \
+        json.loads(build(VALUES).decode())
+
+    results = (
+        ('Embed + encode', lambda: build(VALUES)),
+        ('EmbedTemplate', lambda: template.render(VALUES)),
+    )
+    for name, func in results:
+        best = min(timeit.repeat(func, number=number, repeat=5))
+        print('{:<16} {:8.2f} us/message'.format(name, best / number * 1e6))
+
+
+if __name__ == '__main__':
+    main()
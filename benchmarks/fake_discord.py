@@ -0,0 +1,96 @@
+"""
+A tiny local stand-in for the Discord webhook API, used by the benchmarks.
+
+It enforces a single fixed-window rate limit bucket, answers with the same
+``X-RateLimit-*`` headers as Discord and counts the requests and connections
+it receives.
+
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+
+WEBHOOK_URL = 'https://discord.com/api/webhooks/1234/benchmark'
+
+
+class FakeDiscordServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+    def __init__(self, limit: int = 5, window: float = 1.0):
+        super().__init__(('127.0.0.1', 0), _Handler)
+        self.limit = limit
+        self.window = window
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self.lock:
+            self.window_start = time.monotonic()
+            self.used = 0
+            self.requests = 0
+            self.rate_limited = 0
+            self.connections = 0
+
+    @property
+    def url(self) -> str:
+        return 'http://127.0.0.1:{}/api/webhooks/1234/benchmark'.format(
+            self.server_address[1])
+
+    def start(self) -> 'FakeDiscordServer':
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def hit(self):
+        with self.lock:
+            self.requests += 1
+            now = time.monotonic()
+            if now - self.window_start >= self.window:
+                self.window_start = now
+                self.used = 0
+            reset_after = self.window - (now - self.window_start)
+            if self.used >= self.limit:
+                self.rate_limited += 1
+                return 429, 0, reset_after
+            self.used += 1
+            return 204, self.limit - self.used, reset_after
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def _handle(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        self.rfile.read(length)
+
+        status, remaining, reset_after = self.server.hit()
+        body = b''
+        if status == 429:
+            body = json.dumps({'retry_after': reset_after * 1000,
+                               'global': False}).encode()
+        elif self.command == 'GET' or 'wait=true' in self.path:
+            status = 200
+            body = json.dumps({'id': '1', 'content': '',
+                               'channel_id': '1'}).encode()
+
+        self.send_response(status)
+        self.send_header('X-RateLimit-Limit', str(self.server.limit))
+        self.send_header('X-RateLimit-Remaining', str(remaining))
+        self.send_header('X-RateLimit-Reset-After',
+                         '{:.3f}'.format(reset_after))
+        self.send_header('X-RateLimit-Bucket', 'benchmark')
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = do_PATCH = do_DELETE = _handle
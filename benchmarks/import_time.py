@@ -0,0 +1,73 @@
+"""
+Measures how long ``import dhooks`` takes in a fresh interpreter, from the
+output of ``python -X importtime``, and which HTTP libraries it loads.
+
+The HTTP libraries are only imported on first use, so the time of the first
+sync and async :class:`dhooks.Webhook` is reported as well.
+
+Usage: ::
+
+    python benchmarks/import_time.py [runs]
+
+"""
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+CASES = (
+    ('interpreter', 'pass'),
+    ('import dhooks', 'import dhooks'),
+    ('+ sync webhook', 'import dhooks; '
+                       'dhooks.Webhook("https://discord.com/api/webhooks/1/a")'
+                       '.session'),
+    ('+ async webhook', 'import asyncio, dhooks\n'
+                        'async def main():\n'
+                        '    hook = dhooks.Webhook.Async('
+                        '"https://discord.com/api/webhooks/1/a")\n'
+                        '    await hook.sessions.new_async_session().close()\n'
+                        'asyncio.run(main())'),
+)
+
+PROBE = '; import sys; print(sorted(m for m in ("aiohttp", "requests") ' \
+        'if m in sys.modules))'
+
+
+def import_time(code):
+    """Returns the microseconds spent importing modules, and the HTTP
+    libraries that were loaded."""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c',
+                             code + '\n' + PROBE.lstrip('; ')],
+                            cwd=ROOT, stdout=subprocess.PIPE,
+                            stderr=subprocess.PIPE, universal_newlines=True,
+                            check=True)
+    total = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        if not name.startswith(' ' * 2):  # only top level imports
+            total += int(cumulative)
+    return total, result.stdout.strip()
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    baseline = None
+    for name, code in CASES:
+        times, loaded = [], ''
+        for _ in range(runs):
+            total, loaded = import_time(code)
+            times.append(total)
+        median = statistics.median(times)
+        if baseline is None:  # imported by every interpreter, e.g. site
+            baseline = median
+        print('{:<16} median={:7.1f}ms over interpreter={:7.1f}ms '
+              'loaded={}'.format(name, median / 1000,
+                                 (median - baseline) / 1000, loaded))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""
+Measures the share of 429 responses when several processes post to the same
+webhook, with a per-process :class:`dhooks.RateLimiter` and with a shared
+:class:`dhooks.SQLiteRateLimiter`.
+
+Usage: ::
+
+    python benchmarks/ratelimit_processes.py [processes] [messages]
+
+"""
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import dhooks  # noqa: E402
+from fake_discord import FakeDiscordServer, WEBHOOK_URL  # noqa: E402
+
+
+def worker(url, messages, db_path):
+    if db_path is not None:
+        dhooks.set_default_ratelimiter(dhooks.SQLiteRateLimiter(db_path))
+    with dhooks.Webhook(WEBHOOK_URL) as hook:
+        hook.url = url  # point the webhook at the local server
+        for i in range(messages):
+            hook.send('message {}'.format(i))
+
+
+def run(server, processes, messages, db_path=None):
+    server.reset()
+    start = time.perf_counter()
+    workers = [multiprocessing.Process(target=worker,
+                                       args=(server.url, messages, db_path))
+               for _ in range(processes)]
+    for process in workers:
+        process.start()
+    for process in workers:
+        process.join()
+    elapsed = time.perf_counter() - start
+    return server.requests, server.rate_limited, elapsed
+
+
+def main():
+    processes = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    messages = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    server = FakeDiscordServer(limit=10, window=1.0).start()
+
+    fd, db_path = tempfile.mkstemp(suffix='.sqlite')
+    os.close(fd)
+    try:
+        for name, path in (('per-process', None), ('sqlite', db_path)):
+            requests, rate_limited, elapsed = run(server, processes,
+                                                  messages, path)
+            print('{:<12} requests={:<5} 429s={:<5} ratio={:6.1%} '
+                  'time={:.2f}s'.format(name, requests, rate_limited,
+                                        rate_limited / requests, elapsed))
+    finally:
+        os.remove(db_path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""
+Compares the JSON backends of :mod:`dhooks.serializer` on typical message
+payloads, against what requests does with ``json=payload`` (stdlib
+``json.dumps``, then encoding to UTF-8).
+
+Two cases are timed: encoding the whole payload dict to bytes, and building
+the body of :meth:`dhooks.Webhook.send` from embeds whose JSON is already
+cached, as when an embed is sent again.
+
+Usage: ::
+
+    python benchmarks/serializer.py [iterations]
+
+"""
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from dhooks import Embed, Webhook, serializer  # noqa: E402
+from dhooks.client import build_payload  # noqa: E402
+
+
+def embed(i):
+    em = Embed(title='Deployment #{} finished'.format(i),
+               description='All checks passed, see the pipeline for the '
+                           'full report. \u2705',
+               color=0x2ecc71,
+               url='https://example.com/pipelines/{}'.format(i),
+               timestamp='2019-03-01T12:00:00')
+    em.set_author(name='ci-bot', icon_url='https://example.com/bot.png')
+    for name in ('Service', 'Version', 'Environment', 'Duration'):
+        em.add_field(name=name, value='value of {}'.format(name.lower()))
+    em.set_footer(text='dhooks benchmark')
+    return em
+
+
+def best(func, iterations):
+    return min(timeit.repeat(func, number=iterations, repeat=3)) / \
+        iterations * 1e6
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    for count in (1, 10):
+        embeds = [embed(i) for i in range(count)]
+        data = {'content': 'Deployment report', 'tts': False,
+                'embeds': [em.to_dict() for em in embeds]}
+        print('{} embed(s)'.format(count))
+        print('  {:<22} dict {:7.2f}us'.format(
+            'requests json=payload',
+            best(lambda: json.dumps(data).encode('utf-8'), iterations)))
+
+        for name in serializer.BACKENDS:
+            try:
+                serializer.set_serializer(name)
+            except ImportError:
+                print('  {:<22} not installed'.format(name))
+                continue
+            for em in embeds:
+                em._invalidate()
+            dict_time = best(lambda: serializer.dumps(data), iterations)
+            send_time = best(lambda: Webhook._encode(
+                build_payload('Deployment report', embeds=embeds)),
+                iterations)
+            print('  {:<22} dict {:7.2f}us  cached embeds {:7.2f}us'.format(
+                name, dict_time, send_time))
+
+
+if __name__ == '__main__':
+    main()
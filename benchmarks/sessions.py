@@ -0,0 +1,117 @@
+"""
+Compares one session per :class:`dhooks.Webhook` with the sessions shared by
+:class:`dhooks.SessionRegistry`, when many webhooks send a few messages each.
+
+Reports the number of connections opened (each one is a TLS handshake
+against Discord) and the p50/p99 latency of a send.
+
+Usage: ::
+
+    python benchmarks/sessions.py [webhooks] [messages] [concurrency]
+
+"""
+import asyncio
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import aiohttp
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import dhooks  # noqa: E402
+from fake_discord import FakeDiscordServer, WEBHOOK_URL  # noqa: E402
+
+
+def percentile(latencies, p):
+    return latencies[min(len(latencies) - 1, int(len(latencies) * p))]
+
+
+def report(name, server, latencies, elapsed):
+    latencies.sort()
+    print('{:<14} connections={:<5} p50={:6.2f}ms p99={:6.2f}ms '
+          'mean={:6.2f}ms time={:.2f}s'.format(
+              name, server.connections, percentile(latencies, 0.5) * 1000,
+              percentile(latencies, 0.99) * 1000,
+              statistics.mean(latencies) * 1000, elapsed))
+
+
+def make_hooks(server, count, own_session, is_async=False):
+    hooks = []
+    for _ in range(count):
+        session = None
+        if own_session:  # what every Webhook used to do
+            session = aiohttp.ClientSession() if is_async \
+                else requests.Session()
+        hook = dhooks.Webhook(WEBHOOK_URL, session=session,
+                              is_async=is_async)
+        hook.url = server.url  # point the webhook at the local server
+        hooks.append(hook)
+    return hooks
+
+
+def run_sync(server, webhooks, messages, concurrency, own_session):
+    server.reset()
+    hooks = make_hooks(server, webhooks, own_session)
+
+    def send(hook):
+        latencies = []
+        for i in range(messages):
+            start = time.perf_counter()
+            hook.send('message {}'.format(i))
+            latencies.append(time.perf_counter() - start)
+        return latencies
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        latencies = [latency for result in executor.map(send, hooks)
+                     for latency in result]
+    elapsed = time.perf_counter() - start
+    for hook in hooks:
+        hook.close()
+    return latencies, elapsed
+
+
+async def run_async(server, webhooks, messages, concurrency, own_session):
+    server.reset()
+    hooks = make_hooks(server, webhooks, own_session, is_async=True)
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def send(hook):
+        async with semaphore:
+            for i in range(messages):
+                start = time.perf_counter()
+                await hook.send('message {}'.format(i))
+                latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[send(hook) for hook in hooks])
+    elapsed = time.perf_counter() - start
+    for hook in hooks:
+        await hook.close()
+    await dhooks.get_default_sessions().close_async()
+    return latencies, elapsed
+
+
+def main():
+    webhooks = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    messages = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    concurrency = int(sys.argv[3]) if len(sys.argv) > 3 else 16
+    server = FakeDiscordServer(limit=10 ** 9, window=1.0).start()
+
+    for own_session in (True, False):
+        name = 'own session' if own_session else 'shared'
+        report('sync ' + name, server,
+               *run_sync(server, webhooks, messages, concurrency,
+                         own_session))
+        report('async ' + name, server,
+               *asyncio.run(run_async(server, webhooks, messages,
+                                      concurrency, own_session)))
+
+
+if __name__ == '__main__':
+    main()
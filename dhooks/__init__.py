@@ -1,6 +1,25 @@
-from .client import Webhook
+from .client import Webhook, DeadlineExceeded
 from .file import File
 from .embed import Embed
+from .ratelimit import RateLimiter, SQLiteRateLimiter
+from .retry import RetryPolicy, RetryBudget
+from .batching import Coalescer, EmbedPacker
+from .broadcast import broadcast, BroadcastResult
+from .pool import WebhookPool
+from .template import EmbedTemplate
+from .cache import AttachmentCache
+from .message import Message
+from .split import split_content
+from .updater import MessageUpdater
+from .handler import DiscordHandler
+from .ratelimit import get_default_ratelimiter, set_default_ratelimiter
+from .sessions import SessionRegistry
+from .sessions import get_default_sessions, set_default_sessions
+from .metrics import MetricsCollector, CallbackCollector
+from .metrics import PrometheusCollector
+from .metrics import get_default_metrics, set_default_metrics
+from .serializer import get_serializer, set_serializer
+from . import serializer
 
 __title__ = 'dhooks'
 __author__ = 'kyb3r'
@@ -0,0 +1,327 @@
+import asyncio
+import threading
+from typing import Any, List, Optional
+
+from .client import LENIENT
+from .embed import Embed
+
+
+class Batcher:
+    """
+    Base class for senders that buffer small items and send them together.
+
+    A batch is sent when the next item doesn't fit in it, or
+    :attr:`max_latency` seconds after its first item was added, whichever
+    comes first. Batches are handed to :meth:`Webhook.send_nowait`, so they
+    keep their order as long as the webhook uses a single dispatch worker.
+
+    If the webhook's :attr:`~Webhook.is_async` is :class:`True`, the methods
+    that may send a batch return a coroutine.
+
+    Parameters
+    ----------
+    webhook: :class:`Webhook`
+        The webhook the batches are sent through.
+
+    max_latency: float, optional
+        Defaults to ``1``.
+        The maximum number of seconds an item is buffered.
+
+    """
+
+    def __init__(self, webhook, max_latency: float = 1.0):
+        self.webhook = webhook
+        self.max_latency = max_latency
+        self._batch = []  # type: List[Any]
+        self._lock = threading.Lock()
+        self._timer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.flush()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.flush()
+
+    def __len__(self) -> int:
+        return len(self._batch)
+
+    def _fits(self, item: Any) -> bool:
+        """Whether ``item`` can be added to the current batch."""
+        raise NotImplementedError
+
+    def _added(self, item: Any) -> None:
+        """Called after ``item`` was added to the current batch."""
+
+    def _reset(self) -> None:
+        """Called after the current batch was taken."""
+
+    def _message(self, batch: List[Any]) -> dict:
+        """Returns the keyword arguments of :meth:`Webhook.send`."""
+        raise NotImplementedError
+
+    def _take(self) -> Optional[List[Any]]:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._batch = self._batch, []
+        self._reset()
+        return batch or None
+
+    def _start_timer(self) -> None:
+        if self.webhook.is_async:
+            loop = asyncio.get_event_loop()
+            self._timer = loop.call_later(
+                self.max_latency,
+                lambda: asyncio.ensure_future(self.flush()))
+        else:
+            self._timer = threading.Timer(self.max_latency, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _put(self, item: Any):
+        with self._lock:
+            ready = None
+            if self._batch and not self._fits(item):
+                ready = self._take()
+            self._batch.append(item)
+            self._added(item)
+            if self._timer is None:
+                self._start_timer()
+        return self._send(ready)
+
+    def flush(self):
+        """
+        Sends the current batch right away.
+
+        """
+        with self._lock:
+            ready = self._take()
+        return self._send(ready)
+
+    def _send(self, batch: Optional[List[Any]]):
+        if self.webhook.is_async:
+            return self._async_send(batch)
+        if batch is not None:
+            self.webhook.send_nowait(**self._message(batch))
+
+    async def _async_send(self, batch: Optional[List[Any]]) -> None:
+        if batch is not None:
+            await self.webhook.send_nowait(**self._message(batch))
+
+
+class Coalescer(Batcher):
+    """
+    Joins short text messages sent in bursts into fewer, longer messages.
+
+    Messages are buffered for up to :attr:`max_latency` seconds, or until
+    the next one would make the joined content longer than
+    :attr:`max_length`, and are then sent as a single message. ::
+
+        hook = Webhook(url)
+        alerts = Coalescer(hook, max_latency=0.5)
+
+        for line in lines:
+            alerts.send(line)  # returns immediately
+
+        alerts.flush()
+
+    The first message of a batch decides its username and avatar; the other
+    messages whose username differs, including the webhook's default one,
+    are prefixed with :attr:`attribution`. A message whose avatar differs
+    starts a new batch, as does a message with the default username if the
+    default name isn't known yet (see :meth:`Webhook.get_info`).
+
+    Parameters
+    ----------
+    webhook: :class:`Webhook`
+        The webhook the messages are sent through.
+
+    max_latency: float, optional
+        Defaults to ``1``.
+        The maximum number of seconds a message is buffered.
+
+    separator: str, optional
+        Defaults to ``'\\n'``.
+        The string the messages are joined with.
+
+    max_length: int, optional
+        Defaults to ``2000``.
+        The maximum length of the joined content, and of every message.
+
+    attribution: str, optional
+        Defaults to ``'**{username}**: '``.
+        The prefix of the messages whose username differs from the first
+        message of the batch.
+
+    """
+
+    def __init__(self, webhook, max_latency: float = 1.0,
+                 separator: str = '\n', max_length: int = 2000,
+                 attribution: str = '**{username}**: '):
+        super().__init__(webhook, max_latency)
+        self.separator = separator
+        self.max_length = max_length
+        self.attribution = attribution
+        self._length = 0
+        self._identity = None  # type: Optional[tuple]
+
+    def send(self, content: str, username: str = '', avatar_url: str = ''):
+        """
+        Buffers a message.
+
+        Parameters
+        ----------
+        content: str
+            The message contents.
+
+        username: str, optional
+            Defaults to :attr:`Webhook.username`.
+            Override the default username of the webhook.
+
+        avatar_url: str, optional
+            Defaults to :attr:`Webhook.avatar_url`.
+            Override the default avatar of the webhook.
+
+        """
+        if not content:
+            raise ValueError("content must be set.")
+        if len(content) > self.max_length:
+            raise ValueError("content is too long ({} > {})."
+                             .format(len(content), self.max_length))
+        identity = (username or self.webhook.username or
+                    self.webhook.default_name,
+                    avatar_url or self.webhook.avatar_url)
+        return self._put((content, identity))
+
+    def _line(self, item: tuple, identity: tuple) -> str:
+        content, (username, _) = item
+        if username != identity[0]:
+            return self.attribution.format(username=username) + content
+        return content
+
+    def _fits(self, item: tuple) -> bool:
+        if item[1][1] != self._identity[1]:
+            return False  # the avatar can't be attributed
+        if not item[1][0] and self._identity[0]:
+            return False  # can't be attributed to an unknown name
+        return self._length + len(self.separator) + \
+            len(self._line(item, self._identity)) <= self.max_length
+
+    def _added(self, item: tuple) -> None:
+        if self._identity is None:
+            self._identity = item[1]
+            self._length = len(item[0])
+        else:
+            self._length += len(self.separator) + \
+                len(self._line(item, self._identity))
+
+    def _reset(self) -> None:
+        self._length = 0
+        self._identity = None
+
+    def _message(self, batch: List[tuple]) -> dict:
+        identity = batch[0][1]
+        return {
+            'content': self.separator.join(self._line(item, identity)
+                                           for item in batch),
+            'username': identity[0],
+            'avatar_url': identity[1],
+        }
+
+
+class EmbedPacker(Batcher):
+    """
+    Packs embeds produced one at a time into as few messages as possible.
+
+    Embeds are buffered for up to :attr:`max_latency` seconds, or until the
+    next one would exceed :attr:`max_embeds` embeds or :attr:`max_length`
+    characters in total, and are then sent in a single message. ::
+
+        hook = Webhook(url)
+        packer = EmbedPacker(hook)
+
+        for event in events:
+            packer.send(Embed(description=event))
+
+        packer.flush()
+
+    The embeds are checked against discord's limits by :meth:`send`,
+    according to the webhook's :attr:`~Webhook.validation`, and serialized
+    when their batch is sent. They shouldn't be modified after being passed
+    to :meth:`send`.
+
+    Parameters
+    ----------
+    webhook: :class:`Webhook`
+        The webhook the embeds are sent through.
+
+    max_latency: float, optional
+        Defaults to ``1``.
+        The maximum number of seconds an embed is buffered.
+
+    max_embeds: int, optional
+        Defaults to ``10``.
+        The maximum number of embeds per message.
+
+    max_length: int, optional
+        Defaults to ``6000``.
+        The maximum number of characters of the embeds of a message, as
+        counted by ``len(embed)``.
+
+    \*\*username: str, optional
+        Override the default username of the webhook.
+
+    \*\*avatar_url: str, optional
+        Override the default avatar of the webhook.
+
+    """  # noqa: W605
+
+    def __init__(self, webhook, max_latency: float = 1.0,
+                 max_embeds: int = 10, max_length: int = 6000, **options):
+        super().__init__(webhook, max_latency)
+        self.max_embeds = max_embeds
+        self.max_length = max_length
+        self.username = options.get('username', '')
+        self.avatar_url = options.get('avatar_url', '')
+        self._length = 0
+
+    def send(self, embed: Embed):
+        """
+        Buffers an embed, after checking it the way :meth:`Webhook.send`
+        does: an embed over discord's limits raises :exc:`ValueError`, or is
+        truncated if the webhook's validation is ``'lenient'``.
+
+        Parameters
+        ----------
+        embed: :class:`Embed`
+            The embed to send.
+
+        """
+        if self.webhook.validation == LENIENT:
+            embed = embed.truncated(self.max_length)
+        elif self.webhook.validation is not None:
+            embed.validate()
+        return self._put((embed, len(embed)))
+
+    def _fits(self, item: tuple) -> bool:
+        return len(self._batch) < self.max_embeds and \
+            self._length + item[1] <= self.max_length
+
+    def _added(self, item: tuple) -> None:
+        self._length += item[1]
+
+    def _reset(self) -> None:
+        self._length = 0
+
+    def _message(self, batch: List[tuple]) -> dict:
+        return {
+            'embeds': [embed for embed, _ in batch],
+            'username': self.username,
+            'avatar_url': self.avatar_url,
+        }
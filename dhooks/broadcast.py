@@ -0,0 +1,173 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Sequence, Union, TYPE_CHECKING
+
+from .client import Webhook, build_payload
+from .embed import Embed
+
+if TYPE_CHECKING:
+    import aiohttp  # noqa: F401
+    import requests  # noqa: F401
+
+
+class BroadcastResult:
+    """
+    The outcome of a :func:`broadcast`.
+
+    A failure to send to one webhook doesn't stop the others, every
+    exception is collected in :attr:`failed` instead of being raised.
+
+    Attributes
+    ----------
+    succeeded: List[:class:`Webhook`]
+        The webhooks the message was sent to.
+
+    failed: List[Tuple[:class:`Webhook`, Exception]]
+        The webhooks the message couldn't be sent to, along with the
+        exception that was raised.
+
+    """
+
+    def __init__(self):
+        self.succeeded = []  # type: List[Webhook]
+        self.failed = []  # type: List[tuple]
+
+    def __repr__(self):
+        return '<BroadcastResult succeeded={} failed={}>'.format(
+            len(self.succeeded), len(self.failed))
+
+    @property
+    def ok(self) -> bool:
+        """Whether the message was sent to every webhook."""
+        return not self.failed
+
+    def add(self, webhook: Webhook, error: Optional[Exception]) -> None:
+        if error is None:
+            self.succeeded.append(webhook)
+        else:
+            self.failed.append((webhook, error))
+
+
+def broadcast(targets: Sequence[Union[str, Webhook]],
+              content: str = '',
+              embed: Optional[Embed] = None,
+              embeds: Optional[List[Embed]] = None,
+              username: str = '',
+              avatar_url: str = '',
+              tts: bool = False,
+              concurrency: int = 10,
+              session: Union['aiohttp.ClientSession', 'requests.Session',
+                             None] = None,
+              is_async: bool = False) -> BroadcastResult:
+    """
+    Sends the same message to many webhooks at once.
+
+    The message is serialized a single time, and sent with up to
+    ``concurrency`` requests in flight over one shared connection pool,
+    through threads or, if ``is_async`` is :class:`True`, through a
+    coroutine.
+
+    Parameters
+    ----------
+    targets: List[str or :class:`Webhook`]
+        The webhooks to send the message to. URLs share the same session,
+        :class:`Webhook` objects use their own and their
+        :attr:`~Webhook.is_async` must match ``is_async``.
+
+    content, embed, embeds, username, avatar_url, tts
+        Same as :meth:`Webhook.send`. The default username and avatar of
+        the targets are ignored.
+
+    concurrency: int, optional
+        Defaults to ``10``.
+        The maximum number of requests in flight.
+
+    session: requests.Session or aiohttp.ClientSession, optional
+        The session used for the URLs in ``targets``. If not provided, one
+        is created for the broadcast and closed afterwards.
+
+    is_async: bool, optional
+        Defaults to :class:`False`.
+        Whether or not to return a coroutine.
+
+    Returns
+    -------
+    :class:`BroadcastResult`
+        The webhooks that succeeded and those that failed.
+
+    """
+    for target in targets:
+        if isinstance(target, Webhook) and target.is_async != is_async:
+            raise TypeError("is_async is set to {}, but {!r} has is_async "
+                            "set to {}.".format(is_async, target,
+                                                target.is_async))
+
+    body = Webhook._encode(build_payload(content, embed, embeds, None,
+                                         username, avatar_url, tts))
+    if is_async:
+        return _async_broadcast(targets, body, concurrency, session)
+
+    own_session = session is None
+    if own_session:
+        import requests
+
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=concurrency)
+        session.mount('https://', adapter)
+
+    hooks = [_webhook(target, session, False) for target in targets]
+
+    def send(hook):
+        try:
+            hook._request('POST', body)
+        except Exception as e:
+            return e
+
+    result = BroadcastResult()
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            for hook, error in zip(hooks, executor.map(send, hooks)):
+                result.add(hook, error)
+    finally:
+        if own_session:
+            session.close()
+    return result
+
+
+async def _async_broadcast(targets: Sequence[Union[str, Webhook]],
+                           body: bytes, concurrency: int,
+                           session: Optional['aiohttp.ClientSession']) -> \
+        BroadcastResult:
+    own_session = session is None
+    if own_session:
+        import aiohttp
+
+        connector = aiohttp.TCPConnector(limit=concurrency)
+        session = aiohttp.ClientSession(connector=connector)
+
+    hooks = [_webhook(target, session, True) for target in targets]
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def send(hook):
+        async with semaphore:
+            try:
+                await hook._async_request('POST', body)
+            except Exception as e:
+                return e
+
+    result = BroadcastResult()
+    try:
+        errors = await asyncio.gather(*[send(hook) for hook in hooks])
+        for hook, error in zip(hooks, errors):
+            result.add(hook, error)
+    finally:
+        if own_session:
+            await session.close()
+    return result
+
+
+def _webhook(target: Union[str, Webhook], session, is_async: bool) -> \
+        Webhook:
+    if isinstance(target, Webhook):
+        return target
+    return Webhook(target, session=session, is_async=is_async)
@@ -0,0 +1,137 @@
+import collections
+import threading
+import time
+from typing import List, Optional
+
+from .file import File
+
+
+class AttachmentCache:
+    """
+    Remembers the CDN URLs of uploaded files by the hash of their content,
+    so identical files don't have to be uploaded again.
+
+    When a :class:`Webhook` with an attachment cache uploads files, it asks
+    discord for the created message and records the URL of every attachment.
+    Later, files that are referenced from an embed with
+    ``attachment://{filename}`` (e.g. as ``attachment://logo.png`` in
+    :meth:`Embed.set_image`) and whose content was already uploaded are not
+    uploaded again: the reference is replaced with the recorded URL
+    instead. ::
+
+        hook = Webhook(url, attachment_cache=AttachmentCache())
+
+    Parameters
+    ----------
+    maxsize: int, optional
+        Defaults to ``1024``.
+        The maximum number of URLs kept, the least recently used ones are
+        evicted first.
+
+    ttl: float, optional
+        Defaults to ``43200`` (12 hours).
+        The number of seconds a URL is kept. Discord's attachment URLs
+        expire, so this should stay below their lifetime.
+
+    Attributes
+    ----------
+    hits: int
+        The number of files that were replaced by a recorded URL.
+
+    misses: int
+        The number of referenced files that had to be uploaded.
+
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 12 * 3600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, digest: str) -> Optional[str]:
+        """
+        Returns the URL recorded for a content hash, or :class:`None`.
+
+        """
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                return None
+            url, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[digest]
+                return None
+            self._entries.move_to_end(digest)
+            return url
+
+    def put(self, digest: str, url: str) -> None:
+        """
+        Records the URL of a content hash.
+
+        """
+        with self._lock:
+            self._entries[digest] = (url, time.monotonic() + self.ttl)
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """
+        Forgets every recorded URL.
+
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def apply(self, payload: dict, files: List[File]) -> List[File]:
+        """
+        Replaces the ``attachment://`` references of the files in the embeds
+        of ``payload`` with their recorded URLs, and returns the files that
+        still have to be uploaded.
+
+        """
+        embeds = payload.get('embeds')
+        if not embeds:
+            return files
+
+        remaining = []
+        for file in files:
+            reference = 'attachment://{}'.format(file.name).encode('utf-8')
+            # some JSON encoders (ujson) escape the slashes
+            references = (reference, reference.replace(b'/', b'\\/'))
+            if not any(ref in embed for embed in embeds
+                       for ref in references):
+                remaining.append(file)
+                continue
+
+            url = self.get(file.digest)
+            if url is None:
+                self.misses += 1
+                remaining.append(file)
+                continue
+
+            self.hits += 1
+            url = url.encode('utf-8')
+            for ref in references:
+                embeds = [embed.replace(ref, url) for embed in embeds]
+            file.close()
+        payload['embeds'] = embeds
+        return remaining
+
+    def record(self, files: List[File], attachments: List[dict]) -> None:
+        """
+        Records the URLs of the attachments of a message created by
+        uploading ``files``.
+
+        """
+        if len(files) != len(attachments):
+            return  # can't tell which attachment is which file
+        for file, attachment in zip(files, attachments):
+            if 'url' in attachment:
+                self.put(file.digest, attachment['url'])
@@ -1,20 +1,188 @@
 import re
 
-import aiohttp
-import requests
-from typing import Union, List, Optional, Coroutine
+from typing import Union, List, Optional, Coroutine, TYPE_CHECKING
 import time
 import asyncio
 
+from . import serializer
 from .utils import bytes_to_base64_data
 from .utils import aliased, alias
-from .embed import Embed
+from .embed import Embed, ELLIPSIS, MAX_LENGTH
 from .file import File
+from .message import Message
+from .multipart import MultipartBody
+from .ratelimit import get_default_ratelimiter
+from .metrics import get_default_metrics
+from .sessions import get_default_sessions
+from .split import split_content
+from .dispatch import AsyncDispatcher, Dispatcher
 
-try:
-    import ujson as json
-except ImportError:
-    import json
+if TYPE_CHECKING:
+    # the HTTP libraries are only imported when they are used
+    import aiohttp  # noqa: F401
+    import requests  # noqa: F401
+    from .template import EmbedTemplate  # noqa: F401
+
+
+#: The maximum number of files per message.
+MAX_FILES = 10
+
+#: The maximum number of characters of the content of a message.
+MAX_CONTENT_LENGTH = 2000
+
+#: The maximum number of embeds per message.
+MAX_EMBEDS = 10
+
+#: The default ``(connect, read)`` timeouts of a request, in seconds.
+DEFAULT_TIMEOUT = (10.0, 30.0)
+
+#: Raise :exc:`ValueError` for messages over discord's limits.
+STRICT = 'strict'
+
+#: Truncate messages over discord's limits.
+LENIENT = 'lenient'
+
+VALIDATION_MODES = (STRICT, LENIENT, None)
+
+
+class DeadlineExceeded(TimeoutError):
+    """
+    Raised when a request can't be completed before its ``deadline``.
+
+    """
+
+
+def build_payload(content: str = '',
+                  embed: Optional[Embed] = None,
+                  embeds: Optional[List[Embed]] = None,
+                  file: Optional[File] = None,
+                  username: str = '',
+                  avatar_url: str = '',
+                  tts: bool = False,
+                  files: Optional[List[File]] = None,
+                  validation: Optional[str] = STRICT) -> dict:
+    """
+    Builds the JSON payload of a message, see :meth:`Webhook.send`.
+
+    ``validation`` is ``'strict'``, ``'lenient'`` or :class:`None`, see the
+    ``validation`` option of :class:`Webhook`.
+
+    """
+    payload = {
+        'tts': tts
+    }
+
+    if content:
+        payload['content'] = content
+
+    if username:
+        payload['username'] = username
+
+    if avatar_url:
+        payload['avatar_url'] = avatar_url
+
+    if embeds is None:
+        embeds = []
+        if embed is not None:
+            embeds.append(embed)
+    else:
+        if embed is not None:
+            raise ValueError("embed and embeds cannot both be set.")
+
+    if file is not None and files:
+        raise ValueError("file and files cannot both be set.")
+
+    if files and len(files) > MAX_FILES:
+        raise ValueError("Cannot send more than {} files."
+                         .format(MAX_FILES))
+
+    if not content and not embeds and not file and not files:
+        raise ValueError("One of content, embed/embeds, "
+                         "or file/files must be set")
+
+    if validation is not None:
+        content, embeds = _validate(content, embeds, validation)
+        if content:
+            payload['content'] = content
+    payload['embeds'] = [_embed_json(em) for em in embeds]
+    return payload
+
+
+def build_edit_payload(content: Optional[str] = None,
+                       embed: Optional[Embed] = None,
+                       embeds: Optional[List[Embed]] = None,
+                       validation: Optional[str] = STRICT) -> dict:
+    """
+    Builds the JSON payload of a message edit, see
+    :meth:`Webhook.edit_message`.
+
+    """
+    payload = {}
+
+    if embed is not None:
+        if embeds is not None:
+            raise ValueError("embed and embeds cannot both be set.")
+        embeds = [embed]
+
+    if validation is not None:
+        text, checked = _validate(content or '', embeds or [], validation)
+        if content is not None:
+            content = text
+        if embeds is not None:
+            embeds = checked
+
+    if content is not None:
+        payload['content'] = content
+
+    if embeds is not None:
+        payload['embeds'] = [_embed_json(em) for em in embeds]
+
+    if not payload:
+        raise ValueError("No attributes to edit.")
+    return payload
+
+
+def _validate(content: str, embeds: List[Embed], validation: str) -> tuple:
+    # the checks are constant time for valid embeds, see Embed.is_valid
+    if validation not in VALIDATION_MODES:
+        raise ValueError("validation must be one of 'strict', 'lenient' "
+                         "or None.")
+    lenient = validation == LENIENT
+
+    if len(content) > MAX_CONTENT_LENGTH:
+        if not lenient:
+            raise ValueError("The content is too long ({} > {}).".format(
+                len(content), MAX_CONTENT_LENGTH))
+        content = content[:MAX_CONTENT_LENGTH - 1] + ELLIPSIS
+
+    if len(embeds) > MAX_EMBEDS:
+        if not lenient:
+            raise ValueError("Cannot send more than {} embeds.".format(
+                MAX_EMBEDS))
+        embeds = embeds[:MAX_EMBEDS]
+
+    checked = []
+    total = 0
+    for em in embeds:
+        if isinstance(em, Embed):
+            if lenient:
+                em = em.truncated(MAX_LENGTH - total)
+            else:
+                em.validate()
+            total += len(em)
+        checked.append(em)
+
+    if total > MAX_LENGTH:
+        raise ValueError("The embeds are too long ({} > {}).".format(
+            total, MAX_LENGTH))
+    return content, checked
+
+
+def _embed_json(embed: Embed) -> bytes:
+    # embeds are kept as their (cached) JSON and spliced in by _encode
+    if hasattr(embed, 'to_json'):
+        return embed.to_json()
+    return serializer.dumps(embed.to_dict())
 
 
 @aliased
@@ -37,8 +205,8 @@ class Webhook:
 
     session: requests.Session or aiohttp.ClientSession, optional
         The HTTP session that will be used to make requests to the API. If
-        :attr:`session` is not provided, a new :class:`requests.Session` or
-        :class:`aiohttp.ClientSession` will be created,
+        :attr:`session` is not provided, the :class:`requests.Session` or
+        :class:`aiohttp.ClientSession` shared by :attr:`sessions` is used,
         depending on :attr:`is_async`.
 
     is_async: bool, optional
@@ -62,6 +230,59 @@ class Webhook:
     \*\*avatar_url: str, optional
         The URL of the avatar that will override the default avatar of the
         webhook every time you send a message.
+
+    \*\*sessions: :class:`SessionRegistry`, optional
+        The registry the shared session is taken from when :attr:`session`
+        isn't provided. Defaults to the process-wide registry returned by
+        :func:`get_default_sessions`.
+
+    \*\*ratelimiter: :class:`RateLimiter`, optional
+        The rate limiter used to delay requests before they would get
+        rate limited. If not provided, the process-wide limiter returned by
+        :func:`get_default_ratelimiter` is used.
+
+    \*\*attachment_cache: :class:`AttachmentCache`, optional
+        The cache used to avoid uploading the same files again.
+
+    \*\*retry_policy: :class:`RetryPolicy`, optional
+        The policy used to retry requests that failed because of a server
+        or connection error. If not provided, only rate limited requests are
+        retried.
+
+    \*\*timeout: float or Tuple[float, float], optional
+        Defaults to ``(10, 30)``.
+        The ``(connect, read)`` timeouts of every request in seconds, a
+        single number is used for both. :class:`None` disables them.
+
+    \*\*validation: str, optional
+        Defaults to ``'strict'``.
+        How messages over discord's limits (content, embed sections, number
+        of fields and embeds, 6000 characters in total) are handled before
+        any request is made: ``'strict'`` raises :exc:`ValueError`,
+        ``'lenient'`` truncates them (see :meth:`Embed.truncated`) and
+        :class:`None` sends them as they are.
+
+    \*\*metrics: :class:`MetricsCollector`, optional
+        The collector the metrics of the requests are reported to. If not
+        provided, the process-wide collector returned by
+        :func:`get_default_metrics` is used, metrics are disabled if it is
+        :class:`None`.
+
+    \*\*queue_size: int, optional
+        Defaults to ``1000``.
+        The maximum number of messages queued by :meth:`send_nowait`.
+
+    \*\*dispatch_workers: int, optional
+        The number of background threads (or tasks if :attr:`is_async` is
+        :class:`True`) that send the messages queued by :meth:`send_nowait`.
+        Messages are only sent in order with a single worker.
+        Defaults to ``1`` thread, or as many tasks as the rate limit bucket
+        allows requests per window.
+
+    \*\*overflow: str, optional
+        Defaults to ``'block'``.
+        What :meth:`send_nowait` does when the queue is full: ``'block'``
+        until there is room, ``'drop_oldest'`` or ``'drop_newest'``.
         
     Attributes
     ----------
@@ -93,6 +314,9 @@ class Webhook:
         The HTTP session that will be used to make requests to the API.
         :attr:`session` will be a :class:`requests.Session` or
         :class:`aiohttp.ClientSession` depending on :attr:`is_async`.
+
+    sessions: :class:`SessionRegistry`
+        The registry of the shared sessions.
         
     default_name: str
         .. warning::
@@ -114,6 +338,25 @@ class Webhook:
         Defaults to -1.
         The id of the channel the webhook sends messages to.
 
+    ratelimiter: :class:`RateLimiter`
+        The rate limiter that tracks the ``X-RateLimit-*`` headers of the
+        responses and delays requests accordingly.
+
+    attachment_cache: :class:`AttachmentCache` or None
+        The cache of the URLs of the uploaded files.
+
+    retry_policy: :class:`RetryPolicy` or None
+        The policy used to retry failed requests.
+
+    timeout: float or Tuple[float, float] or None
+        The ``(connect, read)`` timeouts of every request.
+
+    validation: str or None
+        How messages over discord's limits are handled.
+
+    metrics: :class:`MetricsCollector` or None
+        The collector of the metrics of the requests.
+
     """  # noqa: W605
     URL_REGEX = r'^(?:https?://)?((canary|ptb)\.)?discord(?:app)?\.com/api/' \
                 r'webhooks/(?P<id>[0-9]+)/(?P<token>[A-Za-z0-9\.\-\_]+)/?$'
@@ -122,7 +365,7 @@ class Webhook:
           r'{0.id}/{0.default_avatar}.{1}?size={2}'
 
     def __init__(self, url: str = '',
-                 session: Union[aiohttp.ClientSession, requests.Session,
+                 session: Union['aiohttp.ClientSession', 'requests.Session',
                                 None] = None,
                  is_async: bool = False,
                  **options):
@@ -140,27 +383,40 @@ class Webhook:
 
         self.username = options.get('username', '')
         self.avatar_url = options.get('avatar_url', '')
+        self.ratelimiter = options.get('ratelimiter') or \
+            get_default_ratelimiter()
+        self.attachment_cache = options.get('attachment_cache')
+        self.retry_policy = options.get('retry_policy')
+        self.timeout = options.get('timeout', DEFAULT_TIMEOUT)
+        self.validation = options.get('validation', STRICT)
+        if self.validation not in VALIDATION_MODES:
+            raise ValueError("validation must be one of 'strict', "
+                             "'lenient' or None.")
+        self.metrics = options.get('metrics') or get_default_metrics()
+        self._dispatch_options = {
+            'maxsize': options.get('queue_size', 1000),
+            'workers': options.get('dispatch_workers'),
+            'overflow': options.get('overflow', 'block'),
+        }
+        self._dispatcher = None  # type: Union[Dispatcher, AsyncDispatcher]
 
         self._parse_or_format_url()
 
         self.is_async = is_async
+        self.sessions = options.get('sessions') or get_default_sessions()
+        self._session = session
 
         if session is not None:
-            self.session = session
-            if is_async and not isinstance(self.session,
-                                           aiohttp.ClientSession):
-                raise TypeError("is_async is set to True, but session "
-                                "isn't aiohttp.ClientSession.")
-            elif not is_async and not isinstance(self.session,
-                                                 requests.Session):
-                raise TypeError("is_async is set to False, but session "
-                                "isn't requests.Session.")
-
-        else:
-            if self.is_async:
-                self.session = aiohttp.ClientSession()
+            if is_async:
+                import aiohttp
+                if not isinstance(session, aiohttp.ClientSession):
+                    raise TypeError("is_async is set to True, but session "
+                                    "isn't aiohttp.ClientSession.")
             else:
-                self.session = requests.Session()
+                import requests
+                if not isinstance(session, requests.Session):
+                    raise TypeError("is_async is set to False, but session "
+                                    "isn't requests.Session.")
 
         self.default_name = ''
         self.default_avatar = ''
@@ -169,7 +425,7 @@ class Webhook:
 
     @classmethod
     def Async(cls, url: str = '', session:
-              Optional[aiohttp.ClientSession] = None,
+              Optional['aiohttp.ClientSession'] = None,
               **options) -> 'Webhook':
         """
         Returns a new instance of Webhook with :attr:`is_async` set
@@ -195,8 +451,37 @@ class Webhook:
     async def __aexit__(self, *args):
         await self.close()
 
+    @property
+    def session(self) -> Union['requests.Session', 'aiohttp.ClientSession']:
+        if self._session is not None:
+            return self._session
+        if self.is_async:
+            return self.sessions.get_async_session()
+        return self.sessions.get_session()
+
+    @session.setter
+    def session(self, session: Union['requests.Session',
+                                     'aiohttp.ClientSession']) -> None:
+        self._session = session
+
     def close(self):
-        return self.session.close()
+        """
+        Sends the messages queued by :meth:`send_nowait` and closes
+        :attr:`session`, unless it is shared by :attr:`sessions`.
+
+        """
+        if self.is_async:
+            return self._async_close()
+        if self._dispatcher is not None:
+            self._dispatcher.close()
+        if self._session is not None:
+            self._session.close()
+
+    async def _async_close(self):
+        if self._dispatcher is not None:
+            await self._dispatcher.close()
+        if self._session is not None:
+            await self._session.close()
 
     @property
     def default_avatar_url(self) -> str:
@@ -211,7 +496,11 @@ class Webhook:
              file: Optional[File] = None,
              username: str = '',
              avatar_url: str = '',
-             tts: bool = False) -> 'Webhook':
+             tts: bool = False,
+             files: Optional[List[File]] = None,
+             wait: bool = False,
+             deadline: Optional[float] = None,
+             split: bool = False) -> Optional[Message]:
         """
         Sends a message to discord through the webhook.
 
@@ -229,6 +518,9 @@ class Webhook:
         file: :class:`File`, optional
             The file that will be uploaded.
 
+        files: List[:class:`File`], optional
+            Up to 10 files that will be uploaded in the same request.
+
         tts: bool, optional
             Defaults to :class:`False`.
             Whether or not the message will use text-to-speech.
@@ -241,38 +533,167 @@ class Webhook:
             Defaults to :attr:`avatar_url`.
             Override the default avatar of the webhook.
 
+        wait: bool, optional
+            Defaults to :class:`False`.
+            Whether or not to wait for discord to confirm the message was
+            created, and return it. Otherwise, the response isn't decoded.
+
+        deadline: float, optional
+            The maximum number of seconds the message may take to be sent,
+            including rate limit waits and retries. :exc:`DeadlineExceeded`
+            is raised as soon as a wait would go past it.
+
+        split: bool, optional
+            Defaults to :class:`False`.
+            Whether or not content over 2000 characters is split into
+            several messages (see :func:`split_content`), sent one after the
+            other. The embeds and files are sent with the last one, and
+            ``deadline`` covers all of them.
+
+        Returns
+        -------
+        :class:`Message` or None
+            The message that was sent, if ``wait`` is :class:`True`. The
+            last one if the content was split.
+
         """
 
-        payload = {
-            'tts': tts
-        }
+        messages = self._build_messages(content, embed, embeds, file,
+                                        username, avatar_url, tts, files,
+                                        split)
+        if len(messages) > 1:
+            return self._send_all(messages, wait, deadline)
+        payload, files = messages[0]
+        return self._request('POST', payload, files=files, wait=wait,
+                             deadline=deadline)
+
+    def send_nowait(self, *args, timeout: Optional[float] = None,
+                    deadline: Optional[float] = None, **kwargs) -> bool:
+        """
+        Queues a message to be sent by background workers.
 
-        username = username if username else self.username
-        avatar_url = avatar_url if avatar_url else self.avatar_url
+        Takes the same arguments as :meth:`send` except ``wait``, as there
+        is nothing to return the message to. The message is built right
+        away so later changes to an :class:`Embed` aren't sent. The messages
+        a split content is sent as are queued together, and sent in order by
+        the same worker.
 
-        if content:
-            payload['content'] = content
+        If :attr:`is_async` is :class:`False`, this returns immediately and
+        the message is sent by background threads. Otherwise it returns a
+        coroutine that waits for room in the queue (when ``overflow`` is
+        ``'block'``), so producers can't outrun the rate limit.
 
-        if username:
-            payload['username'] = username
+        Parameters
+        ----------
+        timeout: float, optional
+            The maximum number of seconds to wait for room in the queue when
+            ``overflow`` is ``'block'``. Waits forever by default.
+
+        deadline: float, optional
+            The maximum number of seconds the message may take to be sent,
+            counted from now so the time spent in the queue is included. A
+            message past its deadline isn't sent, and the
+            :exc:`DeadlineExceeded` is logged.
+
+        Returns
+        -------
+        bool
+            :class:`False` if the message was dropped because the queue
+            was full.
 
-        if avatar_url:
-            payload['avatar_url'] = avatar_url
+        """
+        if 'wait' in kwargs:
+            raise TypeError("send_nowait() doesn't take wait, the message "
+                            "is sent in the background.")
+        messages = self._build_messages(*args, **kwargs)
+        expires = None if deadline is None else time.monotonic() + deadline
+
+        if self._dispatcher is None:
+            options = dict(self._dispatch_options,
+                           on_drop=self._drop_queued)
+            if self.is_async:
+                self._dispatcher = AsyncDispatcher(
+                    self._async_dispatch,
+                    concurrency=lambda: self.ratelimiter.limit(
+                        self._route('POST')),
+                    **options)
+            else:
+                options['workers'] = options['workers'] or 1
+                self._dispatcher = Dispatcher(self._dispatch, **options)
+        queued = self._dispatcher.put((messages, expires), timeout)
+        if self.metrics is None:
+            return queued
+        if self.is_async:
+            return self._async_queued(queued)
+        self._queue_depth()
+        return queued
 
-        if embeds is None:
-            embeds = []
-            if embed is not None:
-                embeds.append(embed)
-        else:
-            if embed is not None:
-                raise ValueError("embed and embeds cannot both be set.")
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Waits until every message queued by :meth:`send_nowait` is sent.
+
+        Returns :class:`False` if ``timeout`` expired first.
+
+        """
+        if self._dispatcher is None:
+            return self._async_return(True) if self.is_async else True
+        return self._dispatcher.flush(timeout)
+
+    def send_template(self, template: 'EmbedTemplate',
+                      mapping: Optional[dict] = None,
+                      wait: bool = False,
+                      deadline: Optional[float] = None,
+                      **values) -> Optional[Message]:
+        """
+        Sends a message rendered from an :class:`EmbedTemplate`.
 
-        if not content and not embeds and not file:
-            raise ValueError("One of content, embed/embeds, "
-                             "or file must be set")
-        payload['embeds'] = [em.to_dict() for em in embeds]
+        The message uses :attr:`username` and :attr:`avatar_url` unless the
+        template overrides them. A message rendered over discord's limits
+        is handled according to :attr:`validation`, like :meth:`send`
+        does.
 
-        return self._request('POST', payload, file=file)
+        Parameters
+        ----------
+        template: :class:`EmbedTemplate`
+            The compiled message.
+
+        mapping: dict, optional
+            The values of the placeholders. Placeholders named ``wait`` or
+            ``deadline`` must be given here.
+
+        wait: bool, optional
+            Same as :meth:`send`.
+
+        deadline: float, optional
+            Same as :meth:`send`.
+
+        \*\*values
+            The values of the placeholders, they override ``mapping``.
+
+        Returns
+        -------
+        :class:`Message` or None
+            The message that was sent, if ``wait`` is :class:`True`.
+
+        """  # noqa: W605
+        if mapping is not None:
+            values = dict(mapping, **values)
+
+        if self.validation is not None and not template._fits(values):
+            content, embed = template._build(values)
+            return self.send(content, embed, username=template.username,
+                             avatar_url=template.avatar_url, wait=wait,
+                             deadline=deadline)
+
+        body = template.render(values)
+        defaults = {}
+        if self.username and not template.username:
+            defaults['username'] = self.username
+        if self.avatar_url and not template.avatar_url:
+            defaults['avatar_url'] = self.avatar_url
+        if defaults:  # spliced in front of the rendered object
+            body = serializer.dumps(defaults)[:-1] + b',' + body[1:]
+        return self._request('POST', body, wait=wait, deadline=deadline)
 
     @alias('edit')
     def modify(self, name: str = '',
@@ -301,6 +722,48 @@ class Webhook:
 
         return self._request(method='PATCH', payload=payload)
 
+    def edit_message(self, message: Union[Message, int],
+                     content: Optional[str] = None,
+                     embed: Optional[Embed] = None,
+                     embeds: Optional[List[Embed]] = None,
+                     deadline: Optional[float] = None) -> Message:
+        """
+        Edits a message previously sent through the webhook.
+
+        To keep a message up to date with frequent changes, use a
+        :class:`MessageUpdater` instead.
+
+        Parameters
+        ----------
+        message: :class:`Message` or int
+            The message, or its ID.
+
+        content: str, optional
+            The new message contents, an empty string removes them.
+
+        embed: :class:`Embed`, optional
+            The new single embedded rich content.
+
+        embeds: List[:class:`Embed`], optional
+            The new list of embedded rich content, an empty list removes
+            them.
+
+        deadline: float, optional
+            The maximum number of seconds the edit may take, see
+            :meth:`send`.
+
+        Returns
+        -------
+        :class:`Message`
+            The edited message.
+
+        """
+        return self._request('PATCH', build_edit_payload(content, embed,
+                                                         embeds,
+                                                         self.validation),
+                             path=self._message_path(message),
+                             deadline=deadline)
+
     def get_info(self) -> 'Webhook':
         """
         Updates :class:`Webhook` with fresh data retrieved from discord.
@@ -322,21 +785,21 @@ class Webhook:
         """
         return self._request(method='DELETE')
 
-    def _request(self, method: str = 'POST', payload: dict = None,
-                 file: Optional[File] = None, headers: dict = None) -> \
-            Union[Optional['Webhook'], Coroutine[Optional['Webhook'],
-                                                 None,
-                                                 Optional['Webhook']]]:
+    def _request(self, method: str = 'POST',
+                 payload: Union[dict, bytes, None] = None,
+                 files: Optional[List[File]] = None,
+                 headers: dict = None, wait: bool = False,
+                 path: str = '', deadline: Optional[float] = None) -> \
+            Union['Webhook', Message, None,
+                  Coroutine[None, None, Union['Webhook', Message, None]]]:
         """
         Makes a request to the API. This function may or may
         not be a coroutine based on the :attr:`is_async` attribute.
 
         """
         if self.is_async:
-            return self._async_request(method, payload, file, headers)
-
-        # type annotation support for Python 3.5
-        self.session = self.session  # type: requests.Session
+            return self._async_request(method, payload, files, headers,
+                                       wait, path, deadline)
 
         if payload is None:
             payload = {}
@@ -344,125 +807,465 @@ class Webhook:
         if headers is None:
             headers = {}
 
-        rate_limited = True
-        resp = None
-
-        while rate_limited:
-            if method == "POST":
-                if file is not None:
-                    payload = {'payload_json': json.dumps(payload)}
-                    multipart = {'file': (file.name, file.fp)}
-                    resp = self.session.post(self.url, data=payload,
-                                             headers=headers, files=multipart)
-                else:
-                    headers['Content-Type'] = 'application/json'
-                    resp = self.session.post(self.url, json=payload,
-                                             headers=headers)
-
-            elif method == "DELETE":
-                resp = self.session.delete(self.url, headers=headers)
+        # encoded once, and reused on every retry
+        body = self._encode(payload)
+        multipart = MultipartBody(body, files) if files else None
 
-            elif method == "PATCH":
-                resp = self.session.patch(self.url, json=payload,
-                                          headers=headers)
+        # the created message is needed to record the URLs of the files
+        record = multipart is not None and self.attachment_cache is not None
+        wait = wait or bool(path)  # edited messages are always returned
+        params = {'wait': 'true'} if wait or record else None
 
-            elif method == "GET":
-                resp = self.session.get(self.url, headers=headers)
-
-            else:
-                raise ValueError("Bad method: {}".format(method))
-
-            if resp.status_code == 429:  # Too many request
-                time.sleep(resp.json()['retry_after'] / 1000.0)
-                if file is not None:
-                    file.seek()
-                continue
-            else:
-                if file is not None:
-                    file.close()
-                rate_limited = False
-
-        if resp.status_code == 204:  # method DELETE
+        url = self.url + path
+        route = self._route(method, path)
+        policy = self.retry_policy
+        attempt = 0
+        resp = None
+        expires = None if deadline is None else time.monotonic() + deadline
+        metrics = self.metrics
+        if metrics is not None:
+            size = len(body) if multipart is None else len(multipart)
+
+        if policy is not None:
+            policy.record_request()
+
+        try:
+            while True:
+                delay = self.ratelimiter.acquire(route)
+                while delay > 0:
+                    self._check_deadline(expires, delay)
+                    if metrics is not None:
+                        metrics.rate_limit_sleep(self.id, delay)
+                    time.sleep(delay)
+                    delay = self.ratelimiter.acquire(route)
+
+                started = None
+                try:
+                    self._check_deadline(expires)
+                    started = time.monotonic()
+                    resp = self._send_request(method, url, body, multipart,
+                                              headers, params,
+                                              self._timeouts(expires))
+                except Exception as e:
+                    if metrics is not None and started is not None:
+                        metrics.request(self.id, None,
+                                        time.monotonic() - started, size)
+                    # no headers, this only lets the next request through
+                    self.ratelimiter.update(route, {})
+                    self._check_deadline(expires)
+                    attempt += 1
+                    if policy is None or \
+                            not policy.should_retry(attempt, error=e):
+                        raise
+                    if metrics is not None:
+                        metrics.retry(self.id)
+                    delay = policy.backoff(attempt)
+                    self._check_deadline(expires, delay)
+                    time.sleep(delay)
+                    self._rewind(files)
+                    continue
+                except BaseException:
+                    # cancelled or interrupted, the request may not have
+                    # been sent: let the next one discover the bucket
+                    self.ratelimiter.update(route, {})
+                    raise
+
+                if metrics is not None:
+                    metrics.request(self.id, resp.status_code,
+                                    time.monotonic() - started, size)
+                self.ratelimiter.update(route, resp.headers)
+
+                if resp.status_code == 429:  # Too many request
+                    self._rate_limited(route, resp.headers,
+                                       serializer.loads(resp.content))
+                    self._rewind(files)
+                    continue
+
+                attempt += 1
+                if policy is not None and \
+                        policy.should_retry(attempt, resp.status_code):
+                    if metrics is not None:
+                        metrics.retry(self.id)
+                    delay = policy.backoff(attempt)
+                    self._check_deadline(expires, delay)
+                    time.sleep(delay)
+                    self._rewind(files)
+                    continue
+                break
+        finally:
+            for file in files or ():
+                file.close()  # only closes the files File opened itself
+
+        if resp.status_code == 204:  # method DELETE, or a message without wait
             return
 
         resp.raise_for_status()
 
-        self._update_fields(resp.json())
+        if params is not None:
+            message = Message(resp.content, self)
+            if record:
+                self.attachment_cache.record(files, message.attachments)
+            return message if wait else None
+
+        self._update_fields(serializer.loads(resp.content))
         return self
 
     async def _async_request(self, method: str = 'POST',
-                             payload: dict = None,
-                             file: Optional[File] = None,
-                             headers: dict = None) -> \
-            Optional['Webhook']:
+                             payload: Union[dict, bytes, None] = None,
+                             files: Optional[List[File]] = None,
+                             headers: dict = None, wait: bool = False,
+                             path: str = '',
+                             deadline: Optional[float] = None) -> \
+            Union['Webhook', Message, None]:
         """
         Async version of the request function using aiohttp.
 
         """
-        # type annotation support for Python 3.5
-        self.session = self.session  # type: aiohttp.ClientSession
-
         if payload is None:
             payload = {}
 
         if headers is None:
             headers = {}
 
-        rate_limited = True
-        resp = None
-
-        while rate_limited:
-            if method == "POST":
-                if file is not None:
-                    data = aiohttp.FormData()
-                    data.add_field('file', file.fp, filename=file.name)
-                    data.add_field('payload_json', json.dumps(payload))
-
-                    resp = await self.session.post(self.url,
-                                                   data=data,
-                                                   headers=headers)
+        # encoded once, and reused on every retry
+        body = self._encode(payload)
+        multipart = MultipartBody(body, files) if files else None
 
-                else:
-                    headers['Content-Type'] = 'application/json'
-                    resp = await self.session.post(self.url,
-                                                   json=payload,
-                                                   headers=headers)
+        # the created message is needed to record the URLs of the files
+        record = multipart is not None and self.attachment_cache is not None
+        wait = wait or bool(path)  # edited messages are always returned
+        params = {'wait': 'true'} if wait or record else None
 
-            elif method == "DELETE":
-                resp = await self.session.delete(self.url,
-                                                 headers=headers)
-
-            elif method == "PATCH":
-                resp = await self.session.patch(self.url,
-                                                json=payload,
-                                                headers=headers)
-
-            elif method == "GET":
-                resp = await self.session.get(self.url,
-                                              headers=headers)
-
-            else:
-                raise ValueError("Bad method: {}".format(method))
-
-            if resp.status == 429:  # Too many request
-                await asyncio.sleep((await resp.json())
-                                    ['retry_after'] / 1000.0)
-                if file is not None:
-                    file.seek()
-                continue
-            else:
-                if file is not None:
-                    file.close()
-                rate_limited = False
-
-        if resp.status == 204:  # method DELETE
+        url = self.url + path
+        route = self._route(method, path)
+        policy = self.retry_policy
+        attempt = 0
+        resp = None
+        expires = None if deadline is None else time.monotonic() + deadline
+        metrics = self.metrics
+        if metrics is not None:
+            size = len(body) if multipart is None else len(multipart)
+
+        if policy is not None:
+            policy.record_request()
+
+        try:
+            while True:
+                delay = self.ratelimiter.acquire(route)
+                while delay > 0:
+                    self._check_deadline(expires, delay)
+                    if metrics is not None:
+                        metrics.rate_limit_sleep(self.id, delay)
+                    await asyncio.sleep(delay)
+                    delay = self.ratelimiter.acquire(route)
+
+                started = None
+                try:
+                    self._check_deadline(expires)
+                    started = time.monotonic()
+                    resp = await self._async_send_request(
+                        method, url, body, multipart, headers, params,
+                        self._timeouts(expires))
+                except Exception as e:
+                    if metrics is not None and started is not None:
+                        metrics.request(self.id, None,
+                                        time.monotonic() - started, size)
+                    # no headers, this only lets the next request through
+                    self.ratelimiter.update(route, {})
+                    self._check_deadline(expires)
+                    attempt += 1
+                    if policy is None or \
+                            not policy.should_retry(attempt, error=e):
+                        raise
+                    if metrics is not None:
+                        metrics.retry(self.id)
+                    delay = policy.backoff(attempt)
+                    self._check_deadline(expires, delay)
+                    await asyncio.sleep(delay)
+                    self._rewind(files)
+                    continue
+                except BaseException:
+                    # cancelled or interrupted, the request may not have
+                    # been sent: let the next one discover the bucket
+                    self.ratelimiter.update(route, {})
+                    raise
+
+                if metrics is not None:
+                    metrics.request(self.id, resp.status,
+                                    time.monotonic() - started, size)
+                self.ratelimiter.update(route, resp.headers)
+
+                if resp.status == 429:  # Too many request
+                    self._rate_limited(route, resp.headers,
+                                       serializer.loads(await resp.read()))
+                    self._rewind(files)
+                    continue
+
+                attempt += 1
+                if policy is not None and \
+                        policy.should_retry(attempt, resp.status):
+                    if metrics is not None:
+                        metrics.retry(self.id)
+                    resp.close()
+                    delay = policy.backoff(attempt)
+                    self._check_deadline(expires, delay)
+                    await asyncio.sleep(delay)
+                    self._rewind(files)
+                    continue
+                break
+        finally:
+            for file in files or ():
+                file.close()  # only closes the files File opened itself
+
+        if resp.status == 204:  # method DELETE, or a message without wait
             return
 
         resp.raise_for_status()
 
-        self._update_fields(await resp.json())
+        if params is not None:
+            message = Message(await resp.read(), self)
+            if record:
+                self.attachment_cache.record(files, message.attachments)
+            return message if wait else None
+
+        self._update_fields(serializer.loads(await resp.read()))
         return self
 
+    def _send_request(self, method: str, url: str, body: bytes,
+                      multipart: Optional[MultipartBody], headers: dict,
+                      params: Optional[dict],
+                      timeouts: tuple) -> 'requests.Response':
+        # requests has no total timeout, the deadline caps the others
+        timeout = timeouts[:2]
+        if method == "POST":
+            if multipart is not None:
+                headers.update(multipart.headers)
+                return self.session.post(url, data=multipart,
+                                         headers=headers, params=params,
+                                         timeout=timeout)
+            headers['Content-Type'] = 'application/json'
+            return self.session.post(url, data=body, headers=headers,
+                                     params=params, timeout=timeout)
+
+        elif method == "DELETE":
+            return self.session.delete(url, headers=headers,
+                                       timeout=timeout)
+
+        elif method == "PATCH":
+            headers['Content-Type'] = 'application/json'
+            return self.session.patch(url, data=body, headers=headers,
+                                      timeout=timeout)
+
+        elif method == "GET":
+            return self.session.get(url, headers=headers, timeout=timeout)
+
+        raise ValueError("Bad method: {}".format(method))
+
+    async def _async_send_request(self, method: str, url: str, body: bytes,
+                                  multipart: Optional[MultipartBody],
+                                  headers: dict, params: Optional[dict],
+                                  timeouts: tuple) -> \
+            'aiohttp.ClientResponse':
+        import aiohttp
+
+        connect, read, total = timeouts
+        timeout = aiohttp.ClientTimeout(total=total, sock_connect=connect,
+                                        sock_read=read)
+        if method == "POST":
+            if multipart is not None:
+                headers.update(multipart.headers)
+                return await self.session.post(url, data=multipart,
+                                               headers=headers,
+                                               params=params,
+                                               timeout=timeout)
+            headers['Content-Type'] = 'application/json'
+            return await self.session.post(url, data=body, headers=headers,
+                                           params=params, timeout=timeout)
+
+        elif method == "DELETE":
+            return await self.session.delete(url, headers=headers,
+                                             timeout=timeout)
+
+        elif method == "PATCH":
+            headers['Content-Type'] = 'application/json'
+            return await self.session.patch(url, data=body, headers=headers,
+                                            timeout=timeout)
+
+        elif method == "GET":
+            return await self.session.get(url, headers=headers,
+                                          timeout=timeout)
+
+        raise ValueError("Bad method: {}".format(method))
+
+    def _timeouts(self, expires: Optional[float]) -> tuple:
+        # the (connect, read, total) timeouts of the next attempt
+        if self.timeout is None or isinstance(self.timeout, tuple):
+            connect, read = self.timeout or (None, None)
+        else:
+            connect = read = self.timeout
+
+        total = None
+        if expires is not None:
+            total = expires - time.monotonic()
+            connect = total if connect is None else min(connect, total)
+            read = total if read is None else min(read, total)
+        return connect, read, total
+
+    @staticmethod
+    def _check_deadline(expires: Optional[float], delay: float = 0.0) -> None:
+        if expires is not None and time.monotonic() + delay >= expires:
+            raise DeadlineExceeded("The request can't be completed before "
+                                   "its deadline.")
+
+    @staticmethod
+    def _rewind(files: Optional[List[File]]) -> None:
+        for file in files or ():
+            file.seek()
+
+    def _build_message(self, content: str = '',
+                       embed: Optional[Embed] = None,
+                       embeds: Optional[List[Embed]] = None,
+                       file: Optional[File] = None,
+                       username: str = '',
+                       avatar_url: str = '',
+                       tts: bool = False,
+                       files: Optional[List[File]] = None) -> tuple:
+        username = username if username else self.username
+        avatar_url = avatar_url if avatar_url else self.avatar_url
+        payload = build_payload(content, embed, embeds, file, username,
+                                avatar_url, tts, files, self.validation)
+        if file is not None:
+            files = [file]
+        if files and self.attachment_cache is not None:
+            files = self.attachment_cache.apply(payload, files)
+        return payload, files
+
+    def _build_messages(self, content: str = '',
+                        embed: Optional[Embed] = None,
+                        embeds: Optional[List[Embed]] = None,
+                        file: Optional[File] = None,
+                        username: str = '',
+                        avatar_url: str = '',
+                        tts: bool = False,
+                        files: Optional[List[File]] = None,
+                        split: bool = False) -> List[tuple]:
+        # every chunk is built (and validated) before the first one is sent
+        chunks = [content]
+        if split and len(content) > MAX_CONTENT_LENGTH:
+            chunks = split_content(content, MAX_CONTENT_LENGTH) or ['']
+        messages = [self._build_message(chunk, username=username,
+                                        avatar_url=avatar_url, tts=tts)
+                    for chunk in chunks[:-1]]
+        messages.append(self._build_message(chunks[-1], embed, embeds, file,
+                                            username, avatar_url, tts, files))
+        return messages
+
+    def _send_all(self, messages: List[tuple], wait: bool = False,
+                  deadline: Optional[float] = None) -> \
+            Union[Message, None, Coroutine[None, None, Optional[Message]]]:
+        # sends the messages in order, each one once the previous is sent
+        if self.is_async:
+            return self._async_send_all(messages, wait, deadline)
+        expires = None if deadline is None else time.monotonic() + deadline
+        result = None
+        for i, (payload, files) in enumerate(messages):
+            try:
+                result = self._request('POST', payload, files=files,
+                                       wait=wait,
+                                       deadline=self._remaining(expires))
+            except BaseException:
+                for message in messages[i + 1:]:
+                    self._drop(message)
+                raise
+        return result
+
+    async def _async_send_all(self, messages: List[tuple],
+                              wait: bool = False,
+                              deadline: Optional[float] = None) -> \
+            Optional[Message]:
+        expires = None if deadline is None else time.monotonic() + deadline
+        result = None
+        for i, (payload, files) in enumerate(messages):
+            try:
+                result = await self._async_request(
+                    'POST', payload, files=files, wait=wait,
+                    deadline=self._remaining(expires))
+            except BaseException:
+                for message in messages[i + 1:]:
+                    self._drop(message)
+                raise
+        return result
+
+    @staticmethod
+    def _remaining(expires: Optional[float]) -> Optional[float]:
+        if expires is None:
+            return None
+        return max(0.0, expires - time.monotonic())
+
+    def _dispatch(self, item: tuple) -> None:
+        if self.metrics is not None:
+            self._queue_depth()
+        messages, expires = item
+        self._send_all(messages, deadline=self._remaining(expires))
+
+    async def _async_dispatch(self, item: tuple) -> None:
+        if self.metrics is not None:
+            self._queue_depth()
+        messages, expires = item
+        await self._send_all(messages, deadline=self._remaining(expires))
+
+    async def _async_queued(self, queued: Coroutine) -> bool:
+        result = await queued
+        self._queue_depth()
+        return result
+
+    def _queue_depth(self) -> None:
+        self.metrics.queue_depth(self.id, len(self._dispatcher))
+
+    @staticmethod
+    async def _async_return(value):
+        return value
+
+    @staticmethod
+    def _drop(message: tuple) -> None:
+        for file in message[1] or ():
+            file.close()
+
+    @classmethod
+    def _drop_queued(cls, item: tuple) -> None:
+        for message in item[0]:
+            cls._drop(message)
+
+    @staticmethod
+    def _encode(payload: Union[dict, bytes]) -> bytes:
+        if isinstance(payload, bytes):
+            return payload
+
+        embeds = payload.get('embeds')
+        if not embeds or not isinstance(embeds[0], bytes):
+            return serializer.dumps(payload)
+
+        rest = {k: v for k, v in payload.items() if k != 'embeds'}
+        head = serializer.dumps(rest)[:-1]
+        return head + (b',' if rest else b'') + b'"embeds":[' + \
+            b','.join(embeds) + b']}'
+
+    def _route(self, method: str, path: str = '') -> str:
+        # message IDs are left out, edits share the bucket of the webhook
+        resource = re.sub(r'/[0-9]+', '', path)
+        return '{} {} {}'.format(method, self.id, resource).rstrip()
+
+    @staticmethod
+    def _message_path(message: Union[Message, int]) -> str:
+        message_id = message.id if isinstance(message, Message) else message
+        return '/messages/{}'.format(int(message_id))
+
+    def _rate_limited(self, route: str, headers, data: dict) -> None:
+        is_global = data.get('global', False) or \
+            headers.get('X-RateLimit-Global') == 'true'
+        self.ratelimiter.rate_limited(route, data['retry_after'] / 1000.0,
+                                      is_global)
+
     def _update_fields(self, data: dict) -> None:
         if 'content' in data:
             return  # a message object was returned
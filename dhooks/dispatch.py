@@ -0,0 +1,312 @@
+import asyncio
+import collections
+import logging
+import threading
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+log = logging.getLogger(__name__)
+
+#: Wait for room in the queue (optionally up to a timeout).
+BLOCK = 'block'
+
+#: Discard the oldest queued item to make room for the new one.
+DROP_OLDEST = 'drop_oldest'
+
+#: Discard the new item.
+DROP_NEWEST = 'drop_newest'
+
+OVERFLOW_POLICIES = (BLOCK, DROP_OLDEST, DROP_NEWEST)
+
+
+class Dispatcher:
+    """
+    A bounded in-memory queue drained by one or more background threads.
+
+    Parameters
+    ----------
+    func: Callable
+        Called by the worker threads with every queued item. Exceptions are
+        logged and otherwise ignored.
+
+    maxsize: int, optional
+        Defaults to ``1000``.
+        The maximum number of items in the queue.
+
+    workers: int, optional
+        Defaults to ``1``.
+        The number of worker threads. Items are processed in order only when
+        there is a single worker.
+
+    overflow: str, optional
+        Defaults to ``'block'``.
+        What :meth:`put` does when the queue is full, one of ``'block'``,
+        ``'drop_oldest'`` or ``'drop_newest'``.
+
+    on_drop: Callable, optional
+        Called with every item that is discarded because of :attr:`overflow`.
+
+    """
+
+    def __init__(self, func: Callable[[Any], Any], maxsize: int = 1000,
+                 workers: int = 1, overflow: str = BLOCK,
+                 on_drop: Optional[Callable[[Any], Any]] = None):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError("overflow must be one of {}."
+                             .format(', '.join(OVERFLOW_POLICIES)))
+        if maxsize < 1 or workers < 1:
+            raise ValueError("maxsize and workers must be at least 1.")
+
+        self.func = func
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.on_drop = on_drop
+
+        self._queue = collections.deque()
+        self._cond = threading.Condition()
+        self._unfinished = 0
+        self._closed = False
+        self._threads = []
+        for i in range(workers):
+            thread = threading.Thread(target=self._work, daemon=True,
+                                      name='dhooks-dispatcher-{}'.format(i))
+            thread.start()
+            self._threads.append(thread)
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def put(self, item: Any, timeout: Optional[float] = None) -> bool:
+        """
+        Queues an item without waiting for it to be processed.
+
+        Returns :class:`False` if the item was dropped, either because of
+        :attr:`overflow` or because ``timeout`` expired while blocking.
+
+        """
+        dropped = None
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Dispatcher is closed.")
+
+            if len(self._queue) >= self.maxsize:
+                if self.overflow == DROP_NEWEST:
+                    dropped = item
+                elif self.overflow == DROP_OLDEST:
+                    dropped = self._queue.popleft()
+                    self._unfinished -= 1
+                elif not self._cond.wait_for(
+                        lambda: len(self._queue) < self.maxsize or
+                        self._closed, timeout):
+                    dropped = item
+                elif self._closed:
+                    raise RuntimeError("Dispatcher is closed.")
+
+            if dropped is not item:
+                self._queue.append(item)
+                self._unfinished += 1
+                self._cond.notify_all()
+
+        if dropped is not None and self.on_drop is not None:
+            self.on_drop(dropped)
+        return dropped is not item
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Waits until every queued item has been processed.
+
+        Returns :class:`False` if ``timeout`` expired first.
+
+        """
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._unfinished, timeout)
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        """
+        Stops accepting items, drains the queue and stops the workers.
+
+        Returns :class:`False` if ``timeout`` expired before the queue was
+        drained, the remaining items are left to the daemon threads.
+
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+        for thread in self._threads:
+            if thread is threading.current_thread():
+                continue
+            thread.join(None if deadline is None
+                        else max(0.0, deadline - time.monotonic()))
+        return not any(thread.is_alive() for thread in self._threads)
+
+    def _work(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._queue or self._closed)
+                if not self._queue:  # closed and drained
+                    return
+                item = self._queue.popleft()
+                self._cond.notify_all()
+
+            try:
+                self.func(item)
+            except Exception:
+                log.exception('Exception while dispatching %r', item)
+            finally:
+                with self._cond:
+                    self._unfinished -= 1
+                    self._cond.notify_all()
+
+
+class AsyncDispatcher:
+    """
+    The asyncio counterpart of :class:`Dispatcher`: a bounded
+    :class:`asyncio.Queue` drained by a limited number of worker tasks.
+
+    :meth:`put` waits for room in the queue, so producers are slowed down
+    to the rate the workers can send at instead of creating unbounded tasks.
+
+    Parameters
+    ----------
+    func: Callable
+        Coroutine function awaited by the workers with every queued item.
+        Exceptions are logged and otherwise ignored.
+
+    maxsize: int, optional
+        Defaults to ``1000``.
+        The maximum number of items in the queue.
+
+    workers: int, optional
+        The number of worker tasks. If not provided, it follows
+        :attr:`concurrency`.
+
+    overflow: str, optional
+        Defaults to ``'block'``.
+        What :meth:`put` does when the queue is full, one of ``'block'``,
+        ``'drop_oldest'`` or ``'drop_newest'``.
+
+    on_drop: Callable, optional
+        Called with every item that is discarded because of :attr:`overflow`.
+
+    concurrency: Callable, optional
+        Called after every processed item when :attr:`workers` isn't set,
+        returns the number of workers that should be running (e.g. the limit
+        of the rate limit bucket), or :class:`None` if it isn't known yet.
+
+    """
+
+    #: The maximum number of workers started because of :attr:`concurrency`.
+    MAX_WORKERS = 16
+
+    def __init__(self, func: Callable[[Any], Awaitable[Any]],
+                 maxsize: int = 1000, workers: Optional[int] = None,
+                 overflow: str = BLOCK,
+                 on_drop: Optional[Callable[[Any], Any]] = None,
+                 concurrency: Optional[Callable[[], Optional[int]]] = None):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError("overflow must be one of {}."
+                             .format(', '.join(OVERFLOW_POLICIES)))
+        if maxsize < 1 or (workers is not None and workers < 1):
+            raise ValueError("maxsize and workers must be at least 1.")
+
+        self.func = func
+        self.maxsize = maxsize
+        self.workers = workers
+        self.overflow = overflow
+        self.on_drop = on_drop
+        self.concurrency = concurrency
+
+        self._queue = None  # type: Optional[asyncio.Queue]
+        self._tasks = []
+        self._closed = False
+
+    def __len__(self) -> int:
+        return 0 if self._queue is None else self._queue.qsize()
+
+    def _scale(self) -> None:
+        if self._queue is None:  # created lazily to bind the running loop
+            self._queue = asyncio.Queue(self.maxsize)
+
+        target = self.workers
+        if target is None:
+            wanted = self.concurrency() if self.concurrency else None
+            target = max(1, min(wanted or 1, self.MAX_WORKERS))
+
+        while len(self._tasks) < target:
+            self._tasks.append(asyncio.ensure_future(self._work()))
+
+    async def put(self, item: Any, timeout: Optional[float] = None) -> bool:
+        """
+        Queues an item, waiting for room in the queue when :attr:`overflow`
+        is ``'block'``.
+
+        Returns :class:`False` if the item was dropped, either because of
+        :attr:`overflow` or because ``timeout`` expired while waiting.
+
+        """
+        if self._closed:
+            raise RuntimeError("Dispatcher is closed.")
+        self._scale()
+
+        if self._queue.full():
+            if self.overflow == DROP_NEWEST:
+                self._drop(item)
+                return False
+            if self.overflow == DROP_OLDEST:
+                self._drop(self._queue.get_nowait())
+                self._queue.task_done()
+
+        try:
+            await asyncio.wait_for(self._queue.put(item), timeout)
+        except asyncio.TimeoutError:
+            self._drop(item)
+            return False
+        return True
+
+    async def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Waits until every queued item has been processed.
+
+        Returns :class:`False` if ``timeout`` expired first.
+
+        """
+        if self._queue is None:
+            return True
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    async def close(self, timeout: Optional[float] = None) -> bool:
+        """
+        Stops accepting items, drains the queue and stops the workers.
+
+        Returns :class:`False` if ``timeout`` expired before the queue was
+        drained, the remaining items are discarded.
+
+        """
+        self._closed = True
+        drained = await self.flush(timeout)
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        return drained
+
+    def _drop(self, item: Any) -> None:
+        if self.on_drop is not None:
+            self.on_drop(item)
+
+    async def _work(self) -> None:
+        while True:
+            item = await self._queue.get()
+            try:
+                await self.func(item)
+            except Exception:
+                log.exception('Exception while dispatching %r', item)
+            finally:
+                self._queue.task_done()
+            self._scale()
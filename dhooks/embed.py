@@ -1,6 +1,26 @@
 import datetime
 from typing import Union
 
+from . import serializer
+
+#: Discord's limits on the number of characters of the parts of an embed.
+TITLE_LIMIT = 256
+DESCRIPTION_LIMIT = 4096
+FIELD_NAME_LIMIT = 256
+FIELD_VALUE_LIMIT = 1024
+FOOTER_LIMIT = 2048
+AUTHOR_LIMIT = 256
+
+#: The maximum number of fields of an embed.
+MAX_FIELDS = 25
+
+#: The maximum number of characters of the embeds of a message, as counted
+#: by ``len(embed)``.
+MAX_LENGTH = 6000
+
+#: Appended to the text that is cut by :meth:`Embed.truncated`.
+ELLIPSIS = '\u2026'
+
 
 class Embed:
     """
@@ -31,6 +51,13 @@ class Embed:
         
     \*\*thumbnail_url: str, optional
         URL of the thumbnail.
+
+    .. note::
+        The serialized form and the length of the embed are cached until it
+        is modified through its methods or by assigning an attribute.
+        Mutating :attr:`fields` or the dictionaries of :attr:`author`,
+        :attr:`footer`, :attr:`image` or :attr:`thumbnail` in place isn't
+        detected.
         
     """  # noqa: W605
 
@@ -38,12 +65,19 @@ class Embed:
         'color', 'title', 'url', 'author',
         'description', 'fields', 'image',
         'thumbnail', 'footer', 'timestamp',
+        '_dict', '_json', '_length', '_oversized',
     )
 
+    _KEYS = __slots__[:-4]
+
     def __init__(self, **kwargs):
         """
         Initialises an Embed object.
         """
+        self._dict = None
+        self._json = None
+        self._length = 0  # running total of __len__
+        self._oversized = 0  # number of fields over their limits
         self.color = kwargs.get('color')
         self.title = kwargs.get('title')
         self.url = kwargs.get('url')
@@ -67,6 +101,152 @@ class Embed:
         if thumbnail_url is not None:
             self.set_thumbnail(thumbnail_url)
 
+    def __setattr__(self, key, value):
+        if key[0] == '_':
+            object.__setattr__(self, key, value)
+            return
+
+        if key in ('title', 'description', 'author', 'footer', 'fields'):
+            old = getattr(self, key, None)
+            object.__setattr__(self, '_length', self._length +
+                               self._count(key, value) -
+                               self._count(key, old))
+            if key == 'fields':
+                object.__setattr__(self, '_oversized', sum(
+                    map(self._is_oversized, value or ())))
+        object.__setattr__(self, key, value)
+        self._invalidate()
+
+    def _invalidate(self) -> None:
+        object.__setattr__(self, '_dict', None)
+        object.__setattr__(self, '_json', None)
+
+    @staticmethod
+    def _count(key: str, value) -> int:
+        if not value:
+            return 0
+        if key == 'author':
+            return len(value['name'] or '')
+        if key == 'footer':
+            return len(value['text'] or '')
+        if key == 'fields':
+            return sum(len(field['name']) + len(field['value'])
+                       for field in value)
+        return len(value)
+
+    @staticmethod
+    def _is_oversized(field: dict) -> bool:
+        return len(field['name']) > FIELD_NAME_LIMIT or \
+            len(field['value']) > FIELD_VALUE_LIMIT
+
+    def __len__(self) -> int:
+        """
+        Returns the number of characters that count towards discord's
+        limit of 6000 characters per message.
+        """
+        return self._length
+
+    def is_valid(self) -> bool:
+        """
+        Whether the embed is within discord's limits, in constant time.
+
+        """
+        return self._length <= MAX_LENGTH and not self._oversized and \
+            len(self.fields) <= MAX_FIELDS and \
+            len(self.title or '') <= TITLE_LIMIT and \
+            len(self.description or '') <= DESCRIPTION_LIMIT and \
+            self._count('author', self.author) <= AUTHOR_LIMIT and \
+            self._count('footer', self.footer) <= FOOTER_LIMIT
+
+    def validate(self) -> None:
+        """
+        Raises :exc:`ValueError` if the embed exceeds one of discord's
+        limits.
+
+        """
+        if self.is_valid():
+            return
+
+        checks = (
+            ('title', len(self.title or ''), TITLE_LIMIT),
+            ('description', len(self.description or ''), DESCRIPTION_LIMIT),
+            ('author name', self._count('author', self.author),
+             AUTHOR_LIMIT),
+            ('footer text', self._count('footer', self.footer),
+             FOOTER_LIMIT),
+            ('number of fields', len(self.fields), MAX_FIELDS),
+            ('embed', self._length, MAX_LENGTH),
+        )
+        for i, field in enumerate(self.fields):
+            checks += (
+                ('field {} name'.format(i), len(field['name']),
+                 FIELD_NAME_LIMIT),
+                ('field {} value'.format(i), len(field['value']),
+                 FIELD_VALUE_LIMIT),
+            )
+        for name, length, limit in checks:
+            if length > limit:
+                raise ValueError("The {} is too long ({} > {}).".format(
+                    name, length, limit))
+
+    def truncated(self, max_length: int = MAX_LENGTH) -> 'Embed':
+        """
+        Returns the embed cut down to fit discord's limits, or the embed
+        itself if it already fits.
+
+        Texts over their limit are cut and end with an ellipsis, fields past
+        the 25th are dropped. If the embed is still longer than
+        ``max_length``, its description, then its last fields, then its
+        footer, author and title are cut until it fits.
+
+        Parameters
+        ----------
+        max_length: int, optional
+            Defaults to ``6000``.
+            The maximum value of ``len(embed)`` of the result.
+
+        """
+        if self.is_valid() and self._length <= max_length:
+            return self
+
+        embed = Embed()
+        for key in self._KEYS:
+            setattr(embed, key, getattr(self, key))
+
+        embed.title = _clip(embed.title, TITLE_LIMIT)
+        embed.description = _clip(embed.description, DESCRIPTION_LIMIT)
+        if embed.author is not None:
+            embed.author = dict(embed.author, name=_clip(
+                embed.author['name'], AUTHOR_LIMIT))
+        if embed.footer is not None:
+            embed.footer = dict(embed.footer, text=_clip(
+                embed.footer['text'], FOOTER_LIMIT))
+        embed.fields = [
+            dict(field, name=_clip(field['name'], FIELD_NAME_LIMIT),
+                 value=_clip(field['value'], FIELD_VALUE_LIMIT))
+            for field in self.fields[:MAX_FIELDS]
+        ]
+
+        excess = len(embed) - max_length
+        if excess > 0 and embed.description:
+            embed.description = _clip(
+                embed.description, max(len(embed.description) - excess, 0))
+            excess = len(embed) - max_length
+        while excess > 0 and embed.fields:
+            embed.del_field(-1)
+            excess = len(embed) - max_length
+        for key, text in (('footer', 'text'), ('author', 'name')):
+            section = getattr(embed, key)
+            if excess > 0 and section is not None and section[text]:
+                section = dict(section, **{text: _clip(
+                    section[text], max(len(section[text]) - excess, 0))})
+                setattr(embed, key, section)
+                excess = len(embed) - max_length
+        if excess > 0 and embed.title:
+            embed.title = _clip(embed.title,
+                                max(len(embed.title) - excess, 0))
+        return embed
+
     def del_field(self, index: int) -> None:
         """
         Deletes a field by index.
@@ -77,7 +257,10 @@ class Embed:
             Index of the field to delete.
 
         """
-        self.fields.pop(index)
+        field = self.fields.pop(index)
+        self._length -= len(field['name']) + len(field['value'])
+        self._oversized -= self._is_oversized(field)
+        self._invalidate()
 
     def set_title(self, title: str, url: str = None) -> None:
         """
@@ -138,6 +321,9 @@ class Embed:
             'inline': inline
         }
         self.fields.append(field)
+        self._length += len(name) + len(value)
+        self._oversized += self._is_oversized(field)
+        self._invalidate()
 
     def set_author(self, name: str, icon_url: str = None, url: str = None) -> \
             None:
@@ -207,9 +393,32 @@ class Embed:
     def to_dict(self) -> dict:
         """
         Turns the :class:`Embed` object into a dictionary.
+
+        The dictionary is cached until the embed is modified, and must not
+        be modified itself.
         """
-        return {
-            key: getattr(self, key)
-            for key in self.__slots__
-            if getattr(self, key) is not None
-        }
+        if self._dict is None:
+            self._dict = {
+                key: value for key, value in
+                ((key, getattr(self, key)) for key in self._KEYS)
+                if value is not None
+            }
+        return self._dict
+
+    def to_json(self) -> bytes:
+        """
+        Turns the :class:`Embed` object into JSON encoded bytes.
+
+        The bytes are cached until the embed is modified.
+        """
+        if self._json is None:
+            self._json = serializer.dumps(self.to_dict())
+        return self._json
+
+
+def _clip(text, limit: int):
+    if text is None or len(text) <= limit:
+        return text
+    if limit == 0:
+        return ''
+    return text[:limit - 1] + ELLIPSIS
@@ -1,4 +1,8 @@
-from typing import BinaryIO, Union
+import hashlib
+import io
+import mmap
+import os
+from typing import BinaryIO, Iterator, Optional, Union
 
 
 class File:
@@ -21,13 +25,80 @@ class File:
         if isinstance(fp, str):
             self.fp = open(fp, 'rb')
             self._manual_opened = True
+            self._path = fp  # type: Optional[str]
             self.name = name if name else fp
         else:
             self.fp = fp
             self._manual_opened = False
+            self._path = None
             self.name = name if name else getattr(fp, 'name', 'filename')
         self._close = self.fp.close
         self.fp.close = lambda: None  # prevent aiohttp from closing the file
+        self._mmap = None  # type: Optional[mmap.mmap]
+        self._digest = None  # type: Optional[str]
+
+    @property
+    def digest(self) -> str:
+        """
+        The SHA-256 hash of the content of the file, as a hex string.
+
+        It is computed once, the content of the file must not change
+        afterwards.
+
+        """
+        if self._digest is None:
+            sha = hashlib.sha256()
+            for chunk in self.iter_chunks():
+                sha.update(chunk)
+            self._digest = sha.hexdigest()
+        return self._digest
+
+    @property
+    def size(self) -> int:
+        """
+        The size of the file in bytes.
+
+        """
+        try:
+            return os.fstat(self.fp.fileno()).st_size
+        except (AttributeError, OSError, io.UnsupportedOperation):
+            position = self.fp.tell()
+            size = self.fp.seek(0, io.SEEK_END)
+            self.fp.seek(position)
+            return size
+
+    def iter_chunks(self, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+        """
+        Yields the content of the file in chunks of up to ``chunk_size``
+        bytes, starting from the beginning of the file.
+
+        Files on disk are memory-mapped, and the chunks are views of the
+        mapping so they are never copied in memory. Other streams are read
+        chunk by chunk.
+
+        """
+        view = self._view()
+        if view is not None:
+            for offset in range(0, len(view), chunk_size):
+                yield view[offset:offset + chunk_size]
+            return
+
+        self.seek()
+        while True:
+            chunk = self.fp.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+    def _view(self) -> Optional[memoryview]:
+        if self._mmap is None:
+            try:
+                self._mmap = mmap.mmap(self.fp.fileno(), 0,
+                                       access=mmap.ACCESS_READ)
+            except (AttributeError, OSError, ValueError,
+                    io.UnsupportedOperation):
+                return None  # not a file on disk, or an empty one
+        return memoryview(self._mmap)
 
     def seek(self, offset: int = 0, *args, **kwargs):
         """
@@ -37,6 +108,15 @@ class File:
 
         return self.fp.seek(offset, *args, **kwargs)
 
+    def _reopen(self) -> None:
+        # opens again a file File opened from a path and closed, so it can
+        # be sent once more, and rewinds it
+        if self._path is not None and self.fp.closed:
+            self.fp = open(self._path, 'rb')
+            self._close = self.fp.close
+            self.fp.close = lambda: None
+        self.seek()
+
     def close(self, force=False) -> None:
         """
         Closes the file if the file was opened by :class:`File`,
@@ -48,6 +128,13 @@ class File:
             If set to :class:`True`, force close every file.
 
         """
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:  # chunks are still referenced somewhere
+                pass
+            self._mmap = None
+
         self.fp.close = self._close
         if self._manual_opened or force:
             self.fp.close()
@@ -0,0 +1,286 @@
+import collections
+import datetime
+import logging
+import threading
+from typing import List, Optional  # noqa: F401
+
+from .client import MAX_CONTENT_LENGTH, MAX_EMBEDS, Webhook
+from .embed import DESCRIPTION_LIMIT, MAX_LENGTH, Embed, _clip
+from .split import FENCE
+
+log = logging.getLogger(__name__)
+
+#: The color of the embeds of each level, an embed uses the color of the
+#: highest level its records reach.
+LEVEL_COLORS = {
+    logging.DEBUG: 0x95a5a6,
+    logging.INFO: 0x3498db,
+    logging.WARNING: 0xf1c40f,
+    logging.ERROR: 0xe74c3c,
+    logging.CRITICAL: 0x992d22,
+}
+
+#: The format of the records when no formatter is set.
+DEFAULT_FORMAT = '%(levelname)s %(name)s: %(message)s'
+
+# the records of a block are sent in a code block
+_OPEN = FENCE + '\n'
+_CLOSE = '\n' + FENCE
+
+
+class DiscordHandler(logging.Handler):
+    """
+    A :class:`logging.Handler` that sends log records to discord.
+
+    :meth:`emit` only formats and buffers the record, so logging never
+    waits for discord. A background thread sends the records buffered over
+    :attr:`flush_interval` seconds in as few messages as possible: the
+    records are joined into embeds of up to 4096 characters, titled and
+    colored after the highest level of their records (see
+    :data:`LEVEL_COLORS`), and the embeds are packed 10 to a message. ::
+
+        hook = Webhook(url)
+        logging.getLogger().addHandler(DiscordHandler(hook))
+
+    Under overload, records past :attr:`capacity`, and the records that
+    would need more than :attr:`max_messages` messages in one flush, are
+    dropped and sent as a one line summary instead.
+
+    The buffered records are sent when the handler is flushed or closed,
+    which :mod:`logging` does at interpreter shutdown. Records logged while
+    sending, by ``requests`` for instance, are ignored by the handler.
+
+    Parameters
+    ----------
+    webhook: :class:`Webhook`
+        The webhook the records are sent through, its
+        :attr:`~Webhook.is_async` must be :class:`False`.
+
+    level: int, optional
+        Defaults to :data:`logging.WARNING`.
+        The minimum level of the records that are sent.
+
+    flush_interval: float, optional
+        Defaults to ``2``.
+        The maximum number of seconds a record is buffered.
+
+    capacity: int, optional
+        Defaults to ``1000``.
+        The maximum number of buffered records.
+
+    max_messages: int, optional
+        Defaults to ``5``.
+        The maximum number of messages sent per flush, not counting the
+        summary of the dropped records.
+
+    embeds: bool, optional
+        Defaults to :class:`True`.
+        Whether or not the records are sent in embeds. Otherwise they are
+        sent as the content of the messages.
+
+    \*\*username: str, optional
+        Override the default username of the webhook.
+
+    \*\*avatar_url: str, optional
+        Override the default avatar of the webhook.
+
+    Attributes
+    ----------
+    dropped: int
+        The number of records that were dropped.
+
+    """  # noqa: W605
+
+    def __init__(self, webhook: Webhook, level: int = logging.WARNING,
+                 flush_interval: float = 2.0, capacity: int = 1000,
+                 max_messages: int = 5, embeds: bool = True, **options):
+        if webhook.is_async:
+            raise ValueError("The webhook must not be async, the records "
+                             "are sent by a thread.")
+        if capacity < 1 or max_messages < 1:
+            raise ValueError("capacity and max_messages must be at least 1.")
+        super().__init__(level)
+        self.setFormatter(logging.Formatter(DEFAULT_FORMAT))
+        self.webhook = webhook
+        self.flush_interval = flush_interval
+        self.capacity = capacity
+        self.max_messages = max_messages
+        self.embeds = embeds
+        self.username = options.get('username', '')
+        self.avatar_url = options.get('avatar_url', '')
+        self.dropped = 0
+        self._records = collections.deque()  # type: collections.deque
+        self._overflow = collections.Counter()  # levelname -> records
+        self._closed = False
+        self._cond = threading.Condition()
+        self._sending = threading.Lock()  # keeps the batches in order
+        self._local = threading.local()
+        self._thread = None  # type: Optional[threading.Thread]
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        # checked before the handler's lock is taken, which the thread that
+        # is flushing at shutdown holds
+        if getattr(self._local, 'sending', False):
+            return False
+        return super().handle(record)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """
+        Buffers the formatted record.
+
+        """
+        try:
+            text = self.format(record)
+        except Exception:
+            self.handleError(record)
+            return
+
+        with self._cond:
+            if self._closed:
+                return
+            if len(self._records) >= self.capacity:
+                self._overflow[record.levelname] += 1
+                self.dropped += 1
+                return
+            self._records.append((record.levelno, record.levelname, text,
+                                  record.created))
+            self._cond.notify_all()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run,
+                                                daemon=True,
+                                                name='dhooks-handler')
+                self._thread.start()
+
+    def flush(self) -> None:
+        """
+        Sends the buffered records right away, and waits until they are
+        sent.
+
+        """
+        with self._sending:
+            with self._cond:
+                records, self._records = self._records, collections.deque()
+                overflow, self._overflow = \
+                    self._overflow, collections.Counter()
+            if not records and not overflow:
+                return
+
+            self._local.sending = True
+            try:
+                for message in self._messages(list(records), overflow):
+                    try:
+                        self.webhook.send(username=self.username,
+                                          avatar_url=self.avatar_url,
+                                          **message)
+                    except Exception:
+                        log.exception("Failed to send log records.")
+            finally:
+                self._local.sending = False
+
+    def close(self) -> None:
+        """
+        Sends the buffered records and stops the handler.
+
+        """
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self.flush()
+        if self._thread is not None and \
+                self._thread is not threading.current_thread():
+            self._thread.join()
+        super().close()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(
+                    lambda: self._records or self._overflow or self._closed)
+                if self._closed:  # close() sends the rest
+                    return
+                # let the records of the interval pile up
+                self._cond.wait_for(lambda: self._closed,
+                                    self.flush_interval)
+            self.flush()
+
+    def _messages(self, records: List[tuple],
+                  overflow: collections.Counter) -> List[dict]:
+        # the keyword arguments of Webhook.send for the records
+        limit = (DESCRIPTION_LIMIT if self.embeds else MAX_CONTENT_LENGTH) \
+            - len(_OPEN) - len(_CLOSE)
+
+        # consecutive records, whatever their level, joined into code
+        # blocks as long as possible: [highest levelno, its levelname,
+        # time of the first record, texts, length, records per levelname]
+        blocks = []  # type: List[list]
+        for levelno, levelname, text, created in records:
+            text = _clip(text.replace(FENCE, '`\u200b``'), limit)
+            block = blocks[-1] if blocks else None
+            if block is None or block[4] + 1 + len(text) > limit:
+                blocks.append([levelno, levelname, created, [text],
+                               len(text), collections.Counter()])
+                block = blocks[-1]
+            else:
+                block[3].append(text)
+                block[4] += 1 + len(text)
+                if levelno > block[0]:
+                    block[0], block[1] = levelno, levelname
+            block[5][levelname] += 1
+
+        messages = []  # type: List[list]
+        if self.embeds:
+            length = 0
+            for block in blocks:
+                embed = self._embed(block)
+                if not messages or len(messages[-1]) >= MAX_EMBEDS or \
+                        length + len(embed) > MAX_LENGTH:
+                    messages.append([])
+                    length = 0
+                messages[-1].append((embed, block))
+                length += len(embed)
+        else:
+            messages = [[(None, block)] for block in blocks]
+
+        # past max_messages, the records are only counted
+        for message in messages[self.max_messages:]:
+            for _, block in message:
+                overflow.update(block[5])
+                self.dropped += len(block[3])
+        del messages[self.max_messages:]
+
+        if self.embeds:
+            kwargs = [{'embeds': [embed for embed, _ in message]}
+                      for message in messages]
+        else:
+            kwargs = [{'content': _OPEN + '\n'.join(message[0][1][3]) +
+                       _CLOSE} for message in messages]
+
+        if overflow:
+            summary = 'Dropped {} log records ({}).'.format(
+                sum(overflow.values()), ', '.join(
+                    '{} {}'.format(count, levelname)
+                    for levelname, count in overflow.most_common()))
+            if self.embeds:
+                kwargs.append({'embeds': [Embed(
+                    description=summary,
+                    color=LEVEL_COLORS[logging.WARNING])]})
+            else:
+                kwargs.append({'content': summary})
+        return kwargs
+
+    @staticmethod
+    def _embed(block: list) -> Embed:
+        levelno, levelname, created, texts = block[:4]
+        timestamp = datetime.datetime.fromtimestamp(
+            created, datetime.timezone.utc)
+        return Embed(title=levelname,
+                     description=_OPEN + '\n'.join(texts) + _CLOSE,
+                     color=_color(levelno),
+                     timestamp=timestamp.isoformat())
+
+
+def _color(levelno: int) -> int:
+    for level in sorted(LEVEL_COLORS, reverse=True):
+        if levelno >= level:
+            return LEVEL_COLORS[level]
+    return LEVEL_COLORS[logging.DEBUG]
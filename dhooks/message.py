@@ -0,0 +1,69 @@
+from typing import List, Optional
+
+from . import serializer
+
+
+class Message:
+    """
+    Represents a message sent through a webhook, returned by
+    :meth:`Webhook.send` when ``wait`` is set to :class:`True`.
+
+    The response is only decoded the first time one of the attributes is
+    accessed.
+
+    Attributes
+    ----------
+    webhook: :class:`Webhook`
+        The webhook the message was sent through.
+
+    raw: bytes
+        The JSON encoded message, as returned by discord.
+
+    """
+
+    __slots__ = ('webhook', 'raw', '_data')
+
+    def __init__(self, raw: bytes, webhook=None):
+        self.webhook = webhook
+        self.raw = raw
+        self._data = None  # type: Optional[dict]
+
+    def __repr__(self):
+        return '<Message id={}>'.format(self.id)
+
+    @property
+    def data(self) -> dict:
+        """The decoded message."""
+        if self._data is None:
+            self._data = serializer.loads(self.raw)
+        return self._data
+
+    @property
+    def id(self) -> int:
+        """The ID of the message."""
+        return int(self.data['id'])
+
+    @property
+    def channel_id(self) -> int:
+        """The ID of the channel the message was sent to."""
+        return int(self.data['channel_id'])
+
+    @property
+    def content(self) -> str:
+        """The contents of the message."""
+        return self.data.get('content', '')
+
+    @property
+    def embeds(self) -> List[dict]:
+        """The embeds of the message."""
+        return self.data.get('embeds', [])
+
+    @property
+    def attachments(self) -> List[dict]:
+        """The attachments of the message, along with their URLs."""
+        return self.data.get('attachments', [])
+
+    @property
+    def timestamp(self) -> Optional[str]:
+        """The ``ISO 8601`` time the message was sent at."""
+        return self.data.get('timestamp')
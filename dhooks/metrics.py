@@ -0,0 +1,277 @@
+"""
+Metrics of the requests made by :class:`Webhook` instances.
+
+Metrics are disabled by default, a webhook only reports them to the
+:class:`MetricsCollector` passed as its ``metrics`` option, or set with
+:func:`set_default_metrics`. ::
+
+    metrics = PrometheusCollector()
+    set_default_metrics(metrics)
+
+    hook = Webhook(url)
+    hook.send('Hello there!')
+
+    print(metrics.render())
+
+"""
+import bisect
+import collections
+import threading
+from typing import Callable, Optional, Tuple
+
+#: The upper bounds, in seconds, of the buckets of the request duration
+#: histogram of :class:`PrometheusCollector`.
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class MetricsCollector:
+    """
+    Receives the metrics of the requests made by webhooks.
+
+    Every method does nothing, subclasses override the ones they need. The
+    methods are called from the threads and tasks that make the requests,
+    so they should be fast and thread safe.
+
+    """
+
+    def request(self, webhook_id: int, status: Optional[int],
+                seconds: float, size: int) -> None:
+        """
+        Called after every attempt of a request, including rate limited and
+        retried ones.
+
+        Parameters
+        ----------
+        webhook_id: int
+            The ID of the webhook.
+
+        status: int or None
+            The status of the response, :class:`None` if the request failed
+            without one (connection error, timeout).
+
+        seconds: float
+            The time the attempt took.
+
+        size: int
+            The number of bytes of the body that was sent.
+
+        """
+
+    def rate_limit_sleep(self, webhook_id: int, seconds: float) -> None:
+        """
+        Called before a request waits for its rate limit bucket.
+
+        """
+
+    def retry(self, webhook_id: int) -> None:
+        """
+        Called before a request is retried after a server or connection
+        error. Requests sent again after a ``429`` aren't counted.
+
+        """
+
+    def queue_depth(self, webhook_id: int, depth: int) -> None:
+        """
+        Called with the number of messages queued by
+        :meth:`Webhook.send_nowait` when one is queued or sent.
+
+        """
+
+
+class CallbackCollector(MetricsCollector):
+    """
+    Calls a function with every metric, as
+    ``callback(name, webhook_id, value)``, where ``name`` is
+    ``'request_seconds'``, ``'request_bytes'``, ``'rate_limited'`` (the
+    value is ``1``), ``'rate_limit_sleep_seconds'``, ``'retries'`` (``1``)
+    or ``'queue_depth'``.
+
+    Parameters
+    ----------
+    callback: Callable[[str, int, float], Any]
+        The function called with every metric.
+
+    """
+
+    def __init__(self, callback: Callable[[str, int, float], None]):
+        self.callback = callback
+
+    def request(self, webhook_id: int, status: Optional[int],
+                seconds: float, size: int) -> None:
+        self.callback('request_seconds', webhook_id, seconds)
+        self.callback('request_bytes', webhook_id, size)
+        if status == 429:
+            self.callback('rate_limited', webhook_id, 1)
+
+    def rate_limit_sleep(self, webhook_id: int, seconds: float) -> None:
+        self.callback('rate_limit_sleep_seconds', webhook_id, seconds)
+
+    def retry(self, webhook_id: int) -> None:
+        self.callback('retries', webhook_id, 1)
+
+    def queue_depth(self, webhook_id: int, depth: int) -> None:
+        self.callback('queue_depth', webhook_id, depth)
+
+
+class PrometheusCollector(MetricsCollector):
+    """
+    Aggregates the metrics per webhook ID, and renders them in the
+    Prometheus text exposition format with :meth:`render`.
+
+    The metrics are:
+
+    - ``dhooks_requests_total``, by ``webhook_id`` and ``status`` (``none``
+      if there was no response).
+    - ``dhooks_request_duration_seconds``, a histogram.
+    - ``dhooks_request_bytes_total``
+    - ``dhooks_rate_limited_total``, the number of ``429`` responses.
+    - ``dhooks_rate_limit_sleep_seconds_total``
+    - ``dhooks_retries_total``
+    - ``dhooks_queue_depth``, a gauge.
+
+    Parameters
+    ----------
+    buckets: Tuple[float, ...], optional
+        The upper bounds of the buckets of the request duration histogram,
+        defaults to :data:`DEFAULT_BUCKETS`.
+
+    namespace: str, optional
+        Defaults to ``'dhooks'``.
+        The prefix of the metric names.
+
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS,
+                 namespace: str = 'dhooks'):
+        self.buckets = tuple(sorted(buckets))
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        self._requests = collections.Counter()  # (id, status) -> count
+        # id -> [count per bucket..., count over the last, count, sum]
+        self._histograms = {}
+        self._bytes = collections.Counter()
+        self._rate_limited = collections.Counter()
+        self._sleep = collections.Counter()
+        self._retries = collections.Counter()
+        self._queue_depth = {}
+
+    def request(self, webhook_id: int, status: Optional[int],
+                seconds: float, size: int) -> None:
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            self._requests[webhook_id, status] += 1
+            histogram = self._histograms.get(webhook_id)
+            if histogram is None:
+                histogram = self._histograms[webhook_id] = \
+                    [0] * (len(self.buckets) + 3)
+            histogram[index] += 1  # the counts are made cumulative later
+            histogram[-2] += 1
+            histogram[-1] += seconds
+            self._bytes[webhook_id] += size
+            if status == 429:
+                self._rate_limited[webhook_id] += 1
+
+    def rate_limit_sleep(self, webhook_id: int, seconds: float) -> None:
+        with self._lock:
+            self._sleep[webhook_id] += seconds
+
+    def retry(self, webhook_id: int) -> None:
+        with self._lock:
+            self._retries[webhook_id] += 1
+
+    def queue_depth(self, webhook_id: int, depth: int) -> None:
+        with self._lock:
+            self._queue_depth[webhook_id] = depth
+
+    def render(self) -> str:
+        """
+        Returns the metrics in the Prometheus text exposition format, to be
+        served with the ``text/plain; version=0.0.4`` content type.
+
+        """
+        lines = []
+        prefix = self.namespace + '_'
+
+        def header(metric: str, kind: str, help: str) -> None:
+            lines.append('# HELP {}{} {}'.format(prefix, metric, help))
+            lines.append('# TYPE {}{} {}'.format(prefix, metric, kind))
+
+        def sample(metric: str, labels: str, value) -> None:
+            lines.append('{}{}{{{}}} {}'.format(prefix, metric, labels,
+                                                _number(value)))
+
+        with self._lock:
+            header('requests_total', 'counter',
+                   'Requests made to discord, by response status.')
+            for (webhook_id, status), count in sorted(
+                    self._requests.items(), key=lambda item: (
+                        item[0][0], item[0][1] or 0)):
+                sample('requests_total', 'webhook_id="{}",status="{}"'.format(
+                    webhook_id, 'none' if status is None else status), count)
+
+            header('request_duration_seconds', 'histogram',
+                   'Duration of the requests made to discord.')
+            for webhook_id, histogram in sorted(self._histograms.items()):
+                total = 0
+                bounds = self.buckets + (float('inf'),)
+                for bound, count in zip(bounds, histogram):
+                    total += count
+                    sample('request_duration_seconds_bucket',
+                           'webhook_id="{}",le="{}"'.format(
+                               webhook_id, _number(bound)), total)
+                labels = 'webhook_id="{}"'.format(webhook_id)
+                sample('request_duration_seconds_count', labels,
+                       histogram[-2])
+                sample('request_duration_seconds_sum', labels,
+                       histogram[-1])
+
+            for metric, kind, help, values in (
+                    ('request_bytes_total', 'counter',
+                     'Bytes of the request bodies sent to discord.',
+                     self._bytes),
+                    ('rate_limited_total', 'counter',
+                     'Responses with the 429 status.', self._rate_limited),
+                    ('rate_limit_sleep_seconds_total', 'counter',
+                     'Time spent waiting for the rate limit.', self._sleep),
+                    ('retries_total', 'counter',
+                     'Requests retried after a server or connection error.',
+                     self._retries),
+                    ('queue_depth', 'gauge',
+                     'Messages queued by send_nowait.', self._queue_depth)):
+                header(metric, kind, help)
+                for webhook_id, value in sorted(values.items()):
+                    sample(metric, 'webhook_id="{}"'.format(webhook_id),
+                           value)
+
+        return '\n'.join(lines) + '\n'
+
+
+def _number(value) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(value)
+
+
+_default_metrics = None  # type: Optional[MetricsCollector]
+
+
+def get_default_metrics() -> Optional[MetricsCollector]:
+    """
+    Returns the process-wide :class:`MetricsCollector` that every
+    :class:`Webhook` uses when no ``metrics`` is given, :class:`None` (the
+    default) if metrics are disabled.
+
+    """
+    return _default_metrics
+
+
+def set_default_metrics(collector: Optional[MetricsCollector]) -> None:
+    """
+    Replaces the process-wide :class:`MetricsCollector`, :class:`None`
+    disables metrics.
+
+    Only :class:`Webhook` instances created afterwards will use it.
+
+    """
+    global _default_metrics
+    _default_metrics = collector
@@ -0,0 +1,106 @@
+import uuid
+from typing import Iterator, List
+
+from .file import File
+
+
+class MultipartBody:
+    """
+    A ``multipart/form-data`` request body that streams its files.
+
+    The body is prepared once: its headers and length are computed up front,
+    and every iteration yields the parts again from the start, so the same
+    body can be sent again after a rate limit without being rebuilt. Only
+    one chunk of a file is held in memory at a time, see
+    :meth:`File.iter_chunks`.
+
+    Parameters
+    ----------
+    payload_json: bytes
+        The JSON encoded message.
+
+    files: List[:class:`File`]
+        The files to upload.
+
+    chunk_size: int, optional
+        Defaults to ``65536``.
+        The maximum size of the file chunks.
+
+    """
+
+    def __init__(self, payload_json: bytes, files: List[File],
+                 chunk_size: int = 64 * 1024):
+        self.boundary = uuid.uuid4().hex
+        self.chunk_size = chunk_size
+
+        self._parts = [
+            self._header('name="payload_json"', 'application/json'),
+            payload_json,
+            b'\r\n',
+        ]
+        for i, file in enumerate(files):
+            name = 'file' if len(files) == 1 else 'file{}'.format(i)
+            disposition = 'name="{}"; filename="{}"'.format(
+                name, file.name.replace('"', '%22').replace('\r', '%0D')
+                .replace('\n', '%0A'))
+            self._parts += [
+                self._header(disposition, 'application/octet-stream'),
+                file,
+                b'\r\n',
+            ]
+        self._parts.append('--{}--\r\n'.format(self.boundary).encode())
+
+        self._length = sum(part.size if isinstance(part, File)
+                           else len(part) for part in self._parts)
+
+    def _header(self, disposition: str, content_type: str) -> bytes:
+        return '--{}\r\nContent-Disposition: form-data; {}\r\n' \
+               'Content-Type: {}\r\n\r\n'.format(
+                   self.boundary, disposition, content_type).encode('utf-8')
+
+    @property
+    def content_type(self) -> str:
+        return 'multipart/form-data; boundary={}'.format(self.boundary)
+
+    @property
+    def headers(self) -> dict:
+        """
+        The ``Content-Type`` and ``Content-Length`` headers of the body.
+
+        """
+        return {
+            'Content-Type': self.content_type,
+            'Content-Length': str(self._length),
+        }
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> Iterator[bytes]:
+        for part in self._parts:
+            if isinstance(part, File):
+                yield from part.iter_chunks(self.chunk_size)
+            else:
+                yield part
+
+    def __aiter__(self) -> '_AsyncChunks':
+        return _AsyncChunks(iter(self))
+
+
+class _AsyncChunks:
+    """
+    Async iterator over the chunks of a :class:`MultipartBody`, for aiohttp.
+
+    """
+
+    def __init__(self, chunks: Iterator[bytes]):
+        self._chunks = chunks
+
+    def __aiter__(self) -> '_AsyncChunks':
+        return self
+
+    async def __anext__(self) -> bytes:
+        try:
+            return next(self._chunks)
+        except StopIteration:
+            raise StopAsyncIteration
@@ -0,0 +1,176 @@
+import itertools
+from typing import Sequence, Union, TYPE_CHECKING
+
+from .client import Webhook
+from .message import Message
+
+if TYPE_CHECKING:
+    import aiohttp  # noqa: F401
+    import requests  # noqa: F401
+
+#: Responses that mean a webhook was deleted or its token is invalid.
+DEAD_STATUSES = (401, 404)
+
+
+class WebhookPool:
+    """
+    Spreads messages over several webhooks of the same channel, so their
+    rate limits add up.
+
+    Every message is sent through the member with the most requests left
+    in its rate limit bucket. Members that respond with ``401`` or ``404``
+    are removed from the pool and the message is sent through another one.
+
+    Parameters
+    ----------
+    webhooks: List[str or :class:`Webhook`]
+        The members of the pool. URLs share the same session, :class:`Webhook`
+        objects use their own.
+
+    session: requests.Session or aiohttp.ClientSession, optional
+        The session used for the URLs in ``webhooks``. If not provided, the
+        session shared by every :class:`Webhook` is used.
+
+    is_async: bool, optional
+        Defaults to :class:`False`.
+        Whether or not :meth:`send` should return a coroutine.
+
+    \*\*options
+        Passed to :class:`Webhook` for the URLs in ``webhooks``.
+
+    Attributes
+    ----------
+    members: List[:class:`Webhook`]
+        The webhooks that are still usable.
+
+    dead: List[:class:`Webhook`]
+        The webhooks that were removed from the pool.
+
+    """  # noqa: W605
+
+    def __init__(self, webhooks: Sequence[Union[str, Webhook]],
+                 session: Union['aiohttp.ClientSession', 'requests.Session',
+                                None] = None,
+                 is_async: bool = False,
+                 **options):
+        if not webhooks:
+            raise ValueError("At least one webhook must be provided.")
+
+        self.session = session
+        self.is_async = is_async
+
+        self.members = [
+            hook if isinstance(hook, Webhook) else
+            Webhook(hook, session=session, is_async=is_async, **options)
+            for hook in webhooks
+        ]  # type: list
+        self.dead = []  # type: list
+        self._counter = itertools.count()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    def close(self):
+        """
+        Closes the session passed in, the :class:`Webhook` objects that
+        were passed in are left open.
+
+        """
+        if self.is_async:
+            return self._async_close()
+        if self.session is not None:
+            self.session.close()
+
+    async def _async_close(self):
+        if self.session is not None:
+            await self.session.close()
+
+    def pick(self) -> Webhook:
+        """
+        Returns the member with the most requests left in its rate limit
+        bucket, or the one whose bucket resets first if they are all
+        exhausted. Ties are broken in a round-robin fashion.
+
+        """
+        if not self.members:
+            raise RuntimeError("Every webhook of the pool is dead.")
+
+        start = next(self._counter)
+        best = best_score = None
+        for i in range(len(self.members)):
+            hook = self.members[(start + i) % len(self.members)]
+            remaining, reset_after = hook.ratelimiter.budget(
+                hook._route('POST'))
+            if remaining is None:  # nothing is known, so nothing is used
+                remaining = float('inf')
+            score = (remaining, -reset_after)
+            if best is None or score > best_score:
+                best, best_score = hook, score
+        return best
+
+    def send(self, *args, **kwargs) -> Union[Webhook, Message]:
+        """
+        Sends a message through the best member of the pool, takes the same
+        arguments as :meth:`Webhook.send`.
+
+        Files are rewound when the message is sent through another member,
+        and opened again if :class:`File` opened them from a path.
+
+        Returns
+        -------
+        :class:`Webhook` or :class:`Message`
+            The message that was sent if ``wait`` is :class:`True`, its
+            :attr:`~Message.webhook` is the member that sent it. Otherwise
+            the member that sent the message.
+
+        """
+        if self.is_async:
+            return self._async_send(*args, **kwargs)
+
+        import requests
+
+        while True:
+            hook = self.pick()
+            try:
+                message = hook.send(*args, **kwargs)
+                return hook if message is None else message
+            except requests.HTTPError as e:
+                if e.response is None or \
+                        e.response.status_code not in DEAD_STATUSES:
+                    raise
+                self._remove(hook, e, kwargs)
+
+    async def _async_send(self, *args, **kwargs) -> Union[Webhook, Message]:
+        import aiohttp
+
+        while True:
+            hook = self.pick()
+            try:
+                message = await hook.send(*args, **kwargs)
+                return hook if message is None else message
+            except aiohttp.ClientResponseError as e:
+                if e.status not in DEAD_STATUSES:
+                    raise
+                self._remove(hook, e, kwargs)
+
+    def _remove(self, hook: Webhook, error: Exception, kwargs: dict) -> None:
+        if hook in self.members:
+            self.members.remove(hook)
+            self.dead.append(hook)
+        if not self.members:
+            raise error
+
+        files = list(kwargs.get('files') or ())
+        if kwargs.get('file') is not None:
+            files.append(kwargs['file'])
+        for file in files:
+            file._reopen()  # closed by the request that failed
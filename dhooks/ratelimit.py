@@ -0,0 +1,449 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Mapping, Optional
+
+
+class Bucket:
+    """
+    Represents the state of a single Discord rate limit bucket.
+
+    The state is filled from the ``X-RateLimit-*`` headers of every response,
+    and is used to delay requests *before* they are sent instead of waiting
+    for a ``429 Too Many Requests`` response.
+
+    Attributes
+    ----------
+    limit: int or None
+        The number of requests that can be made per window.
+
+    remaining: int or None
+        The number of requests that can still be made in the current window.
+        :class:`None` if no response for this bucket was seen yet.
+
+    reset_at: float
+        The :func:`time.monotonic` time at which the current window resets.
+
+    reset_after: float
+        The length of the last seen window in seconds.
+
+    """
+
+    __slots__ = ('limit', 'remaining', 'reset_at', 'reset_after')
+
+    def __init__(self):
+        self.limit = None  # type: Optional[int]
+        self.remaining = None  # type: Optional[int]
+        self.reset_at = 0.0
+        self.reset_after = 0.0
+
+    def acquire(self, now: float) -> float:
+        """
+        Reserves a request slot in this bucket.
+
+        Returns ``0`` if the request can be sent right away, otherwise
+        the number of seconds to wait before trying again.
+
+        """
+        if self.remaining is None:
+            return 0.0
+
+        if now >= self.reset_at:  # a new window has started
+            self.remaining = self.limit
+            self.reset_at = now + self.reset_after
+
+        if self.remaining > 0:
+            self.remaining -= 1
+            return 0.0
+        return self.reset_at - now
+
+    def update(self, limit: int, remaining: int, reset_after: float,
+               now: float) -> None:
+        """
+        Updates the bucket from the values of a response's headers.
+
+        """
+        reset_at = now + reset_after
+        if self.remaining is not None and now < self.reset_at:
+            # in-flight requests were already reserved locally, so the
+            # server's count may be higher than what is really left
+            remaining = min(remaining, self.remaining)
+
+        self.limit = limit
+        self.remaining = remaining
+        self.reset_at = reset_at
+        self.reset_after = reset_after
+
+    def exhaust(self, retry_after: float, now: float) -> None:
+        """
+        Marks the bucket as exhausted for ``retry_after`` seconds.
+
+        """
+        if self.limit is None:
+            self.limit = 1
+        self.remaining = 0
+        self.reset_at = max(self.reset_at, now + retry_after)
+        self.reset_after = max(self.reset_after, retry_after)
+
+
+class RateLimiter:
+    """
+    Keeps track of the rate limit buckets of one or more webhooks.
+
+    Routes are strings in the form of ``'{method} {major} ...'``, where
+    ``major`` is the resource the rate limit is applied to (e.g. the webhook
+    id in ``'POST 1234'``). Routes are mapped to buckets with the
+    ``X-RateLimit-Bucket`` header and the major parameter, so routes of the
+    same resource that share a bucket also share its state.
+
+    Until the first response of a route is seen, only one request is let
+    through at a time, so a burst of concurrent requests doesn't overshoot a
+    bucket whose limit isn't known yet.
+
+    Every method only holds an internal lock for a short, non-blocking
+    critical section, waiting is left to the caller so the same limiter
+    works with both :func:`time.sleep` and :func:`asyncio.sleep`.
+
+    """
+
+    #: Seconds between polls while the bucket of a route is being discovered.
+    DISCOVERY_POLL = 0.05
+
+    #: Seconds after which a discovery request is assumed lost.
+    DISCOVERY_TIMEOUT = 10.0
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes = {}  # type: dict
+        self._buckets = {}  # type: dict
+        self._pending = {}  # type: dict
+        self._global_reset_at = 0.0
+
+    @staticmethod
+    def _clock() -> float:
+        return time.monotonic()
+
+    def _bucket(self, route: str) -> Optional[Bucket]:
+        return self._buckets.get(self._routes.get(route, route))
+
+    @staticmethod
+    def _bucket_name(route: str, headers: Mapping[str, str]) -> str:
+        bucket = headers.get('X-RateLimit-Bucket')
+        if bucket is None:
+            return route
+        # the same bucket hash is shared by every webhook, but each of them
+        # is limited separately
+        parts = route.split()
+        return '{}:{}'.format(bucket, parts[1] if len(parts) > 1 else '')
+
+    def budget(self, route: str) -> tuple:
+        """
+        Returns the number of requests that can still be made for ``route``
+        (:class:`None` if it isn't known yet) and the number of seconds
+        until its bucket resets.
+
+        """
+        with self._lock:
+            now = self._clock()
+            if self._global_reset_at > now:
+                return 0, self._global_reset_at - now
+            return self._budget(self._bucket(route), now)
+
+    @staticmethod
+    def _budget(bucket: Optional[Bucket], now: float) -> tuple:
+        if bucket is None or bucket.remaining is None:
+            return None, 0.0
+        if now >= bucket.reset_at:
+            return bucket.limit, 0.0
+        return bucket.remaining, bucket.reset_at - now
+
+    def limit(self, route: str) -> Optional[int]:
+        """
+        Returns the number of requests per window of the bucket of
+        ``route``, or :class:`None` if it isn't known yet.
+
+        """
+        with self._lock:
+            bucket = self._bucket(route)
+            return None if bucket is None else bucket.limit
+
+    def acquire(self, route: str) -> float:
+        """
+        Reserves a request slot for ``route``.
+
+        Returns ``0`` if the request can be sent right away, otherwise
+        the number of seconds to wait before calling :meth:`acquire` again.
+
+        """
+        with self._lock:
+            now = self._clock()
+            if self._global_reset_at > now:
+                return self._global_reset_at - now
+
+            bucket = self._bucket(route)
+            if bucket is None:
+                started = self._pending.get(route)
+                if started is not None and \
+                        now - started < self.DISCOVERY_TIMEOUT:
+                    return self.DISCOVERY_POLL
+                self._pending[route] = now
+                return 0.0
+            return bucket.acquire(now)
+
+    def update(self, route: str, headers: Mapping[str, str]) -> None:
+        """
+        Updates the bucket of ``route`` from the ``X-RateLimit-*`` headers
+        of a response. Responses without those headers are ignored.
+
+        """
+        remaining = headers.get('X-RateLimit-Remaining')
+        reset_after = headers.get('X-RateLimit-Reset-After')
+        if remaining is None or reset_after is None:
+            with self._lock:
+                self._pending.pop(route, None)
+            return
+
+        limit = int(headers.get('X-RateLimit-Limit', int(remaining) + 1))
+        key = self._bucket_name(route, headers)
+
+        with self._lock:
+            now = self._clock()
+            self._pending.pop(route, None)
+            self._routes[route] = key
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = Bucket()
+            bucket.update(limit, int(remaining), float(reset_after), now)
+
+    def rate_limited(self, route: str, retry_after: float,
+                     is_global: bool = False) -> None:
+        """
+        Records a ``429 Too Many Requests`` response for ``route``.
+
+        Parameters
+        ----------
+        route: str
+            The route that was rate limited.
+
+        retry_after: float
+            The number of seconds to wait before retrying.
+
+        is_global: bool, optional
+            Defaults to :class:`False`.
+            Whether or not the rate limit applies to every route.
+
+        """
+        with self._lock:
+            now = self._clock()
+            self._pending.pop(route, None)
+            if is_global:
+                self._global_reset_at = max(self._global_reset_at,
+                                            now + retry_after)
+                return
+
+            key = self._routes.get(route, route)
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = Bucket()
+            bucket.exhaust(retry_after, now)
+
+
+class SQLiteRateLimiter(RateLimiter):
+    """
+    A :class:`RateLimiter` that keeps its state in an SQLite database, so
+    several processes on the same host share the same buckets.
+
+    This is meant for worker pools (gunicorn, celery, ...) where every
+    process posts to the same webhooks. Create one in every worker, pointing
+    at the same file, and make it the default: ::
+
+        dhooks.set_default_ratelimiter(
+            dhooks.SQLiteRateLimiter('/tmp/dhooks-ratelimit.sqlite'))
+
+    Every call runs in a short ``BEGIN IMMEDIATE`` transaction, so the
+    database serialises the bookkeeping between processes.
+
+    Parameters
+    ----------
+    path: str
+        The path of the database file, it is created if it doesn't exist.
+
+    timeout: float, optional
+        Defaults to ``5``.
+        The number of seconds to wait for another process to release the
+        database lock.
+
+    """
+
+    SCHEMA = (
+        'CREATE TABLE IF NOT EXISTS buckets (key TEXT PRIMARY KEY, '
+        'lim INTEGER, remaining INTEGER, reset_at REAL, reset_after REAL)',
+        'CREATE TABLE IF NOT EXISTS routes (route TEXT PRIMARY KEY, '
+        'bucket TEXT, pending REAL)',
+    )
+
+    #: The key of the row that holds the global rate limit.
+    GLOBAL_KEY = '__global__'
+
+    def __init__(self, path: str, timeout: float = 5.0):
+        super().__init__()
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+        with self._transaction() as db:
+            for statement in self.SCHEMA:
+                db.execute(statement)
+
+    @staticmethod
+    def _clock() -> float:
+        return time.time()  # monotonic clocks aren't shared by processes
+
+    def _connect(self) -> sqlite3.Connection:
+        # connections can neither be shared by threads nor survive a fork
+        db = getattr(self._local, 'db', None)
+        if db is None or self._local.pid != os.getpid():
+            db = sqlite3.connect(self.path, timeout=self.timeout,
+                                 isolation_level=None)
+            self._local.db = db
+            self._local.pid = os.getpid()
+        return db
+
+    def _transaction(self) -> '_Transaction':
+        return _Transaction(self._connect())
+
+    @staticmethod
+    def _load(db: sqlite3.Connection, key: str) -> Optional[Bucket]:
+        row = db.execute('SELECT lim, remaining, reset_at, reset_after '
+                         'FROM buckets WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return None
+        bucket = Bucket()
+        bucket.limit, bucket.remaining, bucket.reset_at, \
+            bucket.reset_after = row
+        return bucket
+
+    @staticmethod
+    def _store(db: sqlite3.Connection, key: str, bucket: Bucket) -> None:
+        db.execute('INSERT OR REPLACE INTO buckets VALUES (?, ?, ?, ?, ?)',
+                   (key, bucket.limit, bucket.remaining, bucket.reset_at,
+                    bucket.reset_after))
+
+    def _bucket_key(self, db: sqlite3.Connection, route: str) -> str:
+        row = db.execute('SELECT bucket FROM routes WHERE route = ?',
+                         (route,)).fetchone()
+        return row[0] if row is not None and row[0] is not None else route
+
+    def _clear_pending(self, db: sqlite3.Connection, route: str) -> None:
+        db.execute('UPDATE routes SET pending = NULL WHERE route = ?',
+                   (route,))
+
+    def budget(self, route: str) -> tuple:
+        with self._transaction() as db:
+            now = self._clock()
+            glob = self._load(db, self.GLOBAL_KEY)
+            if glob is not None and glob.reset_at > now:
+                return 0, glob.reset_at - now
+            return self._budget(self._load(db, self._bucket_key(db, route)),
+                                now)
+
+    def limit(self, route: str) -> Optional[int]:
+        with self._transaction() as db:
+            bucket = self._load(db, self._bucket_key(db, route))
+            return None if bucket is None else bucket.limit
+
+    def acquire(self, route: str) -> float:
+        with self._transaction() as db:
+            now = self._clock()
+            glob = self._load(db, self.GLOBAL_KEY)
+            if glob is not None and glob.reset_at > now:
+                return glob.reset_at - now
+
+            bucket = self._load(db, self._bucket_key(db, route))
+            if bucket is None:
+                row = db.execute('SELECT pending FROM routes '
+                                 'WHERE route = ?', (route,)).fetchone()
+                if row is not None and row[0] is not None and \
+                        now - row[0] < self.DISCOVERY_TIMEOUT:
+                    return self.DISCOVERY_POLL
+                db.execute('INSERT OR REPLACE INTO routes VALUES (?, ?, ?)',
+                           (route, None, now))
+                return 0.0
+
+            delay = bucket.acquire(now)
+            self._store(db, self._bucket_key(db, route), bucket)
+            return delay
+
+    def update(self, route: str, headers: Mapping[str, str]) -> None:
+        remaining = headers.get('X-RateLimit-Remaining')
+        reset_after = headers.get('X-RateLimit-Reset-After')
+        if remaining is None or reset_after is None:
+            with self._transaction() as db:
+                self._clear_pending(db, route)
+            return
+
+        limit = int(headers.get('X-RateLimit-Limit', int(remaining) + 1))
+        key = self._bucket_name(route, headers)
+
+        with self._transaction() as db:
+            now = self._clock()
+            db.execute('INSERT OR REPLACE INTO routes VALUES (?, ?, ?)',
+                       (route, key, None))
+            bucket = self._load(db, key) or Bucket()
+            bucket.update(limit, int(remaining), float(reset_after), now)
+            self._store(db, key, bucket)
+
+    def rate_limited(self, route: str, retry_after: float,
+                     is_global: bool = False) -> None:
+        with self._transaction() as db:
+            now = self._clock()
+            self._clear_pending(db, route)
+            key = self.GLOBAL_KEY if is_global else \
+                self._bucket_key(db, route)
+            bucket = self._load(db, key) or Bucket()
+            bucket.exhaust(retry_after, now)
+            self._store(db, key, bucket)
+
+
+class _Transaction:
+    """
+    Context manager that wraps an ``IMMEDIATE`` SQLite transaction.
+
+    """
+
+    def __init__(self, db: sqlite3.Connection):
+        self.db = db
+
+    def __enter__(self) -> sqlite3.Connection:
+        self.db.execute('BEGIN IMMEDIATE')
+        return self.db
+
+    def __exit__(self, exc_type, *args):
+        self.db.execute('ROLLBACK' if exc_type is not None else 'COMMIT')
+
+
+_default_ratelimiter = RateLimiter()
+
+
+def get_default_ratelimiter() -> RateLimiter:
+    """
+    Returns the process-wide :class:`RateLimiter` that every
+    :class:`Webhook` uses when no ``ratelimiter`` is given.
+
+    Sharing it means a global rate limit pauses every sender at once, and
+    webhooks with the same id share their buckets, no matter how many
+    :class:`Webhook` instances (sync or async) point at them.
+
+    """
+    return _default_ratelimiter
+
+
+def set_default_ratelimiter(ratelimiter: RateLimiter) -> None:
+    """
+    Replaces the process-wide :class:`RateLimiter`.
+
+    Only :class:`Webhook` instances created afterwards will use it.
+
+    """
+    global _default_ratelimiter
+    _default_ratelimiter = ratelimiter
@@ -0,0 +1,205 @@
+import asyncio
+import collections
+import random
+import sys
+import threading
+import time
+from typing import Iterable, Optional, Tuple, Type
+
+#: Statuses of the responses retried by default.
+RETRY_STATUSES = (500, 502, 503, 504)
+
+
+def retry_exceptions() -> Tuple[Type[Exception], ...]:
+    """
+    Returns the exceptions retried by default: the connection errors and
+    timeouts of ``requests`` and ``aiohttp``, the request couldn't be sent
+    or answered.
+
+    """
+    exceptions = [asyncio.TimeoutError]  # type: list
+    # a library that isn't imported yet can't have raised anything
+    requests = sys.modules.get('requests')
+    if requests is not None:
+        exceptions += [requests.ConnectionError, requests.Timeout]
+    aiohttp = sys.modules.get('aiohttp')
+    if aiohttp is not None:
+        exceptions.append(aiohttp.ClientConnectionError)
+    return tuple(exceptions)
+
+
+class RetryBudget:
+    """
+    Caps the number of retries relative to the number of requests, so that
+    retries can't multiply the load on a failing server.
+
+    Over the last :attr:`ttl` seconds, at most ``ratio`` retries are allowed
+    per request, plus ``min_per_second`` retries per second so that a low
+    traffic client can still retry.
+
+    Parameters
+    ----------
+    ratio: float, optional
+        Defaults to ``0.1``.
+        The number of retries allowed per request, ``0.1`` means retries add
+        at most 10% of extra load.
+
+    min_per_second: float, optional
+        Defaults to ``1``.
+        The number of retries per second allowed regardless of ``ratio``.
+
+    ttl: float, optional
+        Defaults to ``10``.
+        The number of seconds requests and retries are remembered for.
+
+    """
+
+    def __init__(self, ratio: float = 0.1, min_per_second: float = 1.0,
+                 ttl: float = 10.0):
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._requests = collections.deque()  # type: collections.deque
+        self._retries = collections.deque()  # type: collections.deque
+
+    @staticmethod
+    def _clock() -> float:
+        return time.monotonic()
+
+    def _prune(self, now: float) -> None:
+        for times in (self._requests, self._retries):
+            while times and times[0] <= now - self.ttl:
+                times.popleft()
+
+    def deposit(self) -> None:
+        """
+        Records a request.
+
+        """
+        with self._lock:
+            now = self._clock()
+            self._prune(now)
+            self._requests.append(now)
+
+    def withdraw(self) -> bool:
+        """
+        Records a retry if the budget allows it.
+
+        Returns :class:`False` if the retry must not be made.
+
+        """
+        with self._lock:
+            now = self._clock()
+            self._prune(now)
+            allowed = self.ratio * len(self._requests) + \
+                self.min_per_second * self.ttl
+            if len(self._retries) + 1 > allowed:
+                return False
+            self._retries.append(now)
+            return True
+
+
+_default_budget = RetryBudget()
+
+
+class RetryPolicy:
+    """
+    Decides which failed requests are retried, and how long to wait before
+    retrying them.
+
+    Rate limited requests are always retried by the :class:`Webhook`, the
+    policy only covers server errors and connection errors. Retries are
+    delayed with exponential backoff and full jitter: the n-th retry waits a
+    random time between ``0`` and ``min(max_delay, base_delay * 2 ** n)``
+    seconds, so that clients hit by the same outage don't retry in lockstep.
+
+    Retrying a message that the server received but failed to answer sends
+    it twice.
+
+    Parameters
+    ----------
+    max_attempts: int, optional
+        Defaults to ``3``.
+        The maximum number of times a request is sent, including the first.
+
+    statuses: Iterable[int], optional
+        The statuses of the responses that are retried, defaults to
+        :data:`RETRY_STATUSES`.
+
+    exceptions: Tuple[type], optional
+        The exceptions that are retried, defaults to the ones returned by
+        :func:`retry_exceptions`.
+
+    base_delay: float, optional
+        Defaults to ``0.5``.
+        The maximum number of seconds before the first retry.
+
+    max_delay: float, optional
+        Defaults to ``30``.
+        The maximum number of seconds before any retry.
+
+    budget: :class:`RetryBudget`, optional
+        The budget retries are taken from. If not provided, a budget shared
+        by every policy of the process is used.
+
+    """
+
+    def __init__(self, max_attempts: int = 3,
+                 statuses: Iterable[int] = RETRY_STATUSES,
+                 exceptions: Optional[Tuple[Type[Exception], ...]] = None,
+                 base_delay: float = 0.5, max_delay: float = 30.0,
+                 budget: Optional[RetryBudget] = None):
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1.")
+        self.max_attempts = max_attempts
+        self.statuses = frozenset(statuses)
+        self.exceptions = None if exceptions is None else tuple(exceptions)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = budget or _default_budget
+
+    def record_request(self) -> None:
+        """
+        Called once for every request, before its first attempt.
+
+        """
+        self.budget.deposit()
+
+    def should_retry(self, attempt: int, status: Optional[int] = None,
+                     error: Optional[Exception] = None) -> bool:
+        """
+        Whether a request should be sent again.
+
+        Parameters
+        ----------
+        attempt: int
+            The number of attempts made so far.
+
+        status: int, optional
+            The status of the response, if one was received.
+
+        error: Exception, optional
+            The exception raised instead of receiving a response.
+
+        """
+        if attempt >= self.max_attempts:
+            return False
+        if error is not None:
+            exceptions = self.exceptions
+            if exceptions is None:
+                exceptions = retry_exceptions()
+            if not isinstance(error, exceptions):
+                return False
+        elif status not in self.statuses:
+            return False
+        return self.budget.withdraw()
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Returns the number of seconds to wait after the ``attempt``-th
+        attempt failed.
+
+        """
+        return random.uniform(0, min(self.max_delay,
+                                     self.base_delay * 2 ** (attempt - 1)))
@@ -0,0 +1,107 @@
+"""
+The JSON serializer used for every payload sent to, and response received
+from, discord.
+
+Payloads are encoded to bytes a single time, and those bytes are sent as the
+request body as is, on every retry and to every webhook of a broadcast.
+
+The fastest available backend is used: ``orjson``, then ``ujson``, then the
+standard library's ``json``. Another one can be picked with
+:func:`set_serializer`.
+
+"""
+import json
+from typing import Any, Callable, Optional, Tuple
+
+#: The backends :func:`set_serializer` accepts by name, fastest first.
+BACKENDS = ('orjson', 'ujson', 'json')
+
+
+def _load(name: str) -> Tuple[Callable[[Any], bytes], Callable[[Any], Any]]:
+    if name == 'orjson':
+        import orjson
+        return orjson.dumps, orjson.loads
+
+    if name == 'ujson':
+        import ujson
+
+        def dumps(obj: Any) -> bytes:
+            return ujson.dumps(obj, ensure_ascii=False,
+                               escape_forward_slashes=False).encode('utf-8')
+        return dumps, ujson.loads
+
+    if name == 'json':
+        encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+
+        def dumps(obj: Any) -> bytes:
+            return encoder.encode(obj).encode('utf-8')
+        return dumps, json.loads
+
+    raise ValueError("Unknown serializer {!r}, expected one of {}."
+                     .format(name, ', '.join(BACKENDS)))
+
+
+def set_serializer(name: Optional[str] = None,
+                   dumps: Optional[Callable[[Any], bytes]] = None,
+                   loads: Optional[Callable[[Any], Any]] = None) -> None:
+    """
+    Changes the JSON serializer of the process.
+
+    Parameters
+    ----------
+    name: str, optional
+        One of :data:`BACKENDS`. If neither ``name`` nor ``dumps`` and
+        ``loads`` are provided, the fastest installed backend is used.
+
+    dumps: Callable[[Any], bytes], optional
+        A custom function that encodes an object to JSON bytes.
+
+    loads: Callable[[bytes], Any], optional
+        A custom function that decodes JSON bytes.
+
+    """
+    global _name, _dumps, _loads
+    if dumps is not None or loads is not None:
+        if dumps is None or loads is None:
+            raise ValueError("dumps and loads must both be set.")
+        _name, _dumps, _loads = 'custom', dumps, loads
+        return
+
+    for backend in (name,) if name is not None else BACKENDS:
+        try:
+            _dumps, _loads = _load(backend)
+        except ImportError:
+            if name is not None:
+                raise
+            continue
+        _name = backend
+        return
+
+
+def get_serializer() -> str:
+    """
+    Returns the name of the JSON serializer in use, or ``'custom'``.
+
+    """
+    return _name
+
+
+def dumps(obj: Any) -> bytes:
+    """
+    Encodes ``obj`` to JSON bytes.
+
+    """
+    return _dumps(obj)
+
+
+def loads(data: bytes) -> Any:
+    """
+    Decodes JSON bytes (or text).
+
+    """
+    return _loads(data)
+
+
+_name = 'json'
+_dumps, _loads = _load('json')
+set_serializer()
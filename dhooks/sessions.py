@@ -0,0 +1,160 @@
+import asyncio
+import threading
+import weakref
+from typing import Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import aiohttp  # noqa: F401
+    import requests  # noqa: F401
+
+
+class SessionRegistry:
+    """
+    Hands out HTTP sessions shared by every :class:`Webhook` that isn't
+    given its own, so thousands of webhooks reuse the same connections
+    instead of opening (and TLS handshaking) one pool each.
+
+    There is one :class:`requests.Session` per registry, and one
+    :class:`aiohttp.ClientSession` per event loop, created when first
+    needed. ``requests`` and ``aiohttp`` are only imported when their first
+    session is created.
+
+    Parameters
+    ----------
+    max_connections: int, optional
+        Defaults to ``100``.
+        The maximum number of open connections of an
+        :class:`aiohttp.ClientSession`.
+
+    max_connections_per_host: int, optional
+        Defaults to ``32``.
+        The maximum number of connections to the same host. For
+        :class:`requests.Session`, the number of connections kept open per
+        host.
+
+    keepalive_timeout: float, optional
+        Defaults to ``30``.
+        The number of seconds an idle connection of an
+        :class:`aiohttp.ClientSession` is kept open, ``requests`` keeps them
+        open until the server closes them.
+
+    dns_cache_ttl: int, optional
+        Defaults to ``300``.
+        The number of seconds DNS lookups are cached by an
+        :class:`aiohttp.ClientSession`, :class:`None` caches them forever.
+
+    """
+
+    def __init__(self, max_connections: int = 100,
+                 max_connections_per_host: int = 32,
+                 keepalive_timeout: float = 30.0,
+                 dns_cache_ttl: Optional[int] = 300):
+        self.max_connections = max_connections
+        self.max_connections_per_host = max_connections_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+        self._lock = threading.Lock()
+        self._session = None  # type: Optional[requests.Session]
+        self._async_sessions = weakref.WeakKeyDictionary()
+
+    def get_session(self) -> 'requests.Session':
+        """
+        Returns the shared :class:`requests.Session`.
+
+        """
+        with self._lock:
+            if self._session is None:
+                self._session = self.new_session()
+            return self._session
+
+    def get_async_session(self) -> 'aiohttp.ClientSession':
+        """
+        Returns the shared :class:`aiohttp.ClientSession` of the running
+        event loop.
+
+        """
+        loop = asyncio.get_event_loop()
+        with self._lock:
+            session = self._async_sessions.get(loop)
+            if session is None or session.closed:
+                session = self._async_sessions[loop] = \
+                    self.new_async_session()
+            return session
+
+    def new_session(self) -> 'requests.Session':
+        """
+        Returns a new :class:`requests.Session` with the pool settings of
+        the registry.
+
+        """
+        import requests
+
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=max(1, self.max_connections //
+                                 self.max_connections_per_host),
+            pool_maxsize=self.max_connections_per_host)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def new_async_session(self) -> 'aiohttp.ClientSession':
+        """
+        Returns a new :class:`aiohttp.ClientSession` with the pool settings
+        of the registry.
+
+        """
+        import aiohttp
+
+        connector = aiohttp.TCPConnector(
+            limit=self.max_connections,
+            limit_per_host=self.max_connections_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            use_dns_cache=True,
+            ttl_dns_cache=self.dns_cache_ttl)
+        return aiohttp.ClientSession(connector=connector)
+
+    def close(self) -> None:
+        """
+        Closes the shared :class:`requests.Session`.
+
+        """
+        with self._lock:
+            session, self._session = self._session, None
+        if session is not None:
+            session.close()
+
+    async def close_async(self) -> None:
+        """
+        Closes the shared :class:`aiohttp.ClientSession` of the running
+        event loop.
+
+        """
+        with self._lock:
+            session = self._async_sessions.pop(asyncio.get_event_loop(),
+                                               None)
+        if session is not None:
+            await session.close()
+
+
+_default_registry = SessionRegistry()
+
+
+def get_default_sessions() -> SessionRegistry:
+    """
+    Returns the process-wide :class:`SessionRegistry` that every
+    :class:`Webhook` uses when no ``session`` or ``sessions`` is given.
+
+    """
+    return _default_registry
+
+
+def set_default_sessions(registry: SessionRegistry) -> None:
+    """
+    Replaces the process-wide :class:`SessionRegistry`.
+
+    Only :class:`Webhook` instances created afterwards will use it.
+
+    """
+    global _default_registry
+    _default_registry = registry
@@ -0,0 +1,118 @@
+from typing import Iterator, List
+
+#: The markdown code block delimiter.
+FENCE = '```'
+
+# appended to a chunk that ends inside a code block
+_CLOSE = '\n' + FENCE
+
+
+def split_content(content: str, max_length: int = 2000) -> List[str]:
+    """
+    Splits text that is too long for a single message into chunks of at
+    most ``max_length`` characters.
+
+    Chunks end on line boundaries whenever possible, lines longer than
+    ``max_length`` are cut. A code block cut between two chunks is closed at
+    the end of the first one and re-opened, with the same language, at the
+    start of the next. Chunks that would only contain whitespace are left
+    out.
+
+    The text is read once, so splitting takes linear time.
+
+    Parameters
+    ----------
+    content: str
+        The text to split.
+
+    max_length: int, optional
+        Defaults to ``2000``.
+        The maximum number of characters of a chunk.
+
+    Returns
+    -------
+    List[str]
+        The chunks, in order.
+
+    """
+    if len(content) <= max_length:
+        return [content] if content else []
+    if max_length <= 2 * len(_CLOSE):
+        raise ValueError("max_length must be greater than {}.".format(
+            2 * len(_CLOSE)))
+
+    chunks = []  # type: List[str]
+    parts = []  # type: List[str]
+    length = 0  # of the current chunk
+    start = 0  # length of the re-opened code block at its start
+    fence = None  # the fence and language of the current code block
+    opener = -1  # index in parts of the line that opened the code block
+
+    def flush() -> None:
+        nonlocal parts, length, start, opener
+        closing = fence is not None
+        if closing and opener == len(parts) - 1:
+            # nothing after the opening line, the next chunk re-opens it
+            length -= len(parts.pop())
+            closing = False
+        text = ''.join(parts)
+        if text.endswith('\n'):  # the line break the chunk was split at
+            text = text[:-1]
+        if closing:
+            text += _CLOSE
+        if length > start and text.strip():
+            chunks.append(text)
+
+        parts, length, start, opener = [], 0, 0, -1
+        if fence is not None:
+            header = fence if len(fence) < max_length // 2 else FENCE
+            parts.append(header + '\n')
+            length = start = len(header) + 1
+
+    for line in _lines(content):
+        if line.count(FENCE) % 2:
+            toggled = None if fence is not None else _opening(line)
+        else:
+            toggled = fence
+        # room for closing the code block the line is in, or opens
+        reserve = len(_CLOSE) if fence or toggled else 0
+        cut = False
+        pos = 0  # of the rest of a line that is cut
+        while pos < len(line):
+            room = max_length - length - reserve
+            if len(line) - pos <= room:
+                parts.append(line[pos:] if pos else line)
+                length += len(line) - pos
+                break
+            if length > start:  # the line may fit in the next chunk
+                flush()
+                continue
+            parts.append(line[pos:pos + room])
+            length += room
+            pos += room
+            cut = True
+            flush()
+
+        if fence is None and toggled is not None and not cut:
+            opener = len(parts) - 1
+        fence = toggled
+    flush()
+    return chunks
+
+
+def _opening(line: str) -> str:
+    # the fence and language token a code block opened by line starts with
+    info = line[line.rfind(FENCE) + len(FENCE):].split()
+    return FENCE + info[0] if info else FENCE
+
+
+def _lines(content: str) -> Iterator[str]:
+    # the lines of content, with their line break
+    start = 0
+    end = content.find('\n')
+    while end != -1:
+        yield content[start:end + 1]
+        start = end + 1
+        end = content.find('\n', start)
+    if start < len(content):
+        yield content[start:]
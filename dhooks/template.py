@@ -0,0 +1,147 @@
+import re
+from json.encoder import encode_basestring_ascii
+from typing import Any, List, Mapping, Optional, Tuple
+
+from . import serializer
+from .client import MAX_CONTENT_LENGTH, Webhook, build_payload
+from .embed import (Embed, AUTHOR_LIMIT, DESCRIPTION_LIMIT, FIELD_NAME_LIMIT,
+                    FIELD_VALUE_LIMIT, FOOTER_LIMIT, MAX_FIELDS, MAX_LENGTH,
+                    TITLE_LIMIT)
+
+
+class EmbedTemplate:
+    """
+    A message with an embed, compiled once and rendered many times
+    with different values.
+
+    Any ``{name}`` in a text of the embed (or in ``content``) is a
+    placeholder. The message is serialized when the template is created,
+    and :meth:`render` only fills the placeholders of the resulting JSON,
+    without building an :class:`Embed` or encoding a dictionary. ::
+
+        embed = Embed(title='{service} is down', color=0xe74c3c)
+        embed.add_field(name='Since', value='{since}')
+        template = EmbedTemplate(embed)
+
+        hook.send_template(template, service='api', since='12:00')
+
+    Parameters
+    ----------
+    embed: :class:`Embed`
+        The embed with the placeholders.
+
+    content: str, optional
+        The message contents, may contain placeholders too.
+
+    \*\*username: str, optional
+        Override the default username of the webhook.
+
+    \*\*avatar_url: str, optional
+        Override the default avatar of the webhook.
+
+    Attributes
+    ----------
+    placeholders: List[str]
+        The names of the placeholders, in order of appearance.
+
+    username: str
+        The username the template overrides the webhook's with.
+
+    avatar_url: str
+        The avatar URL the template overrides the webhook's with.
+
+    """  # noqa: W605
+
+    PLACEHOLDER_REGEX = re.compile(r'\{(\w+)\}')
+
+    def __init__(self, embed: Embed, content: str = '', **options):
+        self.username = options.get('username', '')
+        self.avatar_url = options.get('avatar_url', '')
+        payload = build_payload(content, embed, username=self.username,
+                                avatar_url=self.avatar_url, validation=None)
+        text = Webhook._encode(payload).decode('utf-8')
+
+        # literal chunks at even indexes, placeholder names at odd ones
+        self._parts = self.PLACEHOLDER_REGEX.split(text)
+        self.placeholders = self._parts[1::2]  # type: list
+
+        # kept to rebuild the message when a rendering is over the limits
+        self._content = content
+        self._embed = serializer.loads(embed.to_json())
+        self._limits = self._compile_limits(content, embed)
+
+    def _compile_limits(self, content: str, embed: Embed) -> List[tuple]:
+        # (limit, literal length, placeholders, counts towards MAX_LENGTH)
+        # of every text with a limit, the lengths are known without
+        # rendering
+        texts = [(content, MAX_CONTENT_LENGTH, False),
+                 (embed.title, TITLE_LIMIT, True),
+                 (embed.description, DESCRIPTION_LIMIT, True)]
+        if embed.author is not None:
+            texts.append((embed.author['name'], AUTHOR_LIMIT, True))
+        if embed.footer is not None:
+            texts.append((embed.footer['text'], FOOTER_LIMIT, True))
+        for field in embed.fields:
+            texts.append((field['name'], FIELD_NAME_LIMIT, True))
+            texts.append((field['value'], FIELD_VALUE_LIMIT, True))
+
+        limits = [(MAX_FIELDS, len(embed.fields), (), False)]
+        for text, limit, counted in texts:
+            if text:
+                literal = len(self.PLACEHOLDER_REGEX.sub('', text))
+                limits.append((limit, literal,
+                               tuple(self.PLACEHOLDER_REGEX.findall(text)),
+                               counted))
+        return limits
+
+    def _fits(self, values: Mapping[str, Any]) -> bool:
+        # whether the rendered message is within discord's limits
+        total = 0
+        for limit, literal, names, counted in self._limits:
+            length = literal + sum(len(str(values[name])) for name in names)
+            if length > limit:
+                return False
+            if counted:
+                total += length
+        return total <= MAX_LENGTH
+
+    def _build(self, values: Mapping[str, Any]) -> Tuple[str, Embed]:
+        # the rendered message as a content and an Embed, to be validated
+        def fill(value):
+            if isinstance(value, str):
+                return self.PLACEHOLDER_REGEX.sub(
+                    lambda match: str(values[match.group(1)]), value)
+            if isinstance(value, dict):
+                return {key: fill(item) for key, item in value.items()}
+            if isinstance(value, list):
+                return [fill(item) for item in value]
+            return value
+
+        embed = Embed()
+        for key, value in self._embed.items():
+            setattr(embed, key, fill(value))
+        return fill(self._content), embed
+
+    def render(self, mapping: Optional[Mapping[str, Any]] = None,
+               **values) -> bytes:
+        """
+        Returns the JSON encoded message with the placeholders replaced by
+        the string representation of their value.
+
+        Parameters
+        ----------
+        mapping: Mapping[str, Any], optional
+            The values of the placeholders.
+
+        \*\*values
+            The values of the placeholders, they override ``mapping``.
+
+        """  # noqa: W605
+        if mapping is not None:
+            values = dict(mapping, **values)
+
+        parts = self._parts[:]
+        for i in range(1, len(parts), 2):
+            # drop the quotes of the JSON string
+            parts[i] = encode_basestring_ascii(str(values[parts[i]]))[1:-1]
+        return ''.join(parts).encode('utf-8')
@@ -0,0 +1,200 @@
+import asyncio
+import logging
+import threading
+import time
+from typing import List, Optional, Union
+
+from .client import Webhook, build_edit_payload
+from .embed import Embed
+from .message import Message
+
+log = logging.getLogger(__name__)
+
+
+class MessageUpdater:
+    """
+    Keeps a message up to date with frequently changing contents, such as a
+    live status dashboard.
+
+    :meth:`update` returns immediately, and the message is edited in the
+    background as soon as the rate limit allows it. Updates made while an
+    edit is waiting or in flight replace each other, only the latest one is
+    sent. ::
+
+        hook = Webhook(url)
+        message = hook.send('Starting...', wait=True)
+        status = MessageUpdater(hook, message)
+
+        for progress in job:
+            status.update('{}% done'.format(progress))
+
+        status.close()
+
+    If the webhook's :attr:`~Webhook.is_async` is :class:`True`, the edits
+    are sent by a task, and :meth:`flush` and :meth:`close` return a
+    coroutine.
+
+    Parameters
+    ----------
+    webhook: :class:`Webhook`
+        The webhook the message was sent through.
+
+    message: :class:`Message` or int
+        The message to edit, or its ID.
+
+    interval: float, optional
+        Defaults to ``0``.
+        The minimum number of seconds between two edits, on top of the
+        rate limit.
+
+    Attributes
+    ----------
+    edits: int
+        The number of edits that were sent.
+
+    collapsed: int
+        The number of updates that were replaced by a later one before being
+        sent.
+
+    """
+
+    def __init__(self, webhook: Webhook, message: Union[Message, int],
+                 interval: float = 0.0):
+        self.webhook = webhook
+        self.interval = interval
+        self.edits = 0
+        self.collapsed = 0
+        self._path = webhook._message_path(message)
+        self._route = webhook._route('PATCH', self._path)
+        self._pending = None  # type: Optional[dict]
+        self._busy = False
+        self._last = float('-inf')
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread = None  # type: Optional[threading.Thread]
+        self._task = None  # type: Optional[asyncio.Future]
+
+    def update(self, content: Optional[str] = None,
+               embed: Optional[Embed] = None,
+               embeds: Optional[List[Embed]] = None) -> None:
+        """
+        Sets the latest state of the message, takes the same arguments as
+        :meth:`Webhook.edit_message`.
+
+        The edit is built right away, so later changes to an :class:`Embed`
+        aren't sent.
+
+        """
+        payload = build_edit_payload(content, embed, embeds,
+                                     self.webhook.validation)
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("The updater is closed.")
+            if self._pending is not None:
+                self.collapsed += 1
+            self._pending = payload
+            self._cond.notify_all()
+            self._start()
+
+    def flush(self, timeout: Optional[float] = None):
+        """
+        Waits until the latest update is sent.
+
+        Returns :class:`False` if ``timeout`` expired first.
+
+        """
+        if self.webhook.is_async:
+            return self._async_flush(timeout)
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: self._pending is None and not self._busy, timeout)
+
+    def close(self, timeout: Optional[float] = None):
+        """
+        Sends the latest update and stops the updater.
+
+        """
+        if self.webhook.is_async:
+            return self._async_close(timeout)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            return not self._thread.is_alive()
+        return True
+
+    def _start(self) -> None:
+        if self.webhook.is_async:
+            if self._task is None or self._task.done():
+                self._task = asyncio.ensure_future(self._async_run())
+        elif self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True,
+                                            name='dhooks-updater')
+            self._thread.start()
+
+    def _delay(self) -> float:
+        remaining, reset_after = self.webhook.ratelimiter.budget(self._route)
+        delay = reset_after if remaining == 0 else 0.0
+        return max(delay, self._last + self.interval - time.monotonic())
+
+    def _take(self) -> dict:
+        with self._cond:
+            payload, self._pending = self._pending, None
+            self._busy = True
+            return payload
+
+    def _done(self) -> None:
+        with self._cond:
+            self.edits += 1
+            self._last = time.monotonic()
+            self._busy = False
+            self._cond.notify_all()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(
+                    lambda: self._pending is not None or self._closed)
+                if self._pending is None:
+                    return
+
+            delay = self._delay()
+            while delay > 0:
+                time.sleep(delay)
+                delay = self._delay()
+
+            try:
+                self.webhook._request('PATCH', self._take(), path=self._path)
+            except Exception:
+                log.exception("Failed to edit the message.")
+            finally:
+                self._done()
+
+    async def _async_run(self) -> None:
+        while self._pending is not None:
+            delay = self._delay()
+            while delay > 0:
+                await asyncio.sleep(delay)
+                delay = self._delay()
+
+            try:
+                await self.webhook._async_request('PATCH', self._take(),
+                                                  path=self._path)
+            except Exception:
+                log.exception("Failed to edit the message.")
+            finally:
+                self._done()
+
+    async def _async_flush(self, timeout: Optional[float] = None) -> bool:
+        if self._task is None:
+            return True
+        try:
+            await asyncio.wait_for(asyncio.shield(self._task), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    async def _async_close(self, timeout: Optional[float] = None) -> bool:
+        self._closed = True
+        return await self._async_flush(timeout)
@@ -30,6 +30,9 @@ setup(
         },
         'examples': {
             'sanic'
+        },
+        'speedups': {
+            'orjson'
         }
     },
     python_requires='>=3.5.3',
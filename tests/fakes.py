@@ -0,0 +1,145 @@
+"""
+Fakes shared by the tests, so no request ever reaches discord.
+
+"""
+import threading
+import time
+
+import requests
+
+import dhooks
+
+URL = 'https://discord.com/api/webhooks/{}/abcd'
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def headers(remaining, reset_after, limit=5, bucket='abcd'):
+    return {
+        'X-RateLimit-Limit': str(limit),
+        'X-RateLimit-Remaining': str(remaining),
+        'X-RateLimit-Reset-After': str(reset_after),
+        'X-RateLimit-Bucket': bucket,
+    }
+
+
+class FakeSession(requests.Session):
+    """
+    Answers the requests with ``outcomes`` in order, a status or an
+    exception to raise, then with ``204``. The bodies and timeouts of the
+    requests are recorded.
+
+    The n-th request takes ``n * delay`` seconds, so a reordering of
+    concurrent requests would show.
+
+    """
+
+    def __init__(self, *outcomes, delay=0):
+        super().__init__()
+        self.outcomes = list(outcomes)
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.bodies = []
+        self.timeouts = []
+
+    def post(self, url, data=None, timeout=None, **kwargs):
+        time.sleep(self.delay * len(self.bodies))
+        with self.lock:
+            self.bodies.append(data if isinstance(data, bytes) else
+                               b''.join(data))
+            self.timeouts.append(timeout)
+            outcome = self.outcomes.pop(0) if self.outcomes else 204
+        if isinstance(outcome, Exception):
+            raise outcome
+        response = requests.Response()
+        response.url = url
+        response.status_code = outcome
+        response._content = b'{"retry_after": 10}' if outcome == 429 \
+            else b'{}'  # retry_after is in milliseconds
+        return response
+
+
+def webhook(*outcomes, **options):
+    """Returns a :class:`dhooks.Webhook` using a :class:`FakeSession`."""
+    return dhooks.Webhook(URL.format(1), session=FakeSession(*outcomes),
+                          ratelimiter=dhooks.RateLimiter(), **options)
+
+
+class FakeWebhook(dhooks.Webhook):
+    """
+    Records the requests instead of making them, responds with ``status``
+    (raising :exc:`requests.HTTPError` if it isn't ``204``) or raises
+    ``error``.
+
+    """
+
+    def __init__(self, id=1, status=204, error=None, **options):
+        options.setdefault('ratelimiter', dhooks.RateLimiter())
+        super().__init__(URL.format(id), **options)
+        self.status = status
+        self.error = error
+        self.requests = []  # (method, payload, keyword arguments)
+
+    @property
+    def payloads(self):
+        return [payload for _, payload, _ in self.requests]
+
+    def _request(self, method='POST', payload=None, *args, **kwargs):
+        if self.is_async:
+            return self._async_request(method, payload, **kwargs)
+        if self.error is not None:
+            raise self.error
+        if self.status != 204:
+            response = requests.Response()
+            response.status_code = self.status
+            raise requests.HTTPError(response=response)
+        self.requests.append((method, payload, kwargs))
+        if kwargs.get('wait'):
+            return dhooks.Message(b'{"id": "42"}', self)
+
+    async def _async_request(self, method='POST', payload=None, *args,
+                             **kwargs):
+        self.is_async = False
+        try:
+            return self._request(method, payload, **kwargs)
+        finally:
+            self.is_async = True
+
+
+class RecordingWebhook:
+    """
+    Stands for a :class:`dhooks.Webhook`, records the keyword arguments of
+    :meth:`send` and :meth:`send_nowait`.
+
+    """
+    is_async = False
+    username = ''
+    avatar_url = ''
+    default_name = ''
+    validation = 'strict'
+
+    def __init__(self):
+        self.sent = []
+
+    def send(self, **kwargs):
+        self.sent.append(kwargs)
+
+    def send_nowait(self, **kwargs):
+        self.sent.append(kwargs)
+        return True
+
+
+class AsyncRecordingWebhook(RecordingWebhook):
+    is_async = True
+
+    async def send(self, **kwargs):
+        return super().send(**kwargs)
+
+    async def send_nowait(self, **kwargs):
+        return super().send_nowait(**kwargs)
@@ -0,0 +1,140 @@
+import asyncio
+import unittest
+
+from dhooks import Embed
+from dhooks.batching import Coalescer, EmbedPacker
+from fakes import AsyncRecordingWebhook, RecordingWebhook
+
+
+class TestCoalescer(unittest.TestCase):
+
+    def setUp(self):
+        self.hook = RecordingWebhook()
+
+    def test_flush(self):
+        with Coalescer(self.hook, max_latency=60) as coalescer:
+            for i in range(3):
+                coalescer.send('line {}'.format(i))
+            self.assertEqual(self.hook.sent, [])
+        self.assertEqual(len(self.hook.sent), 1)
+        self.assertEqual(self.hook.sent[0]['content'],
+                         'line 0\nline 1\nline 2')
+
+    def test_max_length(self):
+        coalescer = Coalescer(self.hook, max_latency=60, max_length=20)
+        for _ in range(5):
+            coalescer.send('x' * 9)
+        coalescer.flush()
+        self.assertEqual([m['content'] for m in self.hook.sent],
+                         ['x' * 9 + '\n' + 'x' * 9] * 2 + ['x' * 9])
+
+    def test_attribution(self):
+        coalescer = Coalescer(self.hook, max_latency=60, separator=' | ')
+        coalescer.send('a', username='bob')
+        coalescer.send('b', username='alice')
+        coalescer.send('c', username='bob')
+        coalescer.flush()
+        self.assertEqual(self.hook.sent, [{
+            'content': 'a | **alice**: b | c',
+            'username': 'bob',
+            'avatar_url': '',
+        }])
+
+    def test_default_identity(self):
+        self.hook.default_name = 'hook'
+        coalescer = Coalescer(self.hook, max_latency=60)
+        coalescer.send('a', username='alice')
+        coalescer.send('b')
+        coalescer.send('c', username='bob')
+        coalescer.flush()
+        self.assertEqual(self.hook.sent[0]['content'],
+                         'a\n**hook**: b\n**bob**: c')
+        self.assertEqual(self.hook.sent[0]['username'], 'alice')
+
+    def test_unknown_default_identity(self):
+        coalescer = Coalescer(self.hook, max_latency=60)
+        coalescer.send('a', username='alice')
+        coalescer.send('b')
+        coalescer.send('c', username='bob')
+        coalescer.flush()
+        self.assertEqual([(m['content'], m['username'])
+                          for m in self.hook.sent],
+                         [('a', 'alice'), ('b\n**bob**: c', '')])
+
+    def test_avatar(self):
+        coalescer = Coalescer(self.hook, max_latency=60)
+        coalescer.send('a', username='bob', avatar_url='https://a.png')
+        coalescer.send('b', username='bob', avatar_url='https://b.png')
+        coalescer.send('c', username='bob', avatar_url='https://b.png')
+        coalescer.flush()
+        self.assertEqual([(m['content'], m['avatar_url'])
+                          for m in self.hook.sent],
+                         [('a', 'https://a.png'), ('b\nc', 'https://b.png')])
+
+    def test_too_long(self):
+        coalescer = Coalescer(self.hook, max_latency=60, max_length=10)
+        with self.assertRaises(ValueError):
+            coalescer.send('x' * 11)
+        self.assertEqual(len(coalescer), 0)
+
+    def test_max_latency(self):
+        coalescer = Coalescer(self.hook, max_latency=0.01)
+        coalescer.send('a')
+        coalescer._timer.join(1)
+        self.assertEqual(len(self.hook.sent), 1)
+        self.assertEqual(len(coalescer), 0)
+
+    def test_async(self):
+        hook = AsyncRecordingWebhook()
+
+        async def main():
+            coalescer = Coalescer(hook, max_latency=0.01)
+            await coalescer.send('a')
+            await coalescer.send('b')
+            await asyncio.sleep(0.05)
+
+        asyncio.new_event_loop().run_until_complete(main())
+        self.assertEqual([m['content'] for m in hook.sent], ['a\nb'])
+
+
+class TestEmbedPacker(unittest.TestCase):
+
+    def setUp(self):
+        self.hook = RecordingWebhook()
+
+    def test_max_embeds(self):
+        packer = EmbedPacker(self.hook, max_latency=60)
+        for i in range(25):
+            packer.send(Embed(title=str(i)))
+        packer.flush()
+        self.assertEqual([len(m['embeds']) for m in self.hook.sent],
+                         [10, 10, 5])
+
+    def test_max_length(self):
+        packer = EmbedPacker(self.hook, max_latency=60)
+        for _ in range(4):
+            packer.send(Embed(description='x' * 2500))
+        packer.flush()
+        self.assertEqual([len(m['embeds']) for m in self.hook.sent],
+                         [2, 2])
+
+    def test_invalid(self):
+        packer = EmbedPacker(self.hook, max_latency=60)
+        packer.send(Embed(title='ok'))
+        with self.assertRaises(ValueError):
+            packer.send(Embed(title='x' * 300))
+        packer.send(Embed(description='y' * 4000))
+        packer.flush()
+        self.assertEqual([len(m['embeds']) for m in self.hook.sent], [2])
+
+    def test_lenient(self):
+        self.hook.validation = 'lenient'
+        packer = EmbedPacker(self.hook, max_latency=60)
+        packer.send(Embed(title='x' * 300))
+        packer.flush()
+        embed = self.hook.sent[0]['embeds'][0]
+        self.assertEqual(len(embed.title), 256)
+
+
+if __name__ == '__main__':
+    unittest.main()
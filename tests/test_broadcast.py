@@ -0,0 +1,54 @@
+import asyncio
+import unittest
+
+import dhooks
+from fakes import FakeWebhook
+
+
+def make(is_async=False):
+    # the third webhook fails
+    return [FakeWebhook(i, error=ValueError() if i == 2 else None,
+                        is_async=is_async) for i in range(5)]
+
+
+class TestBroadcast(unittest.TestCase):
+
+    def check(self, hooks, result):
+        self.assertFalse(result.ok)
+        self.assertEqual(result.succeeded, hooks[:2] + hooks[3:])
+        self.assertEqual(len(result.failed), 1)
+        self.assertIs(result.failed[0][0], hooks[2])
+        self.assertIsInstance(result.failed[0][1], ValueError)
+
+        body = hooks[0].payloads[0]
+        self.assertIsInstance(body, bytes)
+        for hook in result.succeeded:
+            self.assertIs(hook.payloads[0], body)
+
+    def test_broadcast(self):
+        hooks = make()
+        self.check(hooks, dhooks.broadcast(hooks, 'TEST', concurrency=2))
+        for hook in hooks:
+            hook.close()
+
+    def test_async_broadcast(self):
+        async def main():
+            hooks = make(is_async=True)
+            result = await dhooks.broadcast(hooks, 'TEST', is_async=True)
+            for hook in hooks:
+                await hook.close()
+            return hooks, result
+
+        self.check(*asyncio.new_event_loop().run_until_complete(main()))
+
+    def test_mixed_modes(self):
+        hooks = [FakeWebhook(1), FakeWebhook(2, is_async=True)]
+        with self.assertRaises(TypeError):
+            dhooks.broadcast(hooks, 'TEST')
+        with self.assertRaises(TypeError):
+            dhooks.broadcast(hooks[:1], 'TEST', is_async=True)
+        self.assertEqual(hooks[0].requests, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
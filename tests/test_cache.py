@@ -0,0 +1,53 @@
+import unittest
+from io import BytesIO
+
+import dhooks
+from dhooks.client import build_payload
+
+
+class TestAttachmentCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = dhooks.AttachmentCache(maxsize=2)
+
+    def file(self, data=b'data', name='logo.png'):
+        return dhooks.File(BytesIO(data), name=name)
+
+    def test_lru(self):
+        self.cache.put('a', 'url a')
+        self.cache.put('b', 'url b')
+        self.cache.get('a')
+        self.cache.put('c', 'url c')
+        self.assertEqual(self.cache.get('a'), 'url a')
+        self.assertIsNone(self.cache.get('b'))
+        self.assertEqual(len(self.cache), 2)
+
+    def test_ttl(self):
+        self.cache.ttl = 0
+        self.cache.put('a', 'url a')
+        self.assertIsNone(self.cache.get('a'))
+        self.assertEqual(len(self.cache), 0)
+
+    def test_apply(self):
+        embed = dhooks.Embed()
+        embed.set_image('attachment://logo.png')
+        files = [self.file(), self.file(b'other', 'other.png')]
+
+        payload = build_payload(embed=embed, files=files)
+        self.assertEqual(self.cache.apply(payload, files), files)
+        self.assertEqual((self.cache.hits, self.cache.misses), (0, 1))
+
+        self.cache.record(files, [{'url': 'https://cdn/logo.png'},
+                                  {'url': 'https://cdn/other.png'}])
+
+        # same content under another File object
+        files = [self.file(), self.file(b'other', 'other.png')]
+        payload = build_payload(embed=embed, files=files)
+        self.assertEqual(self.cache.apply(payload, files), files[1:])
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+        self.assertIn(b'"https://cdn/logo.png"', payload['embeds'][0])
+        self.assertNotIn(b'attachment:', payload['embeds'][0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+import asyncio
+import threading
+import unittest
+
+from dhooks.dispatch import AsyncDispatcher, Dispatcher
+
+
+class TestDispatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.gate = threading.Event()
+        self.processed = []
+        self.dropped = []
+
+    def func(self, item):
+        self.gate.wait()
+        self.processed.append(item)
+
+    def make(self, **kwargs):
+        return Dispatcher(self.func, on_drop=self.dropped.append, **kwargs)
+
+    def test_flush(self):
+        dispatcher = self.make()
+        for i in range(10):
+            self.assertTrue(dispatcher.put(i))
+        self.assertFalse(dispatcher.flush(0.01))
+        self.gate.set()
+        self.assertTrue(dispatcher.flush(1))
+        self.assertEqual(self.processed, list(range(10)))
+        dispatcher.close()
+
+    def fill(self, dispatcher):
+        dispatcher.put(0)
+        dispatcher.flush(0.05)  # let the worker pick the first item
+        return [dispatcher.put(i) for i in range(1, 4)]
+
+    def test_drop_newest(self):
+        dispatcher = self.make(maxsize=2, overflow='drop_newest')
+        self.assertEqual(self.fill(dispatcher), [True, True, False])
+        self.gate.set()
+        dispatcher.close()
+        self.assertEqual(self.processed, [0, 1, 2])
+        self.assertEqual(self.dropped, [3])
+
+    def test_drop_oldest(self):
+        dispatcher = self.make(maxsize=2, overflow='drop_oldest')
+        self.assertEqual(self.fill(dispatcher), [True, True, True])
+        self.gate.set()
+        dispatcher.close()
+        self.assertEqual(self.processed, [0, 2, 3])
+        self.assertEqual(self.dropped, [1])
+
+    def test_block_timeout(self):
+        dispatcher = self.make(maxsize=1)
+        dispatcher.put(0)
+        dispatcher.flush(0.05)
+        self.assertTrue(dispatcher.put(1))
+        self.assertFalse(dispatcher.put(2, timeout=0.01))
+        self.gate.set()
+        dispatcher.close()
+        self.assertEqual(self.processed, [0, 1])
+
+    def test_close_drains(self):
+        dispatcher = self.make(workers=3)
+        for i in range(20):
+            dispatcher.put(i)
+        self.gate.set()
+        self.assertTrue(dispatcher.close(1))
+        self.assertEqual(sorted(self.processed), list(range(20)))
+        with self.assertRaises(RuntimeError):
+            dispatcher.put(20)
+
+
+class TestAsyncDispatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.processed = []
+        self.running = 0
+        self.max_running = 0
+
+    def tearDown(self):
+        self.loop.close()
+
+    async def func(self, item):
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(0.001)
+        self.processed.append(item)
+        self.running -= 1
+
+    def test_backpressure(self):
+        async def main():
+            dispatcher = AsyncDispatcher(self.func, maxsize=2, workers=3)
+            for i in range(20):
+                self.assertTrue(await dispatcher.put(i))
+                self.assertLessEqual(len(dispatcher), 2)
+            self.assertTrue(await dispatcher.close())
+
+        self.loop.run_until_complete(main())
+        self.assertEqual(sorted(self.processed), list(range(20)))
+        self.assertEqual(self.max_running, 3)
+
+    def test_concurrency(self):
+        async def main():
+            dispatcher = AsyncDispatcher(self.func, concurrency=lambda: 5)
+            for i in range(20):
+                await dispatcher.put(i)
+            await dispatcher.flush()
+            self.assertEqual(len(dispatcher._tasks), 5)
+            await dispatcher.close()
+
+        self.loop.run_until_complete(main())
+        self.assertEqual(sorted(self.processed), list(range(20)))
+
+    def test_drop_newest(self):
+        dropped = []
+
+        async def main():
+            dispatcher = AsyncDispatcher(self.func, maxsize=1, workers=1,
+                                         overflow='drop_newest',
+                                         on_drop=dropped.append)
+            results = [await dispatcher.put(i) for i in range(3)]
+            await dispatcher.close()
+            return results
+
+        self.assertEqual(self.loop.run_until_complete(main()),
+                         [True, False, False])
+        self.assertEqual(dropped, [1, 2])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+import json
+import unittest
+
+import dhooks
+from dhooks.client import build_payload, build_edit_payload
+
+
+class TestEmbed(unittest.TestCase):
+
+    def setUp(self):
+        self.embed = dhooks.Embed(title='Title', description='Description')
+        self.embed.add_field(name='Field', value='Value')
+
+    def test_cached(self):
+        self.assertIs(self.embed.to_dict(), self.embed.to_dict())
+        self.assertIs(self.embed.to_json(), self.embed.to_json())
+        self.assertEqual(json.loads(self.embed.to_json().decode()),
+                         self.embed.to_dict())
+
+    def check_invalidated(self, modify):
+        before = self.embed.to_json()
+        modify()
+        self.assertNotEqual(self.embed.to_json(), before)
+        self.assertEqual(json.loads(self.embed.to_json().decode()),
+                         self.embed.to_dict())
+
+    def test_invalidated_by_setters(self):
+        self.check_invalidated(lambda: self.embed.add_field('A', 'B'))
+        self.check_invalidated(lambda: self.embed.del_field(0))
+        self.check_invalidated(lambda: self.embed.set_author('Author'))
+        self.check_invalidated(lambda: self.embed.set_footer('Footer'))
+        self.check_invalidated(lambda: self.embed.set_image('url'))
+        self.check_invalidated(lambda: self.embed.set_title('Other'))
+
+    def test_invalidated_by_assignment(self):
+        def assign():
+            self.embed.color = 0x1e0f3
+
+        self.check_invalidated(assign)
+
+    def test_len(self):
+        self.embed.set_footer('Footer')
+        self.assertEqual(len(self.embed), len('TitleDescriptionFieldValue'
+                                              'Footer'))
+
+    def test_running_length(self):
+        self.embed.set_author('Author')
+        self.embed.add_field('A', 'B')
+        self.embed.del_field(0)
+        self.embed.title = None
+        self.embed.fields = self.embed.fields + [{'name': 'C', 'value': 'D',
+                                                  'inline': True}]
+        self.assertEqual(len(self.embed), len('DescriptionABAuthorCD'))
+
+
+class TestValidation(unittest.TestCase):
+
+    def test_valid(self):
+        embed = dhooks.Embed(title='t' * 256, description='d' * 4096)
+        self.assertTrue(embed.is_valid())
+        embed.validate()
+
+    def test_invalid(self):
+        for embed in (dhooks.Embed(title='t' * 257),
+                      dhooks.Embed(description='d' * 4097)):
+            self.assertFalse(embed.is_valid())
+            with self.assertRaises(ValueError):
+                embed.validate()
+
+        embed = dhooks.Embed()
+        embed.add_field('name', 'v' * 1025)
+        self.assertFalse(embed.is_valid())
+        embed.del_field(0)
+        self.assertTrue(embed.is_valid())
+        for i in range(26):
+            embed.add_field('name', 'value')
+        self.assertFalse(embed.is_valid())
+
+    def test_total(self):
+        embed = dhooks.Embed(description='d' * 4000)
+        for i in range(3):
+            embed.add_field('n', 'v' * 1000)
+        self.assertEqual(len(embed), 7003)
+        with self.assertRaisesRegex(ValueError, 'embed is too long'):
+            embed.validate()
+
+    def test_truncated(self):
+        embed = dhooks.Embed(title='t' * 300, description='d' * 4000)
+        embed.set_footer('f' * 10)
+        for i in range(30):
+            embed.add_field('n' * 300, 'v' * 100)
+        truncated = embed.truncated()
+        self.assertIsNot(truncated, embed)
+        self.assertTrue(truncated.is_valid())
+        self.assertEqual(len(truncated.title), 256)
+        self.assertTrue(truncated.title.endswith(dhooks.embed.ELLIPSIS))
+        self.assertLessEqual(len(truncated.fields), 25)
+        self.assertEqual(len(truncated), sum(
+            len(text) for text in (truncated.title, truncated.description,
+                                   truncated.footer['text'])) + sum(
+            len(f['name']) + len(f['value']) for f in truncated.fields))
+        self.assertEqual(len(embed.title), 300)  # left untouched
+
+    def test_truncated_budget(self):
+        embed = dhooks.Embed(title='title', description='d' * 100)
+        self.assertIs(embed.truncated(), embed)
+        self.assertEqual(len(embed.truncated(50)), 50)
+
+    def test_payload(self):
+        embed = dhooks.Embed(description='d' * 3500)
+        with self.assertRaises(ValueError):
+            build_payload('c' * 2001)
+        with self.assertRaises(ValueError):
+            build_payload(embeds=[embed, embed])
+        with self.assertRaises(ValueError):
+            build_edit_payload(embeds=[embed] * 11)
+
+        payload = build_payload('c' * 2001, embeds=[embed, embed],
+                                validation='lenient')
+        self.assertEqual(len(payload['content']), 2000)
+        embeds = [json.loads(em.decode()) for em in payload['embeds']]
+        self.assertEqual(sum(len(em['description']) for em in embeds), 6000)
+
+        payload = build_payload('c' * 2001, validation=None)
+        self.assertEqual(len(payload['content']), 2001)
+
+    def test_webhook(self):
+        hook = dhooks.Webhook('https://discord.com/api/webhooks/1/abcd',
+                              validation='lenient')
+        payload, _ = hook._build_message('c' * 3000)
+        self.assertEqual(len(payload['content']), 2000)
+        with self.assertRaises(ValueError):
+            dhooks.Webhook('https://discord.com/api/webhooks/1/abcd',
+                           validation='loose')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import logging
+import unittest
+
+import dhooks
+from dhooks.handler import DiscordHandler, LEVEL_COLORS
+from fakes import RecordingWebhook
+
+
+class TestDiscordHandler(unittest.TestCase):
+
+    def setUp(self):
+        self.hook = RecordingWebhook()
+        self.logger = logging.getLogger('dhooks.tests.{}'.format(id(self)))
+        self.logger.propagate = False
+
+    def handler(self, **kwargs):
+        handler = DiscordHandler(self.hook, flush_interval=60, **kwargs)
+        self.logger.addHandler(handler)
+        self.addCleanup(self.logger.removeHandler, handler)
+        return handler
+
+    def test_batching(self):
+        handler = self.handler()
+        self.logger.info('ignored')
+        for i in range(3):
+            self.logger.warning('warning %d', i)
+        self.logger.error('error')
+        self.assertEqual(self.hook.sent, [])
+        handler.flush()
+
+        self.assertEqual(len(self.hook.sent), 1)
+        embed, = self.hook.sent[0]['embeds']
+        self.assertEqual(embed.title, 'ERROR')
+        self.assertEqual(embed.color, LEVEL_COLORS[logging.ERROR])
+        self.assertIn('WARNING', embed.description)
+        self.assertIn('warning 2', embed.description)
+        self.assertTrue(embed.is_valid())
+
+    def test_alternating_levels(self):
+        handler = self.handler()
+        for i in range(100):
+            self.logger.warning('warning %d', i)
+            self.logger.error('error %d', i)
+        handler.flush()
+        self.assertEqual(handler.dropped, 0)
+        embeds = [embed for message in self.hook.sent
+                  for embed in message['embeds']]
+        # about 9000 characters, in 4096 character embeds
+        self.assertLessEqual(len(embeds), 3)
+        text = ''.join(embed.description for embed in embeds)
+        self.assertIn('warning 99', text)
+        self.assertIn('error 99', text)
+
+    def test_content(self):
+        handler = self.handler(embeds=False)
+        self.logger.warning('a')
+        self.logger.error('b ```')
+        handler.close()
+        content = self.hook.sent[0]['content']
+        self.assertTrue(content.startswith('```\nWARNING'))
+        self.assertEqual(content.count('```'), 2)
+
+    def test_capacity(self):
+        handler = self.handler(capacity=2)
+        for i in range(5):
+            self.logger.error('error %d', i)
+        handler.flush()
+        self.assertEqual(handler.dropped, 3)
+        embeds = [embed for message in self.hook.sent
+                  for embed in message['embeds']]
+        self.assertEqual(embeds[-1].description,
+                         'Dropped 3 log records (3 ERROR).')
+
+    def test_max_messages(self):
+        handler = self.handler(max_messages=1, embeds=False)
+        for i in range(100):
+            self.logger.warning('x' * 100)
+        handler.flush()
+        self.assertEqual(len(self.hook.sent), 2)
+        sent = self.hook.sent[0]['content'].count('\n') - 1
+        self.assertLessEqual(len(self.hook.sent[0]['content']), 2000)
+        self.assertEqual(handler.dropped, 100 - sent)
+        self.assertEqual(self.hook.sent[1]['content'],
+                         'Dropped {0} log records ({0} WARNING).'
+                         .format(100 - sent))
+
+    def test_background(self):
+        handler = DiscordHandler(self.hook, flush_interval=0.01)
+        self.logger.addHandler(handler)
+        self.addCleanup(self.logger.removeHandler, handler)
+        self.logger.warning('background')
+        handler._thread.join(0.5)
+        self.assertEqual(len(self.hook.sent), 1)
+        handler.close()
+
+    def test_async_webhook(self):
+        hook = dhooks.Webhook.Async('https://discord.com/api/webhooks/1/a')
+        with self.assertRaises(ValueError):
+            DiscordHandler(hook)
+
+
+if __name__ == '__main__':
+    unittest.main()
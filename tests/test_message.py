@@ -0,0 +1,32 @@
+import unittest
+
+import dhooks
+
+RAW = (b'{"id": "42", "channel_id": "7", "content": "hi", "embeds": [], '
+       b'"attachments": [{"id": "1", "url": "https://cdn/a.png"}], '
+       b'"timestamp": "2018-01-01T00:00:00+00:00"}')
+
+
+class TestMessage(unittest.TestCase):
+
+    def test_lazy(self):
+        message = dhooks.Message(RAW)
+        self.assertIsNone(message._data)
+        self.assertEqual(message.id, 42)
+        self.assertIsNotNone(message._data)
+
+    def test_fields(self):
+        message = dhooks.Message(RAW)
+        self.assertEqual(message.channel_id, 7)
+        self.assertEqual(message.content, 'hi')
+        self.assertEqual(message.embeds, [])
+        self.assertEqual(message.attachments[0]['url'], 'https://cdn/a.png')
+        self.assertEqual(message.timestamp, '2018-01-01T00:00:00+00:00')
+
+    def test_slots(self):
+        with self.assertRaises(AttributeError):
+            dhooks.Message(RAW).foo = 1
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+
+import dhooks
+from fakes import webhook
+
+
+class TestMetrics(unittest.TestCase):
+
+    def test_disabled(self):
+        self.assertIsNone(dhooks.get_default_metrics())
+        self.assertIsNone(webhook(204).metrics)
+
+    def test_callback(self):
+        events = []
+        hook = webhook(429, 503, 204, metrics=dhooks.CallbackCollector(
+            lambda *event: events.append(event)),
+            retry_policy=dhooks.RetryPolicy(base_delay=0,
+                                            budget=dhooks.RetryBudget()))
+        hook.send('hello')
+
+        names = [name for name, _, _ in events]
+        self.assertEqual(names.count('request_seconds'), 3)
+        self.assertEqual(names.count('rate_limited'), 1)
+        self.assertEqual(names.count('retries'), 1)
+        self.assertIn('rate_limit_sleep_seconds', names)
+        self.assertTrue(all(webhook_id == 1 for _, webhook_id, _ in events))
+        size = len(hook._encode(hook._build_message('hello')[0]))
+        self.assertIn(('request_bytes', 1, size), events)
+
+    def test_prometheus(self):
+        metrics = dhooks.PrometheusCollector(buckets=(0.5, 1))
+        hook = webhook(204, 204, metrics=metrics)
+        hook.send('a')
+        hook.send('b')
+        metrics.request(2, None, 0.75, 10)
+
+        text = metrics.render()
+        self.assertIn('dhooks_requests_total{webhook_id="1",status="204"} 2',
+                      text)
+        self.assertIn('dhooks_requests_total{webhook_id="2",status="none"} 1',
+                      text)
+        self.assertIn('dhooks_request_duration_seconds_bucket'
+                      '{webhook_id="2",le="0.5"} 0', text)
+        self.assertIn('dhooks_request_duration_seconds_bucket'
+                      '{webhook_id="2",le="1"} 1', text)
+        self.assertIn('dhooks_request_duration_seconds_bucket'
+                      '{webhook_id="1",le="+Inf"} 2', text)
+        self.assertIn('dhooks_request_bytes_total{webhook_id="2"} 10', text)
+        self.assertIn('# TYPE dhooks_queue_depth gauge', text)
+        self.assertTrue(text.endswith('\n'))
+
+    def test_queue_depth(self):
+        metrics = dhooks.PrometheusCollector()
+        hook = webhook(204, metrics=metrics)
+        hook.send_nowait('hello')
+        self.assertTrue(hook.flush(5))
+        hook.close()
+        self.assertIn('dhooks_queue_depth{webhook_id="1"} 0',
+                      metrics.render())
+
+
+if __name__ == '__main__':
+    unittest.main()
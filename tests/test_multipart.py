@@ -0,0 +1,61 @@
+import os
+import tempfile
+import unittest
+from io import BytesIO
+
+import dhooks
+from dhooks.multipart import MultipartBody
+
+
+class TestMultipartBody(unittest.TestCase):
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp()
+        os.write(fd, b'0123456789' * 1000)
+        os.close(fd)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_iter_chunks(self):
+        stream = BytesIO(b'0123456789' * 1000)
+        for file in (dhooks.File(self.path), dhooks.File(stream)):
+            chunks = list(file.iter_chunks(4096))
+            self.assertEqual([len(chunk) for chunk in chunks],
+                             [4096, 4096, 1808])
+            self.assertEqual(b''.join(chunks), b'0123456789' * 1000)
+            self.assertEqual(file.size, 10000)
+            del chunks
+            file.close()
+
+    def test_body(self):
+        file = dhooks.File(self.path, name='data.bin')
+        body = MultipartBody(b'{"content": "TEST"}', [file], chunk_size=1024)
+
+        data = b''.join(body)
+        self.assertEqual(len(data), len(body))
+        self.assertEqual(body.headers['Content-Length'], str(len(data)))
+        self.assertIn(b'filename="data.bin"', data)
+        self.assertIn(b'\r\n\r\n{"content": "TEST"}\r\n', data)
+        self.assertIn(b'\r\n\r\n' + b'0123456789' * 1000 + b'\r\n', data)
+        self.assertTrue(data.endswith('--{}--\r\n'
+                                      .format(body.boundary).encode()))
+
+        # a prepared body can be sent again
+        self.assertEqual(b''.join(body), data)
+        del data
+        file.close()
+
+    def test_multiple_files(self):
+        files = [dhooks.File(BytesIO(b'a'), name='a.txt'),
+                 dhooks.File(self.path, name='b.bin')]
+        data = b''.join(MultipartBody(b'{}', files))
+        self.assertIn(b'name="file0"; filename="a.txt"', data)
+        self.assertIn(b'name="file1"; filename="b.bin"', data)
+        del data
+        for file in files:
+            file.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
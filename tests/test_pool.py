@@ -0,0 +1,80 @@
+import os
+import tempfile
+import unittest
+
+import requests
+
+import dhooks
+from fakes import URL, FakeSession, FakeWebhook, headers
+
+
+class TestWebhookPool(unittest.TestCase):
+
+    def setUp(self):
+        self.limiter = dhooks.RateLimiter()
+
+    def make(self, *statuses):
+        return [FakeWebhook(i, status, ratelimiter=self.limiter)
+                for i, status in enumerate(statuses)]
+
+    def test_most_remaining(self):
+        hooks = self.make(204, 204, 204)
+        for hook, remaining in zip(hooks, (1, 4, 2)):
+            self.limiter.update(hook._route('POST'), headers(remaining, 1))
+        with dhooks.WebhookPool(hooks) as pool:
+            self.assertIs(pool.pick(), hooks[1])
+
+    def test_round_robin(self):
+        hooks = self.make(204, 204)
+        with dhooks.WebhookPool(hooks) as pool:
+            for _ in range(4):
+                pool.send('TEST')
+        self.assertEqual([len(hook.requests) for hook in hooks], [2, 2])
+
+    def test_failover(self):
+        hooks = self.make(404, 401, 204)
+        with dhooks.WebhookPool(hooks) as pool:
+            for _ in range(3):
+                self.assertIs(pool.send('TEST'), hooks[2])
+            self.assertEqual(pool.members, [hooks[2]])
+            self.assertEqual(len(pool.dead), 2)
+
+    def test_wait(self):
+        hooks = self.make(404, 204)
+        with dhooks.WebhookPool(hooks) as pool:
+            message = pool.send('TEST', wait=True)
+        self.assertEqual(message.id, 42)
+        self.assertIs(message.webhook, hooks[1])
+
+    def test_failover_with_file(self):
+        fd, path = tempfile.mkstemp()
+        os.write(fd, b'chart')
+        os.close(fd)
+        self.addCleanup(os.remove, path)
+
+        hooks = [dhooks.Webhook(URL.format(i), session=FakeSession(status),
+                                ratelimiter=self.limiter)
+                 for i, status in enumerate((404, 204))]
+        with dhooks.WebhookPool(hooks) as pool:
+            file = dhooks.File(path, name='chart.png')
+            pool.send('report', file=file)
+            self.assertEqual(pool.dead, hooks[:1])
+        self.assertIn(b'chart', hooks[1].session.bodies[0])
+
+    def test_every_member_dead(self):
+        hooks = self.make(404)
+        with dhooks.WebhookPool(hooks) as pool:
+            with self.assertRaises(requests.HTTPError):
+                pool.send('TEST')
+
+    def test_other_errors_raise(self):
+        hooks = self.make(500, 204)
+        with dhooks.WebhookPool(hooks) as pool:
+            with self.assertRaises(requests.HTTPError):
+                while True:
+                    pool.send('TEST')
+            self.assertEqual(len(pool.members), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,153 @@
+import asyncio
+import os
+import tempfile
+import threading
+import unittest
+
+import dhooks
+from dhooks.ratelimit import RateLimiter, SQLiteRateLimiter
+from fakes import URL, FakeClock, headers
+
+
+class TestRateLimiter(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.limiter = RateLimiter()
+        self.limiter._clock = self.clock
+
+    def test_unknown_route(self):
+        self.assertEqual(self.limiter.acquire('POST 1'), 0)
+        self.assertEqual(self.limiter.acquire('POST 1'),
+                         RateLimiter.DISCOVERY_POLL)
+
+        self.limiter.update('POST 1', headers(remaining=3, reset_after=2))
+        self.assertEqual(self.limiter.acquire('POST 1'), 0)
+
+    def test_delays_when_exhausted(self):
+        self.limiter.update('POST 1', headers(remaining=1, reset_after=2))
+        self.assertEqual(self.limiter.acquire('POST 1'), 0)
+        self.assertAlmostEqual(self.limiter.acquire('POST 1'), 2)
+
+        self.clock.now += 2
+        self.assertEqual(self.limiter.acquire('POST 1'), 0)
+
+    def test_shared_bucket(self):
+        self.limiter.update('POST 1', headers(remaining=0, reset_after=1))
+        self.limiter.update('GET 1', headers(remaining=0, reset_after=1))
+        self.assertAlmostEqual(self.limiter.acquire('GET 1'), 1)
+
+    def test_separate_webhooks(self):
+        self.limiter.update('POST 1', headers(remaining=0, reset_after=1))
+        self.limiter.update('POST 2', headers(remaining=3, reset_after=1))
+        self.assertAlmostEqual(self.limiter.acquire('POST 1'), 1)
+        self.assertEqual(self.limiter.acquire('POST 2'), 0)
+
+    def test_budget(self):
+        self.assertEqual(self.limiter.budget('POST 1'), (None, 0))
+        self.limiter.update('POST 1', headers(remaining=2, reset_after=1))
+        self.assertEqual(self.limiter.budget('POST 1'), (2, 1))
+        self.clock.now += 1
+        self.assertEqual(self.limiter.budget('POST 1'), (5, 0))
+
+    def test_rate_limited(self):
+        self.limiter.rate_limited('POST 1', 3)
+        self.assertAlmostEqual(self.limiter.acquire('POST 1'), 3)
+        self.assertEqual(self.limiter.acquire('POST 2'), 0)
+
+    def test_global_rate_limited(self):
+        self.limiter.rate_limited('POST 1', 3, is_global=True)
+        self.assertAlmostEqual(self.limiter.acquire('POST 2'), 3)
+
+    def test_concurrent_acquire(self):
+        self.limiter.update('POST 1', headers(remaining=50, reset_after=2,
+                                              limit=50))
+        acquired = []
+
+        def worker():
+            for _ in range(20):
+                acquired.append(self.limiter.acquire('POST 1') == 0)
+
+        threads = [threading.Thread(target=worker) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(acquired.count(True), 50)
+
+
+class TestSQLiteRateLimiter(TestRateLimiter):
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix='.sqlite')
+        os.close(fd)
+        self.clock = FakeClock()
+        self.limiter = SQLiteRateLimiter(self.path)
+        self.limiter._clock = self.clock
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_shared_between_instances(self):
+        self.limiter.update('POST 1', headers(remaining=1, reset_after=2))
+        other = SQLiteRateLimiter(self.path)
+        other._clock = self.clock
+        self.assertEqual(other.acquire('POST 1'), 0)
+        self.assertAlmostEqual(self.limiter.acquire('POST 1'), 2)
+
+
+class TestInterruptedRequest(unittest.TestCase):
+
+    def test_interrupted(self):
+        limiter = RateLimiter()
+        hook = dhooks.Webhook(URL.format(1), ratelimiter=limiter)
+
+        def interrupt(*args, **kwargs):
+            raise KeyboardInterrupt
+        hook._send_request = interrupt
+
+        with self.assertRaises(KeyboardInterrupt):
+            hook.send('hello')
+        self.assertEqual(limiter.acquire(hook._route('POST')), 0)
+        hook.close()
+
+    def test_cancelled(self):
+        limiter = RateLimiter()
+
+        async def hang(*args, **kwargs):
+            await asyncio.sleep(60)
+
+        async def send():
+            hook = dhooks.Webhook.Async(URL.format(1), ratelimiter=limiter)
+            hook._async_send_request = hang
+            with self.assertRaises(asyncio.TimeoutError):
+                await asyncio.wait_for(hook.send('hello'), 0.05)
+            await hook.close()
+            return hook._route('POST')
+
+        route = asyncio.run(send())
+        self.assertEqual(limiter.acquire(route), 0)
+
+
+class TestDefaultRateLimiter(unittest.TestCase):
+    URL = 'https://discord.com/api/webhooks/1234/abcd'
+
+    def test_shared_between_webhooks(self):
+        with dhooks.Webhook(self.URL) as hook, \
+                dhooks.Webhook(self.URL) as other:
+            self.assertIs(hook.ratelimiter, other.ratelimiter)
+            self.assertIs(hook.ratelimiter, dhooks.get_default_ratelimiter())
+
+    def test_set_default(self):
+        original = dhooks.get_default_ratelimiter()
+        limiter = RateLimiter()
+        dhooks.set_default_ratelimiter(limiter)
+        try:
+            with dhooks.Webhook(self.URL) as hook:
+                self.assertIs(hook.ratelimiter, limiter)
+        finally:
+            dhooks.set_default_ratelimiter(original)
+
+
+if __name__ == '__main__':
+    unittest.main()
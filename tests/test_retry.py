@@ -0,0 +1,124 @@
+import io
+import unittest
+
+import requests
+
+import dhooks
+from fakes import FakeClock, webhook
+
+
+class TestRetryBudget(unittest.TestCase):
+
+    def setUp(self):
+        self.budget = dhooks.RetryBudget(ratio=0.5, min_per_second=0, ttl=10)
+        self.budget._clock = self.clock = FakeClock()
+
+    def test_ratio(self):
+        for _ in range(4):
+            self.budget.deposit()
+        self.assertTrue(self.budget.withdraw())
+        self.assertTrue(self.budget.withdraw())
+        self.assertFalse(self.budget.withdraw())
+
+    def test_ttl(self):
+        self.budget.deposit()
+        self.budget.deposit()
+        self.assertTrue(self.budget.withdraw())
+        self.clock.now += 10
+        self.assertFalse(self.budget.withdraw())
+
+
+class TestRetryPolicy(unittest.TestCase):
+
+    def setUp(self):
+        self.policy = dhooks.RetryPolicy(max_attempts=3, base_delay=0,
+                                         budget=dhooks.RetryBudget())
+
+    def test_should_retry(self):
+        self.assertTrue(self.policy.should_retry(1, 503))
+        self.assertFalse(self.policy.should_retry(1, 400))
+        self.assertFalse(self.policy.should_retry(3, 503))
+        self.assertTrue(self.policy.should_retry(
+            1, error=requests.ConnectionError()))
+        self.assertFalse(self.policy.should_retry(1, error=ValueError()))
+
+    def test_backoff(self):
+        policy = dhooks.RetryPolicy(base_delay=1, max_delay=3)
+        for attempt in range(1, 6):
+            delay = policy.backoff(attempt)
+            self.assertGreaterEqual(delay, 0)
+            self.assertLessEqual(delay, min(3, 2 ** (attempt - 1)))
+
+    def webhook(self, *outcomes):
+        return webhook(*outcomes, retry_policy=self.policy)
+
+    def test_retries(self):
+        hook = self.webhook(503, requests.ConnectionError(), 204)
+        hook.send('hello')
+        self.assertEqual(len(hook.session.bodies), 3)
+
+    def test_max_attempts(self):
+        hook = self.webhook(503, 502, 500)
+        with self.assertRaises(requests.HTTPError):
+            hook.send('hello')
+        self.assertEqual(len(hook.session.bodies), 3)
+
+    def test_rewinds_files(self):
+        hook = self.webhook(503, 204)
+        hook.send(file=dhooks.File(io.BytesIO(b'data'), name='a.txt'))
+        first, second = hook.session.bodies
+        self.assertEqual(first, second)
+        self.assertIn(b'data', second)
+
+    def test_no_policy(self):
+        hook = self.webhook(503, 204)
+        hook.retry_policy = None
+        with self.assertRaises(requests.HTTPError):
+            hook.send('hello')
+
+
+class TestDeadline(unittest.TestCase):
+
+    def test_timeouts(self):
+        hook = webhook(204, 204, timeout=5)
+        hook.send('hello')
+        hook.send('hello', deadline=1)
+        self.assertEqual(hook.session.timeouts[0], (5, 5))
+        self.assertLessEqual(max(hook.session.timeouts[1]), 1)
+
+    def test_rate_limited(self):
+        hook = webhook()
+        route = hook._route('POST')
+        hook.ratelimiter.rate_limited(route, 60)
+        with self.assertRaises(dhooks.DeadlineExceeded):
+            hook.send('hello', deadline=5)
+        self.assertEqual(hook.session.bodies, [])
+
+    def test_queued(self):
+        hook = webhook(204)
+        hook.send_nowait('hello', deadline=5)
+        self.assertTrue(hook.flush(5))
+        self.assertEqual(len(hook.session.bodies), 1)
+
+        hook.ratelimiter.rate_limited(hook._route('POST'), 60)
+        hook.send_nowait('hello', deadline=5)
+        self.assertTrue(hook.flush(5))  # dropped, not waiting for 60s
+        self.assertEqual(len(hook.session.bodies), 1)
+        hook.close()
+
+    def test_queued_wait(self):
+        hook = webhook()
+        with self.assertRaises(TypeError):
+            hook.send_nowait('hello', wait=True)
+
+    def test_backoff(self):
+        policy = dhooks.RetryPolicy(base_delay=60, budget=dhooks.RetryBudget())
+        hook = webhook(503, 204, retry_policy=policy)
+        policy.backoff = lambda attempt: 60
+        with self.assertRaises(dhooks.DeadlineExceeded):
+            hook.send('hello', deadline=5)
+        self.assertEqual(len(hook.session.bodies), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import json
+import unittest
+
+import dhooks
+from dhooks import serializer
+from dhooks.client import Webhook, build_payload
+
+PAYLOAD = {'content': 'héllo / wörld', 'tts': False, 'embeds': []}
+
+
+class TestSerializer(unittest.TestCase):
+
+    def setUp(self):
+        self.previous = (serializer._name, serializer._dumps,
+                         serializer._loads)
+
+    def tearDown(self):
+        (serializer._name, serializer._dumps,
+         serializer._loads) = self.previous
+
+    def test_backends(self):
+        for name in serializer.BACKENDS:
+            try:
+                dhooks.set_serializer(name)
+            except ImportError:
+                continue
+            self.assertEqual(dhooks.get_serializer(), name)
+            data = serializer.dumps(PAYLOAD)
+            self.assertIsInstance(data, bytes)
+            self.assertEqual(json.loads(data.decode('utf-8')), PAYLOAD)
+            self.assertEqual(serializer.loads(data), PAYLOAD)
+
+    def test_unknown(self):
+        with self.assertRaises(ValueError):
+            dhooks.set_serializer('pickle')
+
+    def test_custom(self):
+        dhooks.set_serializer(dumps=lambda obj: b'{}', loads=json.loads)
+        self.assertEqual(dhooks.get_serializer(), 'custom')
+        self.assertEqual(serializer.dumps(PAYLOAD), b'{}')
+        with self.assertRaises(ValueError):
+            dhooks.set_serializer(dumps=lambda obj: b'{}')
+
+    def test_encode_embeds(self):
+        dhooks.set_serializer('json')
+        embed = dhooks.Embed(title='title', description='déscription')
+        payload = build_payload('content', embeds=[embed, embed])
+        self.assertEqual(json.loads(Webhook._encode(payload).decode()), {
+            'content': 'content',
+            'tts': False,
+            'embeds': [embed.to_dict(), embed.to_dict()],
+        })
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import asyncio
+import os
+import subprocess
+import sys
+import unittest
+
+import requests
+
+import dhooks
+from fakes import URL
+
+
+class TestSessionRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.sessions = dhooks.SessionRegistry(max_connections_per_host=4)
+
+    def tearDown(self):
+        self.sessions.close()
+
+    def test_shared(self):
+        hooks = [dhooks.Webhook(URL.format(i), sessions=self.sessions)
+                 for i in range(3)]
+        self.assertIsInstance(hooks[0].session, requests.Session)
+        self.assertTrue(all(hook.session is hooks[0].session
+                            for hook in hooks))
+        adapter = hooks[0].session.get_adapter('https://discord.com')
+        self.assertEqual(adapter._pool_maxsize, 4)
+
+    def test_close(self):
+        hook = dhooks.Webhook(URL.format(1), sessions=self.sessions)
+        session = hook.session
+        hook.close()
+        self.assertIs(self.sessions.get_session(), session)
+
+    def test_own_session(self):
+        session = requests.Session()
+        hook = dhooks.Webhook(URL.format(1), session=session,
+                              sessions=self.sessions)
+        self.assertIs(hook.session, session)
+        self.assertIsNot(self.sessions.get_session(), session)
+
+    def test_async(self):
+        async def main():
+            hook = dhooks.Webhook.Async(URL.format(1), sessions=self.sessions)
+            session = hook.session
+            self.assertIs(session, self.sessions.get_async_session())
+            await hook.close()
+            self.assertFalse(session.closed)
+            await self.sessions.close_async()
+            return session
+
+        first = asyncio.run(main())
+        second = asyncio.run(main())
+        self.assertTrue(first.closed)
+        self.assertIsNot(first, second)
+
+
+class TestLazyImports(unittest.TestCase):
+
+    def loaded(self, code):
+        code += '; import sys; print(" ".join(m for m in ' \
+                '("aiohttp", "requests") if m in sys.modules))'
+        return subprocess.check_output(
+            [sys.executable, '-c', code], universal_newlines=True,
+            cwd=os.path.join(os.path.dirname(__file__), '..')).split()
+
+    def test_import(self):
+        self.assertEqual(self.loaded('import dhooks'), [])
+
+    def test_sync(self):
+        self.assertEqual(self.loaded(
+            'import dhooks; dhooks.Webhook("{}").session'.format(
+                URL.format(1))), ['requests'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+import json
+import random
+import time
+import unittest
+
+import dhooks
+from dhooks.split import split_content
+from fakes import URL, FakeSession
+
+
+class TestSplitContent(unittest.TestCase):
+
+    def test_short(self):
+        self.assertEqual(split_content('hello'), ['hello'])
+        self.assertEqual(split_content(''), [])
+
+    def test_lines(self):
+        content = '\n'.join('line {}'.format(i) for i in range(1000))
+        chunks = split_content(content, 100)
+        self.assertTrue(all(len(chunk) <= 100 for chunk in chunks))
+        self.assertEqual('\n'.join(chunks), content)
+
+    def test_long_line(self):
+        chunks = split_content('a' * 250, 100)
+        self.assertEqual(chunks, ['a' * 100, 'a' * 100, 'a' * 50])
+
+    def test_code_block(self):
+        code = '\n'.join('x = {}'.format(i) for i in range(100))
+        content = 'Traceback:\n```py\n' + code + '\n```\ndone'
+        chunks = split_content(content, 100)
+        self.assertTrue(all(len(chunk) <= 100 for chunk in chunks))
+        for chunk in chunks:
+            self.assertEqual(chunk.count('```') % 2, 0)
+        for chunk in chunks[1:-1]:
+            self.assertTrue(chunk.startswith('```py\n'))
+            self.assertTrue(chunk.endswith('\n```'))
+        self.assertTrue(chunks[-1].endswith('done'))
+
+    def test_empty_code_block(self):
+        chunks = split_content('text\n```\n' + 'y' * 250 + '\n```', 100)
+        self.assertEqual(chunks[0], 'text')
+        for chunk in chunks[1:]:
+            self.assertTrue(chunk.startswith('```\ny'))
+
+    def test_fence_mid_line(self):
+        content = 'see: ```py\n' + 'y\n' * 100 + '```'
+        chunks = split_content(content, 100)
+        self.assertTrue(chunks[0].startswith('see: ```py\n'))
+        for chunk in chunks[1:]:
+            self.assertTrue(chunk.startswith('```py\ny'))
+
+    def test_long_line_with_fence(self):
+        content = 'y' * 3993 + '```py\n' + 'print(1)\n' * 5 + '```'
+        chunks = split_content(content, 2000)
+        self.assertTrue(all(len(chunk) <= 2000 for chunk in chunks))
+
+        rand = random.Random(0)
+        pieces = ['a', 'b ', '\n', '```', '```py']
+        for _ in range(2000):
+            max_length = rand.randint(14, 60)
+            content = ''.join(rand.choice(pieces) if rand.random() < 0.8
+                              else 'x' * rand.randint(1, 80)
+                              for _ in range(rand.randint(1, 40)))
+            for chunk in split_content(content, max_length):
+                self.assertLessEqual(len(chunk), max_length)
+
+    def test_linear_time(self):
+        # a single line of several megabytes is cut as fast as short lines
+        line = 'a' * 8000000
+        lines = ('a' * 79 + '\n') * 100000
+
+        began = time.perf_counter()
+        self.assertEqual(len(split_content(line)), 4000)
+        single = time.perf_counter() - began
+
+        began = time.perf_counter()
+        split_content(lines)
+        self.assertLess(single, time.perf_counter() - began)
+
+    def test_blank_chunks(self):
+        chunks = split_content('a\n' + '\n' * 300 + 'b', 100)
+        self.assertEqual([chunk.strip() for chunk in chunks], ['a', 'b'])
+
+    def test_max_length(self):
+        with self.assertRaises(ValueError):
+            split_content('a' * 10, 8)
+
+
+class TestSplitSend(unittest.TestCase):
+
+    def webhook(self, **options):
+        # the later chunks are slower, so a reordering would show
+        self.session = FakeSession(delay=0.001)
+        return dhooks.Webhook(URL.format(1), session=self.session,
+                              ratelimiter=dhooks.RateLimiter(), **options)
+
+    def contents(self):
+        return [json.loads(body)['content'] for body in self.session.bodies]
+
+    def test_send(self):
+        content = '\n'.join('line {}'.format(i) for i in range(1000))
+        self.webhook().send(content, split=True)
+        self.assertGreater(len(self.contents()), 1)
+        self.assertEqual('\n'.join(self.contents()), content)
+
+    def test_strict(self):
+        with self.assertRaises(ValueError):
+            self.webhook().send('a' * 3000)
+
+    def test_queued_order(self):
+        hook = self.webhook(dispatch_workers=4)
+        content = '\n'.join('line {}'.format(i) for i in range(1000))
+        hook.send_nowait(content, split=True)
+        self.assertTrue(hook.flush(5))
+        hook.close()
+        self.assertEqual('\n'.join(self.contents()), content)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import json
+import unittest
+
+import dhooks
+from fakes import FakeWebhook
+
+
+class TestEmbedTemplate(unittest.TestCase):
+
+    def setUp(self):
+        embed = dhooks.Embed(title='{service} is down', color=0xe74c3c)
+        embed.add_field(name='Since', value='{since}')
+        self.template = dhooks.EmbedTemplate(embed, content='@{who}',
+                                             username='alerts')
+
+    def render(self, *args, **kwargs):
+        return json.loads(self.template.render(*args, **kwargs).decode())
+
+    def test_placeholders(self):
+        self.assertEqual(self.template.placeholders,
+                         ['who', 'service', 'since'])
+
+    def test_render(self):
+        data = self.render({'service': 'api', 'since': 12}, who='here')
+        self.assertEqual(data['content'], '@here')
+        self.assertEqual(data['username'], 'alerts')
+        self.assertEqual(data['embeds'][0]['title'], 'api is down')
+        self.assertEqual(data['embeds'][0]['fields'][0]['value'], '12')
+        self.assertEqual(data['embeds'][0]['color'], 0xe74c3c)
+
+    def test_escaping(self):
+        data = self.render(service='"quoted"\n\\', since='ü', who='')
+        self.assertEqual(data['embeds'][0]['title'], '"quoted"\n\\ is down')
+        self.assertEqual(data['embeds'][0]['fields'][0]['value'], 'ü')
+
+    def test_missing_value(self):
+        with self.assertRaises(KeyError):
+            self.template.render(service='api')
+
+
+class TestSendTemplate(unittest.TestCase):
+
+    def setUp(self):
+        embed = dhooks.Embed(title='{service} is down')
+        embed.add_field(name='Since', value='{since}')
+        self.template = dhooks.EmbedTemplate(embed)
+
+    @staticmethod
+    def request(hook):
+        # the data that was sent, and the options of the request
+        _, payload, kwargs = hook.requests[0]
+        return json.loads(hook._encode(payload).decode()), kwargs
+
+    def test_defaults(self):
+        hook = FakeWebhook(username='bot', avatar_url='https://a/b.png')
+        hook.send_template(self.template, {'since': 12}, wait=True,
+                           deadline=5, service='api')
+        data, kwargs = self.request(hook)
+        self.assertEqual(data['username'], 'bot')
+        self.assertEqual(data['avatar_url'], 'https://a/b.png')
+        self.assertEqual(data['embeds'][0]['title'], 'api is down')
+        self.assertEqual((kwargs['wait'], kwargs['deadline']), (True, 5))
+
+    def test_template_identity(self):
+        template = dhooks.EmbedTemplate(dhooks.Embed(title='{x}'),
+                                        username='alerts')
+        hook = FakeWebhook(username='bot')
+        hook.send_template(template, x=1)
+        self.assertEqual(self.request(hook)[0]['username'], 'alerts')
+
+    def test_strict(self):
+        hook = FakeWebhook()
+        with self.assertRaises(ValueError):
+            hook.send_template(self.template, service='x' * 300, since=1)
+        self.assertEqual(hook.requests, [])
+
+    def test_lenient(self):
+        hook = FakeWebhook(validation='lenient', username='bot')
+        hook.send_template(self.template, service='x' * 300,
+                           since='y' * 2000)
+        data = self.request(hook)[0]
+        self.assertEqual(len(data['embeds'][0]['title']), 256)
+        self.assertEqual(len(data['embeds'][0]['fields'][0]['value']), 1024)
+        self.assertEqual(data['username'], 'bot')
+
+
+if __name__ == '__main__':
+    unittest.main()
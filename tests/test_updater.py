@@ -0,0 +1,77 @@
+import asyncio
+import threading
+import unittest
+
+import dhooks
+from fakes import FakeWebhook
+
+
+class SlowWebhook(FakeWebhook):
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.edits = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def _request(self, method='POST', payload=None, files=None,
+                 headers=None, wait=False, path=''):
+        if self.is_async:
+            return self._async_request(method, payload, path=path)
+        self.started.set()
+        self.release.wait(5)
+        self.edits.append((method, path, payload['content']))
+
+    async def _async_request(self, method='POST', payload=None, files=None,
+                             headers=None, wait=False, path=''):
+        await asyncio.sleep(0.01)
+        self.edits.append((method, path, payload['content']))
+
+
+class TestMessageUpdater(unittest.TestCase):
+
+    def test_latest_wins(self):
+        hook = SlowWebhook()
+        updater = dhooks.MessageUpdater(hook, 42)
+        updater.update('0')
+        self.assertTrue(hook.started.wait(5))
+        for i in range(1, 5):
+            updater.update(str(i))
+        hook.release.set()
+        self.assertTrue(updater.flush(5))
+        self.assertEqual(hook.edits, [('PATCH', '/messages/42', '0'),
+                                      ('PATCH', '/messages/42', '4')])
+        self.assertEqual(updater.collapsed, 3)
+        self.assertTrue(updater.close(5))
+        with self.assertRaises(RuntimeError):
+            updater.update('5')
+
+    def test_route(self):
+        hook = SlowWebhook()
+        self.assertEqual(hook._route('PATCH', '/messages/42'),
+                         'PATCH 1 /messages')
+        self.assertEqual(hook._route('POST'), 'POST 1')
+
+    def test_async(self):
+        async def main():
+            hook = SlowWebhook(is_async=True)
+            updater = dhooks.MessageUpdater(hook, 42)
+            for i in range(5):
+                updater.update(str(i))
+                await asyncio.sleep(0)
+            self.assertTrue(await updater.close(5))
+            await hook.close()
+            return hook, updater
+
+        hook, updater = asyncio.run(main())
+        self.assertLess(len(hook.edits), 5)
+        self.assertEqual(hook.edits[-1][2], '4')
+        self.assertEqual(updater.edits, len(hook.edits))
+
+    def test_edit_payload(self):
+        with self.assertRaises(ValueError):
+            dhooks.MessageUpdater(SlowWebhook(), 42).update()
+
+
+if __name__ == '__main__':
+    unittest.main()